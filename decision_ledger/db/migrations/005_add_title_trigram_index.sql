@@ -0,0 +1,28 @@
+-- Migration 005: Add Trigram Index for Decision Title Search
+--
+-- This migration adds:
+-- 1. The pg_trgm extension
+-- 2. A GIN trigram index on decision_versions.title
+--
+-- The decisions list endpoint filters with `dv.title ILIKE '%term%'`. A
+-- leading wildcard cannot use a btree index, so without this the search
+-- scans every version row. pg_trgm GIN indexes serve LIKE and ILIKE
+-- directly, so the query text does not need to change.
+--
+-- Run with: psql $DATABASE_URL -f 005_add_title_trigram_index.sql
+
+-- =============================================================================
+-- TRIGRAM EXTENSION
+-- =============================================================================
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- =============================================================================
+-- TITLE SEARCH INDEX
+-- =============================================================================
+
+CREATE INDEX IF NOT EXISTS idx_decision_versions_title_trgm
+ON decision_versions USING gin (title gin_trgm_ops);
+
+COMMENT ON INDEX idx_decision_versions_title_trgm IS
+'Trigram index so substring title search (ILIKE ''%term%'') avoids a sequential scan';
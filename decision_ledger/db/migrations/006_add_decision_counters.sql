@@ -0,0 +1,37 @@
+-- Migration 006: Add Per-Organization Decision Counters
+--
+-- This migration adds:
+-- 1. decision_counters table holding the next decision number per organization
+-- 2. A backfill from existing decisions
+--
+-- Decision numbers were allocated with SELECT MAX(decision_number) + 1, which
+-- lets two concurrent creates pick the same number until the unique
+-- constraint rejects one of them. Allocating through
+--   INSERT ... ON CONFLICT (organization_id) DO UPDATE ... RETURNING
+-- takes a row lock on the org's counter, so numbers are handed out one at a
+-- time. Rows are also created lazily by the allocating statement, so
+-- organizations created after this migration need no setup.
+--
+-- Run with: psql $DATABASE_URL -f 006_add_decision_counters.sql
+
+-- =============================================================================
+-- DECISION COUNTERS TABLE
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS decision_counters (
+    organization_id UUID PRIMARY KEY REFERENCES organizations(id) ON DELETE CASCADE,
+    next_number     INTEGER NOT NULL DEFAULT 1
+);
+
+COMMENT ON TABLE decision_counters IS
+'Next decision_number to hand out per organization; updated atomically on decision create';
+
+-- =============================================================================
+-- BACKFILL
+-- =============================================================================
+
+INSERT INTO decision_counters (organization_id, next_number)
+SELECT organization_id, MAX(decision_number) + 1
+FROM decisions
+GROUP BY organization_id
+ON CONFLICT (organization_id) DO NOTHING;
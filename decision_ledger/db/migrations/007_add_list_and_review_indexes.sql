@@ -0,0 +1,28 @@
+-- Migration 007: Add Indexes for Decision Listing and Pending Approvals
+--
+-- This migration adds:
+-- 1. A partial (organization_id, created_at DESC) index on decisions for the
+--    paginated list, which filters by org and orders by newest first
+-- 2. A (user_id, decision_version_id) index on required_reviewers for the
+--    pending-approvals lookup, which starts from the reviewing user
+--
+-- Already covered by the base schema and not repeated here:
+-- - decisions (organization_id, status) WHERE deleted_at IS NULL  -> idx_decisions_status
+-- - approvals (decision_version_id, user_id)                      -> UNIQUE constraint
+--
+-- Run with: psql $DATABASE_URL -f 007_add_list_and_review_indexes.sql
+
+-- =============================================================================
+-- DECISION LIST
+-- =============================================================================
+
+CREATE INDEX IF NOT EXISTS idx_decisions_org_created
+ON decisions(organization_id, created_at DESC)
+WHERE deleted_at IS NULL;
+
+-- =============================================================================
+-- PENDING APPROVALS
+-- =============================================================================
+
+CREATE INDEX IF NOT EXISTS idx_required_reviewers_user
+ON required_reviewers(user_id, decision_version_id);
@@ -0,0 +1,35 @@
+-- Migration 008: Add Trigram Indexes for Lowercased Title and Content Search
+--
+-- This migration adds:
+-- 1. A GIN trigram index on LOWER(decision_versions.title)
+-- 2. A GIN trigram index on LOWER(decision_versions.content::text)
+--
+-- The Teams bot "search" command filters with
+--   LOWER(dv.title) LIKE '%term%' OR LOWER(dv.content::text) LIKE '%term%'
+-- Migration 005 indexes the raw title for ILIKE, but the planner can only use
+-- an index for LOWER(...) LIKE when the index is built on the same
+-- expression. With both sides of the OR indexed, the search becomes a
+-- BitmapOr of two index scans instead of a sequential scan over every
+-- version's JSON content.
+--
+-- Already covered and not repeated here:
+-- - pg_trgm extension -> migration 005
+--
+-- Run with: psql $DATABASE_URL -f 008_add_search_trigram_indexes.sql
+
+-- =============================================================================
+-- TITLE SEARCH INDEX
+-- =============================================================================
+
+CREATE INDEX IF NOT EXISTS idx_decision_versions_title_lower_trgm
+ON decision_versions USING gin (LOWER(title) gin_trgm_ops);
+
+-- =============================================================================
+-- CONTENT SEARCH INDEX
+-- =============================================================================
+
+CREATE INDEX IF NOT EXISTS idx_decision_versions_content_lower_trgm
+ON decision_versions USING gin (LOWER(content::text) gin_trgm_ops);
+
+COMMENT ON INDEX idx_decision_versions_content_lower_trgm IS
+'Trigram index so LOWER(content::text) LIKE ''%term%'' search avoids a sequential scan';
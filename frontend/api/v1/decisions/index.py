@@ -1,14 +1,43 @@
 """Decisions API - GET (list) and POST (create) /api/v1/decisions"""
 
 from http.server import BaseHTTPRequestHandler
+import gzip
 import json
 import os
 import hashlib
+import time
 from urllib.parse import urlparse, parse_qs
-from uuid import uuid4
-from datetime import datetime
+from uuid import UUID
 import urllib.request
-import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
+
+# Shared worker pool for outbound notifications; threads are reused across
+# warm invocations instead of spawning one per request
+_notification_executor = ThreadPoolExecutor(max_workers=4)
+
+# Responses smaller than this are sent uncompressed
+GZIP_MIN_BYTES = 1024
+
+VALID_STATUSES = frozenset({"draft", "pending_review", "approved", "deprecated", "superseded", "at_risk"})
+VALID_IMPACT_LEVELS = frozenset({"low", "medium", "high", "critical"})
+
+def uuid7() -> UUID:
+    """Generate a time-ordered UUIDv7 (RFC 9562).
+
+    New decisions and versions get increasing primary keys, so inserts land on
+    the right-hand edge of the btree instead of random leaf pages.
+    """
+    ts_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+    value = (ts_ms & 0xFFFF_FFFF_FFFF) << 80
+    value |= 0x7 << 76                      # version 7
+    value |= (rand >> 68) << 64             # rand_a (12 bits)
+    value |= 0b10 << 62                     # RFC 4122 variant
+    value |= rand & ((1 << 62) - 1)         # rand_b (62 bits)
+    return UUID(int=value)
+
 
 # Email sending via Resend
 RESEND_API_KEY = os.environ.get("RESEND_API_KEY", "")
@@ -277,15 +306,97 @@ def send_teams_decision_created(
         pass
 
 
+_db_engine = None
+
+
+def get_db_engine():
+    """Get the shared database engine, reused across warm invocations."""
+    global _db_engine
+    if _db_engine is not None:
+        return _db_engine
+
+    from sqlalchemy import create_engine
+    db_url = os.environ.get("DATABASE_URL", "")
+    if not db_url:
+        return None
+
+    _db_engine = create_engine(
+        db_url,
+        pool_size=5,
+        max_overflow=10,
+        pool_pre_ping=True,
+        pool_recycle=300,
+        connect_args={"sslmode": "require"},
+    )
+    return _db_engine
+
+
+# Short-lived cache of list responses, keyed by (org, firebase uid, query).
+# The requesting uid is part of the key so a hit implies that user passed the
+# membership check when the entry was stored. Creating a decision through this
+# instance drops the org's entries. Edits, approvals and deletes in [id].py and
+# creates from Slack/Teams do not, so the TTL is kept to a few seconds - enough
+# to absorb bursts of dashboard refreshes without hiding other writes for long.
+LIST_CACHE_TTL = 3
+LIST_CACHE_MAX_ENTRIES = 1024
+_list_cache = {}
+
+
+def get_cached_list(key):
+    """Return a cached list response if it has not expired."""
+    entry = _list_cache.get(key)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def set_cached_list(key, body):
+    """Store a list response for LIST_CACHE_TTL seconds."""
+    if len(_list_cache) >= LIST_CACHE_MAX_ENTRIES:
+        _list_cache.clear()
+    _list_cache[key] = (time.monotonic() + LIST_CACHE_TTL, body)
+
+
+def invalidate_list_cache(org_id):
+    """Drop every cached list response for an organization."""
+    for key in [k for k in _list_cache if k[0] == org_id]:
+        _list_cache.pop(key, None)
+
+
+def parse_list_params(path):
+    """Parse and validate pagination and filter query params for the list endpoint."""
+    params = parse_qs(urlparse(path).query)
+    page = max(1, int(params.get("page", ["1"])[0]))
+    page_size = min(100, max(1, int(params.get("page_size", ["20"])[0])))  # Limit to 100 max
+    status_filter = params.get("status", [None])[0]
+    search = params.get("search", [None])[0]
+
+    # Validate status filter
+    if status_filter and status_filter not in VALID_STATUSES:
+        status_filter = None
+
+    return page, page_size, status_filter, search
+
+
 class handler(BaseHTTPRequestHandler):
     def _send(self, status, body):
+        payload = orjson.dumps(body, default=str) if isinstance(body, dict) or isinstance(body, list) else body.encode()
+
+        # Compress larger bodies (list pages) when the client accepts gzip
+        gzipped = len(payload) >= GZIP_MIN_BYTES and "gzip" in self.headers.get("Accept-Encoding", "")
+        if gzipped:
+            payload = gzip.compress(payload, compresslevel=1)
+
         self.send_response(status)
         self.send_header("Content-Type", "application/json")
         self.send_header("Access-Control-Allow-Origin", "*")
         self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
         self.send_header("Access-Control-Allow-Headers", "Authorization, Content-Type, X-Organization-ID")
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+            self.send_header("Vary", "Accept-Encoding")
         self.end_headers()
-        self.wfile.write(json.dumps(body).encode() if isinstance(body, dict) or isinstance(body, list) else body.encode())
+        self.wfile.write(payload)
 
     def do_OPTIONS(self):
         self._send(204, "")
@@ -312,7 +423,7 @@ class handler(BaseHTTPRequestHandler):
 
             import firebase_admin
             from firebase_admin import credentials, auth as fb_auth
-            from sqlalchemy import create_engine, text
+            from sqlalchemy import text
 
             # Verify Firebase token
             try:
@@ -347,13 +458,19 @@ class handler(BaseHTTPRequestHandler):
                 self._send(401, {"error": "Invalid token"})
                 return
 
-            db_url = os.environ.get("DATABASE_URL", "")
-            if not db_url:
+            if method == "GET":
+                page, page_size, status_filter, search = parse_list_params(self.path)
+                cache_key = (org_id, firebase_uid, page, page_size, status_filter, search)
+                cached = get_cached_list(cache_key)
+                if cached is not None:
+                    self._send(200, cached)
+                    return
+
+            engine = get_db_engine()
+            if engine is None:
                 self._send(500, {"error": "Database not configured"})
                 return
 
-            engine = create_engine(db_url, connect_args={"sslmode": "require"})
-
             with engine.connect() as conn:
                 # Get or create user - first try by Firebase UID, then by email
                 result = conn.execute(text("""
@@ -403,32 +520,10 @@ class handler(BaseHTTPRequestHandler):
                         user_name = row[2]
                         conn.commit()
 
-                # Check membership
-                result = conn.execute(text("""
-                    SELECT role FROM organization_members
-                    WHERE organization_id = :org_id AND user_id = :user_id
-                """), {"org_id": org_id, "user_id": user_id})
-                if not result.fetchone():
-                    self._send(403, {"error": "Not a member of this organization"})
-                    return
-
                 if method == "GET":
-                    # Parse query params
-                    parsed = urlparse(self.path)
-                    params = parse_qs(parsed.query)
-                    page = max(1, int(params.get("page", ["1"])[0]))
-                    page_size = min(100, max(1, int(params.get("page_size", ["20"])[0])))  # Limit to 100 max
-                    status_filter = params.get("status", [None])[0]
-                    search = params.get("search", [None])[0]
-
-                    # Validate status filter
-                    valid_statuses = ['draft', 'pending_review', 'approved', 'deprecated', 'superseded', 'at_risk']
-                    if status_filter and status_filter not in valid_statuses:
-                        status_filter = None
-
                     # Build query
                     where_clauses = ["d.organization_id = :org_id", "d.deleted_at IS NULL"]
-                    query_params = {"org_id": org_id}
+                    query_params = {"org_id": org_id, "user_id": user_id}
 
                     if status_filter:
                         where_clauses.append("d.status = :status")
@@ -440,31 +535,27 @@ class handler(BaseHTTPRequestHandler):
 
                     where_sql = " AND ".join(where_clauses)
 
-                    # Get total count
-                    count_result = conn.execute(text(f"""
-                        SELECT COUNT(*) FROM decisions d
-                        JOIN decision_versions dv ON d.current_version_id = dv.id
-                        WHERE {where_sql}
-                    """), query_params)
-                    total = count_result.fetchone()[0]
-
-                    # Get items with version counts and reviewer aggregates in single query
                     offset = (page - 1) * page_size
                     query_params["limit"] = page_size
                     query_params["offset"] = offset
 
+                    # Page, total count and membership in a single statement. The window
+                    # count is taken over the filtered set before LIMIT is applied.
                     result = conn.execute(text(f"""
                         WITH decision_data AS (
                             SELECT
                                 d.id, d.organization_id, d.decision_number, d.status,
                                 d.created_at,
+                                d.created_by,
                                 dv.id as version_id, dv.title, dv.impact_level, dv.tags,
-                                u.id as user_id, u.name as user_name, u.email as user_email,
-                                (SELECT COUNT(*) FROM decision_versions WHERE decision_id = d.id) as version_count
+                                COUNT(*) OVER () as total_count
                             FROM decisions d
                             JOIN decision_versions dv ON d.current_version_id = dv.id
-                            JOIN users u ON d.created_by = u.id
                             WHERE {where_sql}
+                              AND EXISTS (
+                                  SELECT 1 FROM organization_members
+                                  WHERE organization_id = :org_id AND user_id = :user_id
+                              )
                             ORDER BY d.created_at DESC
                             LIMIT :limit OFFSET :offset
                         ),
@@ -487,65 +578,121 @@ class handler(BaseHTTPRequestHandler):
                             LEFT JOIN approvals a ON a.decision_version_id = rr.decision_version_id
                                                  AND a.user_id = rr.user_id
                             GROUP BY dd.id, dd.version_id
+                        ),
+                        version_counts AS (
+                            SELECT decision_id, COUNT(*) as version_count
+                            FROM decision_versions
+                            WHERE decision_id IN (SELECT id FROM decision_data)
+                            GROUP BY decision_id
                         )
                         SELECT
                             dd.*,
+                            u.id as user_id, u.name as user_name, u.email as user_email,
+                            COALESCE(vc.version_count, 0) as version_count,
                             rd.reviewers,
                             rd.reviewer_count,
                             rd.approved_count,
                             rd.rejected_count
                         FROM decision_data dd
+                        JOIN users u ON dd.created_by = u.id
+                        LEFT JOIN version_counts vc ON vc.decision_id = dd.id
                         LEFT JOIN reviewer_data rd ON dd.id = rd.decision_id
                         ORDER BY dd.created_at DESC
                     """), query_params)
+                    rows = result.fetchall()
+
+                    if rows:
+                        total = rows[0].total_count
+                    else:
+                        # Empty page - tell non-members apart and report the real total
+                        count_result = conn.execute(text(f"""
+                            SELECT
+                                EXISTS (
+                                    SELECT 1 FROM organization_members
+                                    WHERE organization_id = :org_id AND user_id = :user_id
+                                ) as is_member,
+                                (
+                                    SELECT COUNT(*) FROM decisions d
+                                    JOIN decision_versions dv ON d.current_version_id = dv.id
+                                    WHERE {where_sql}
+                                ) as total
+                        """), query_params)
+                        is_member, total = count_result.fetchone()
+                        if not is_member:
+                            self._send(403, {"error": "Not a member of this organization"})
+                            return
 
+                    # UUIDs and datetimes are left as-is; orjson encodes them natively
+                    # (same RFC 3339 form as isoformat()) without per-row Python calls
                     items = []
-                    for row in result.fetchall():
+                    for row in rows:
                         item = {
-                            "id": str(row[0]),
-                            "organization_id": str(row[1]),
-                            "decision_number": row[2],
-                            "status": row[3],
-                            "created_at": row[4].isoformat() if row[4] else None,
-                            "title": row[6],
-                            "impact_level": row[7],
-                            "tags": row[8] or [],
+                            "id": row.id,
+                            "organization_id": row.organization_id,
+                            "decision_number": row.decision_number,
+                            "status": row.status,
+                            "created_at": row.created_at,
+                            "title": row.title,
+                            "impact_level": row.impact_level,
+                            "tags": row.tags or [],
                             "created_by": {
-                                "id": str(row[9]),
-                                "name": row[10],
-                                "email": row[11]
+                                "id": row.user_id,
+                                "name": row.user_name,
+                                "email": row.user_email
                             },
-                            "version_count": row[12]
+                            "version_count": row.version_count
                         }
 
                         # Only include reviewer data if there are reviewers
-                        reviewers = row[13]
-                        reviewer_count = row[14] or 0
-                        if reviewers and reviewer_count > 0:
-                            item["reviewers"] = reviewers
+                        reviewer_count = row.reviewer_count or 0
+                        if row.reviewers and reviewer_count > 0:
+                            item["reviewers"] = row.reviewers
                             item["approval_progress"] = {
                                 "required": reviewer_count,
-                                "approved": row[15] or 0,
-                                "rejected": row[16] or 0
+                                "approved": row.approved_count or 0,
+                                "rejected": row.rejected_count or 0
                             }
 
                         items.append(item)
 
-                    self._send(200, {
+                    response = {
                         "items": items,
                         "total": total,
                         "page": page,
                         "page_size": page_size,
                         "total_pages": (total + page_size - 1) // page_size if page_size > 0 else 0
-                    })
+                    }
+                    set_cached_list(cache_key, response)
+                    self._send(200, response)
 
                 elif method == "POST":
+                    # Check membership and load organization details (including the
+                    # free-tier decision count) in one round trip
+                    org_result = conn.execute(text("""
+                        SELECT
+                            EXISTS (
+                                SELECT 1 FROM organization_members
+                                WHERE organization_id = :org_id AND user_id = :user_id
+                            ) as is_member,
+                            o.name, o.slack_access_token, o.slack_channel_id, o.teams_webhook_url,
+                            COALESCE(o.subscription_tier, 'free') as subscription_tier,
+                            CASE WHEN COALESCE(o.subscription_tier, 'free') = 'free' THEN (
+                                SELECT COUNT(*) FROM decisions
+                                WHERE organization_id = :org_id AND deleted_at IS NULL
+                            ) END as decision_count
+                        FROM organizations o WHERE o.id = :org_id
+                    """), {"org_id": org_id, "user_id": user_id})
+                    org_row = org_result.fetchone()
+                    if not org_row or not org_row.is_member:
+                        self._send(403, {"error": "Not a member of this organization"})
+                        return
+
                     content_len = int(self.headers.get("Content-Length", 0))
                     # Limit request body size to 1MB
                     if content_len > 1024 * 1024:
                         self._send(413, {"error": "Request body too large"})
                         return
-                    body = json.loads(self.rfile.read(content_len)) if content_len > 0 else {}
+                    body = orjson.loads(self.rfile.read(content_len)) if content_len > 0 else {}
 
                     title = body.get("title", "").strip()[:500]  # Limit title length
                     content = body.get("content", {})
@@ -554,38 +701,23 @@ class handler(BaseHTTPRequestHandler):
                     reviewer_ids = body.get("reviewer_ids", [])[:50]  # Limit reviewers
 
                     # Validate impact level
-                    if impact_level not in ["low", "medium", "high", "critical"]:
+                    if impact_level not in VALID_IMPACT_LEVELS:
                         impact_level = "medium"
 
                     if not title:
                         self._send(400, {"error": "Title is required"})
                         return
 
-                    # Get organization details including subscription tier
-                    org_result = conn.execute(text("""
-                        SELECT name, slack_access_token, slack_channel_id, teams_webhook_url,
-                               COALESCE(subscription_tier, 'free') as subscription_tier
-                        FROM organizations WHERE id = :org_id
-                    """), {"org_id": org_id})
-                    org_row = org_result.fetchone()
-                    if not org_row:
-                        self._send(404, {"error": "Organization not found"})
-                        return
-
-                    org_name = org_row[0]
-                    slack_token = org_row[1]
-                    slack_channel_id = org_row[2]
-                    teams_webhook_url = org_row[3]
-                    subscription_tier = org_row[4]
+                    org_name = org_row.name
+                    slack_token = org_row.slack_access_token
+                    slack_channel_id = org_row.slack_channel_id
+                    teams_webhook_url = org_row.teams_webhook_url
+                    subscription_tier = org_row.subscription_tier
 
                     # Enforce plan limits for free tier
                     if subscription_tier == "free":
                         # Check decision count limit (50 for free plan)
-                        count_result = conn.execute(text("""
-                            SELECT COUNT(*) FROM decisions
-                            WHERE organization_id = :org_id AND deleted_at IS NULL
-                        """), {"org_id": org_id})
-                        decision_count = count_result.fetchone()[0]
+                        decision_count = org_row.decision_count
 
                         if decision_count >= 50:
                             self._send(403, {
@@ -596,29 +728,37 @@ class handler(BaseHTTPRequestHandler):
                             })
                             return
 
-                    # Get next decision number with retry for race conditions
-                    decision_id = str(uuid4())
-                    version_id = str(uuid4())
+                    # Allocate the next decision number from the per-org counter and create
+                    # the decision in one statement. The counter row lock serializes
+                    # concurrent creates; the MAX() floor is an index lookup that seeds new
+                    # orgs and skips past numbers taken by writers that bypass the counter.
+                    decision_id = str(uuid7())
+                    version_id = str(uuid7())
                     decision_number = None
 
                     for attempt in range(3):  # Retry up to 3 times
                         try:
-                            result = conn.execute(text("""
-                                SELECT COALESCE(MAX(decision_number), 0) + 1 FROM decisions
-                                WHERE organization_id = :org_id
-                            """), {"org_id": org_id})
-                            decision_number = result.fetchone()[0]
-
-                            # Create decision
-                            conn.execute(text("""
-                                INSERT INTO decisions (id, organization_id, decision_number, status, created_by, created_at, is_temporary)
-                                VALUES (:id, :org_id, :num, 'draft', :user_id, NOW(), false)
-                            """), {"id": decision_id, "org_id": org_id, "num": decision_number, "user_id": user_id})
+                            with conn.begin_nested():
+                                result = conn.execute(text("""
+                                    WITH counter AS (
+                                        INSERT INTO decision_counters (organization_id, next_number)
+                                        SELECT :org_id, COALESCE(MAX(decision_number), 0) + 2
+                                        FROM decisions WHERE organization_id = :org_id
+                                        ON CONFLICT (organization_id) DO UPDATE
+                                        SET next_number = GREATEST(decision_counters.next_number, EXCLUDED.next_number - 1) + 1
+                                        RETURNING next_number - 1 as decision_number
+                                    )
+                                    INSERT INTO decisions (id, organization_id, decision_number, status, created_by, created_at, is_temporary)
+                                    SELECT :id, :org_id, decision_number, 'draft', :user_id, NOW(), false
+                                    FROM counter
+                                    RETURNING decision_number, created_at
+                                """), {"id": decision_id, "org_id": org_id, "user_id": user_id})
+                                decision_number, created_at = result.fetchone()
                             break  # Success, exit retry loop
                         except Exception as insert_error:
                             if "duplicate" in str(insert_error).lower() or "unique" in str(insert_error).lower():
                                 if attempt < 2:
-                                    decision_id = str(uuid4())  # Generate new ID for retry
+                                    decision_id = str(uuid7())  # Generate new ID for retry
                                     continue
                             raise
 
@@ -627,14 +767,17 @@ class handler(BaseHTTPRequestHandler):
                         return
 
                     # Create version
-                    content_hash = hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+                    # Serialize once: the canonical (sorted) form is both hashed and stored,
+                    # JSONB does not preserve key order anyway
+                    content_json = json.dumps(content, sort_keys=True)
+                    content_hash = hashlib.sha256(content_json.encode()).hexdigest()
                     conn.execute(text("""
                         INSERT INTO decision_versions
                         (id, decision_id, version_number, title, impact_level, content, tags, created_by, created_at, change_summary, content_hash, custom_fields)
                         VALUES (:id, :did, 1, :title, :impact, :content, :tags, :user_id, NOW(), 'Initial version', :hash, '{}')
                     """), {
                         "id": version_id, "did": decision_id, "title": title,
-                        "impact": impact_level, "content": json.dumps(content),
+                        "impact": impact_level, "content": content_json,
                         "tags": tags, "user_id": user_id, "hash": content_hash
                     })
 
@@ -651,42 +794,35 @@ class handler(BaseHTTPRequestHandler):
                         """), {"version_id": version_id, "reviewer_id": reviewer_id, "user_id": user_id})
 
                     conn.commit()
+                    invalidate_list_cache(org_id)
+
+                    # Send notifications on the shared pool (non-blocking, run concurrently)
+                    if slack_token and slack_channel_id:
+                        _notification_executor.submit(
+                            send_slack_decision_created,
+                            slack_token=slack_token,
+                            channel_id=slack_channel_id,
+                            decision_number=decision_number,
+                            decision_id=decision_id,
+                            title=title,
+                            impact_level=impact_level,
+                            creator_name=user_name,
+                            org_name=org_name,
+                            tags=tags,
+                        )
 
-                    # Send notifications in background threads (truly non-blocking)
-                    def send_notifications():
-                        try:
-                            if slack_token and slack_channel_id:
-                                send_slack_decision_created(
-                                    slack_token=slack_token,
-                                    channel_id=slack_channel_id,
-                                    decision_number=decision_number,
-                                    decision_id=decision_id,
-                                    title=title,
-                                    impact_level=impact_level,
-                                    creator_name=user_name,
-                                    org_name=org_name,
-                                    tags=tags,
-                                )
-                        except Exception:
-                            pass
-
-                        try:
-                            if teams_webhook_url:
-                                send_teams_decision_created(
-                                    webhook_url=teams_webhook_url,
-                                    decision_number=decision_number,
-                                    decision_id=decision_id,
-                                    title=title,
-                                    impact_level=impact_level,
-                                    creator_name=user_name,
-                                    org_name=org_name,
-                                    tags=tags,
-                                )
-                        except Exception:
-                            pass
-
-                    # Start notifications in background thread
-                    threading.Thread(target=send_notifications, daemon=True).start()
+                    if teams_webhook_url:
+                        _notification_executor.submit(
+                            send_teams_decision_created,
+                            webhook_url=teams_webhook_url,
+                            decision_number=decision_number,
+                            decision_id=decision_id,
+                            title=title,
+                            impact_level=impact_level,
+                            creator_name=user_name,
+                            org_name=org_name,
+                            tags=tags,
+                        )
 
                     self._send(201, {
                         "id": decision_id,
@@ -698,7 +834,7 @@ class handler(BaseHTTPRequestHandler):
                             "name": user_name,
                             "email": user_email
                         },
-                        "created_at": datetime.utcnow().isoformat(),
+                        "created_at": created_at,
                         "version": {
                             "id": version_id,
                             "version_number": 1,
@@ -708,7 +844,7 @@ class handler(BaseHTTPRequestHandler):
                             "tags": tags,
                             "content_hash": content_hash,
                             "created_by": {"id": str(user_id), "name": user_name},
-                            "created_at": datetime.utcnow().isoformat(),
+                            "created_at": created_at,
                             "change_summary": "Initial version",
                             "is_current": True
                         },
@@ -7,6 +7,90 @@ from http.server import BaseHTTPRequestHandler
 import json
 import os
 
+from sqlalchemy import create_engine, text
+
+
+# Statements are built once per process so SQLAlchemy's compiled cache is reused
+USER_LOOKUP_SQL = text("""
+    WITH found AS (
+        SELECT id, name, email FROM users
+        WHERE auth_provider = 'firebase' AND auth_provider_id = :uid AND deleted_at IS NULL
+    ),
+    linked AS (
+        UPDATE users SET auth_provider = 'firebase', auth_provider_id = :uid, updated_at = NOW()
+        WHERE id = (
+            SELECT id FROM users
+            WHERE email = :email AND deleted_at IS NULL
+              AND NOT EXISTS (SELECT 1 FROM found)
+            LIMIT 1
+        )
+        RETURNING id, name, email
+    )
+    SELECT id, name, email FROM found
+    UNION ALL
+    SELECT id, name, email FROM linked
+""")
+
+
+MEMBERSHIP_SQL = text("""
+    SELECT role FROM organization_members
+    WHERE organization_id = :org_id AND user_id = :user_id
+""")
+
+
+PENDING_APPROVALS_SQL = text("""
+    SELECT
+        d.id as decision_id,
+        d.decision_number,
+        dv.id as version_id,
+        dv.title,
+        dv.impact_level,
+        d.status,
+        d.created_at,
+        u.id as creator_id,
+        u.name as creator_name,
+        u.email as creator_email
+    FROM decisions d
+    JOIN decision_versions dv ON d.current_version_id = dv.id
+    JOIN required_reviewers rr ON rr.decision_version_id = dv.id
+    JOIN users u ON d.created_by = u.id
+    WHERE rr.user_id = :user_id
+      AND d.organization_id = :org_id
+      AND d.status = 'pending_review'
+      AND d.deleted_at IS NULL
+      AND NOT EXISTS (
+          SELECT 1 FROM approvals a
+          WHERE a.decision_version_id = dv.id
+          AND a.user_id = :user_id
+      )
+    ORDER BY d.created_at DESC
+    LIMIT 10
+""")
+
+
+_db_engine = None
+
+
+def get_db_engine():
+    """Get the shared database engine, reused across warm invocations."""
+    global _db_engine
+    if _db_engine is not None:
+        return _db_engine
+
+    db_url = os.environ.get("DATABASE_URL", "")
+    if not db_url:
+        return None
+
+    _db_engine = create_engine(
+        db_url,
+        pool_size=5,
+        max_overflow=10,
+        pool_pre_ping=True,
+        pool_recycle=300,
+        connect_args={"sslmode": "require"},
+    )
+    return _db_engine
+
 
 class handler(BaseHTTPRequestHandler):
     def _send(self, status, body):
@@ -37,7 +121,6 @@ class handler(BaseHTTPRequestHandler):
 
             import firebase_admin
             from firebase_admin import credentials, auth as fb_auth
-            from sqlalchemy import create_engine, text
 
             try:
                 try:
@@ -62,40 +145,22 @@ class handler(BaseHTTPRequestHandler):
 
                 decoded = fb_auth.verify_id_token(token)
                 firebase_uid = decoded.get("uid") or decoded.get("user_id")
+                firebase_email = decoded.get("email")
             except Exception as e:
                 self._send(401, {"error": f"Invalid token: {str(e)}"})
                 return
 
-            db_url = os.environ.get("DATABASE_URL", "")
-            if not db_url:
+            engine = get_db_engine()
+            if engine is None:
                 self._send(500, {"error": "Database not configured"})
                 return
 
-            engine = create_engine(db_url, connect_args={"sslmode": "require"})
-
             with engine.connect() as conn:
-                # Get user - first try by Firebase UID, then by email
-                result = conn.execute(text("""
-                    SELECT id, name, email FROM users
-                    WHERE auth_provider = 'firebase' AND auth_provider_id = :uid AND deleted_at IS NULL
-                """), {"uid": firebase_uid})
+                # Get user in one round trip - first by Firebase UID, otherwise find by
+                # email (may have been created via Slack) and link Firebase auth to it
+                result = conn.execute(USER_LOOKUP_SQL, {"uid": firebase_uid, "email": firebase_email})
                 user_row = result.fetchone()
-
-                if not user_row and firebase_email:
-                    # Try to find by email (may have been created via Slack)
-                    result = conn.execute(text("""
-                        SELECT id, name, email FROM users
-                        WHERE email = :email AND deleted_at IS NULL
-                    """), {"email": firebase_email})
-                    user_row = result.fetchone()
-
-                    if user_row:
-                        # Found user by email - link Firebase auth to this user
-                        conn.execute(text("""
-                            UPDATE users SET auth_provider = 'firebase', auth_provider_id = :uid, updated_at = NOW()
-                            WHERE id = :user_id
-                        """), {"uid": firebase_uid, "user_id": user_row[0]})
-                        conn.commit()
+                conn.commit()
 
                 if not user_row:
                     self._send(401, {"error": "User not found"})
@@ -104,43 +169,13 @@ class handler(BaseHTTPRequestHandler):
                 user_id = user_row[0]
 
                 # Check membership
-                result = conn.execute(text("""
-                    SELECT role FROM organization_members
-                    WHERE organization_id = :org_id AND user_id = :user_id
-                """), {"org_id": org_id, "user_id": user_id})
+                result = conn.execute(MEMBERSHIP_SQL, {"org_id": org_id, "user_id": user_id})
                 if not result.fetchone():
                     self._send(403, {"error": "Not a member of this organization"})
                     return
 
                 # Get decisions where user is a required reviewer but hasn't voted
-                result = conn.execute(text("""
-                    SELECT
-                        d.id as decision_id,
-                        d.decision_number,
-                        dv.id as version_id,
-                        dv.title,
-                        dv.impact_level,
-                        d.status,
-                        d.created_at,
-                        u.id as creator_id,
-                        u.name as creator_name,
-                        u.email as creator_email
-                    FROM decisions d
-                    JOIN decision_versions dv ON d.current_version_id = dv.id
-                    JOIN required_reviewers rr ON rr.decision_version_id = dv.id
-                    JOIN users u ON d.created_by = u.id
-                    WHERE rr.user_id = :user_id
-                      AND d.organization_id = :org_id
-                      AND d.status = 'pending_review'
-                      AND d.deleted_at IS NULL
-                      AND NOT EXISTS (
-                          SELECT 1 FROM approvals a
-                          WHERE a.decision_version_id = dv.id
-                          AND a.user_id = :user_id
-                      )
-                    ORDER BY d.created_at DESC
-                    LIMIT 10
-                """), {"user_id": user_id, "org_id": org_id})
+                result = conn.execute(PENDING_APPROVALS_SQL, {"user_id": user_id, "org_id": org_id})
 
                 items = []
                 for row in result.fetchall():
@@ -8,19 +8,29 @@ Endpoints:
 """
 
 from http.server import BaseHTTPRequestHandler
+import functools
+import hashlib
 import json
 import os
+import time
+import traceback
 from urllib.parse import urlparse, parse_qs
-from uuid import uuid4
+from uuid import UUID, uuid4
 from datetime import datetime
-import urllib.request
+
+import firebase_admin
+import httpx
+import orjson
+from firebase_admin import auth as fb_auth, credentials
+from sqlalchemy import create_engine, text
 
 # Gemini API for AI relationship detection
-GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash-exp:generateContent"
+GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash-exp:streamGenerateContent"
 
 AI_RELATIONSHIP_PROMPT = """You are an AI assistant that analyzes engineering decisions to find relationships between them.
 
 Given a list of decisions with their titles, context, choices, and dates, identify meaningful relationships.
+Each decision is one line: id|number|title|status|impact|created|ctx:<context>|choice:<choice>|tags:<tags>
 
 RELATIONSHIP TYPES (you MUST only use these exact values):
 - "supersedes": Decision A replaces or overrides Decision B
@@ -51,54 +61,112 @@ OUTPUT FORMAT (JSON array):
 
 Only include relationships with confidence >= 0.6. Return empty array if no strong relationships found."""
 
-
-def analyze_relationships_with_gemini(decisions: list) -> list:
-    """Use Gemini AI to analyze decisions and find relationships."""
+# Shared HTTP client so the connection to Gemini (TCP + TLS) is kept alive
+# across warm invocations instead of being re-established per call
+_http_client = httpx.Client(timeout=30)
+
+
+def iter_json_array_items(chunks):
+    """Yield each element of a streamed top-level JSON array as soon as it is complete."""
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = None  # Index just past the opening '[' once it has arrived
+
+    for chunk in chunks:
+        buf += chunk
+        if pos is None:
+            start = buf.find("[")
+            if start < 0:
+                continue
+            pos = start + 1
+
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buf) or buf[pos] == "]":
+                break
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # Element not fully received yet - wait for the next chunk
+                break
+            # A number only ends at a delimiter; "[1" may still become "[12"
+            if (isinstance(item, (int, float)) and not isinstance(item, bool)
+                    and (end >= len(buf) or buf[end] not in " \t\r\n,]")):
+                break
+            pos = end
+            yield item
+
+        # Drop consumed text so the buffer stays small
+        buf = buf[pos:]
+        pos = 0
+
+
+def iter_gemini_stream_text(response):
+    """Yield the text fragments from a Gemini server-sent events response."""
+    for line in response.iter_lines():
+        if not line.startswith("data:"):
+            continue
+        event = orjson.loads(line[5:])
+        candidates = event.get("candidates", [])
+        if not candidates:
+            continue
+        for part in candidates[0].get("content", {}).get("parts", []):
+            text = part.get("text")
+            if text:
+                yield text
+
+
+@functools.lru_cache(maxsize=1024)
+def format_decision_summary(decision_id, decision_number, title, status, impact_level,
+                            created_at, context, choice, tags) -> str:
+    """Format one decision for the analysis prompt.
+
+    Cached on the full set of fields, so re-analyzing an unchanged decision
+    reuses its summary and any edit produces a fresh one. Whitespace runs in
+    free text are collapsed so each decision fits on one compact line.
+    """
+    context = " ".join(context.split())
+    choice = " ".join(choice.split())
+    return (f"{decision_id}|DECISION-{decision_number}|{title}|{status}|{impact_level}|{created_at}"
+            f"|ctx:{context}|choice:{choice}|tags:{','.join(tags)}")
+
+
+def analyze_relationships_with_gemini(decisions: list):
+    """Use Gemini AI to analyze decisions and yield relationships as they stream in."""
     gemini_key = os.environ.get("GEMINI_API_KEY", "")
     if not gemini_key:
         print("[RELATIONSHIPS] No GEMINI_API_KEY configured")
-        return []
+        return
 
     print(f"[RELATIONSHIPS] Analyzing {len(decisions)} decisions with Gemini")
 
     # Format decisions for analysis
     decision_summaries = []
     for d in decisions:
-        content = d.get("content", {})
-        if isinstance(content, str):
-            try:
-                content = json.loads(content)
-            except:
-                content = {"context": content}
-
-        summary = f"""
-DECISION ID: {d['id']}
-Number: DECISION-{d['decision_number']}
-Title: {d['title']}
-Status: {d['status']}
-Impact: {d.get('impact_level', 'medium')}
-Created: {d.get('created_at', 'Unknown')}
-Context: {content.get('context', 'N/A')[:500]}
-Choice: {content.get('choice', 'N/A')[:500]}
-Tags: {', '.join(d.get('tags', []))}
-"""
-        decision_summaries.append(summary)
-
-    decisions_text = "\n---\n".join(decision_summaries)
-
-    analysis_prompt = f"""Analyze these engineering decisions and identify relationships between them:
-
-{decisions_text}
-
-Return a JSON array of relationships. Focus on the most meaningful connections."""
-
-    url = f"{GEMINI_API_URL}?key={gemini_key}"
-    payload = json.dumps({
+        decision_summaries.append(format_decision_summary(
+            d['id'],
+            d['decision_number'],
+            d['title'],
+            d['status'],
+            d.get('impact_level', 'medium'),
+            d.get('created_at', 'Unknown'),
+            d['context'],
+            d['choice'],
+            tuple(d.get('tags', [])),
+        ))
+
+    decisions_text = "\n".join(decision_summaries)
+
+    analysis_prompt = f"Decisions:\n{decisions_text}\nReturn a JSON array of the most meaningful relationships."
+
+    url = f"{GEMINI_API_URL}?alt=sse&key={gemini_key}"
+    payload = orjson.dumps({
+        # The static instructions go in systemInstruction so the per-call
+        # content is only the decision list
+        "systemInstruction": {"parts": [{"text": AI_RELATIONSHIP_PROMPT}]},
         "contents": [{
-            "parts": [
-                {"text": AI_RELATIONSHIP_PROMPT},
-                {"text": analysis_prompt}
-            ]
+            "parts": [{"text": analysis_prompt}]
         }],
         "generationConfig": {
             "temperature": 0.3,
@@ -106,60 +174,257 @@ Return a JSON array of relationships. Focus on the most meaningful connections."
             "maxOutputTokens": 4096,
             "responseMimeType": "application/json"
         }
-    }).encode()
+    })
+
+    # Stream the response so each relationship is handed to the caller as
+    # soon as its object closes, instead of after the whole array arrives
+    parsed = 0
+    passed = 0
+    try:
+        with _http_client.stream("POST", url, content=payload, headers={"Content-Type": "application/json"}) as response:
+            response.raise_for_status()
+            for rel in iter_json_array_items(iter_gemini_stream_text(response)):
+                parsed += 1
+                if not isinstance(rel, dict) or rel.get("confidence", 0) < 0.6:
+                    continue
+                passed += 1
+                yield rel
+
+    except Exception as e:
+        print(f"[RELATIONSHIPS] Gemini API error: {e}")
+        traceback.print_exc()
 
-    req = urllib.request.Request(
-        url,
-        data=payload,
-        headers={"Content-Type": "application/json"}
+    print(f"[RELATIONSHIPS] Parsed {parsed} relationships from AI, {passed} passed confidence threshold")
+
+
+# Relationships for an org, each row already shaped as the API object by
+# Postgres so the driver materializes one JSON value instead of 15 columns
+_RELATIONSHIPS_SELECT = """
+    SELECT json_build_object(
+        'id', dr.id,
+        'source_decision_id', dr.source_decision_id,
+        'target_decision_id', dr.target_decision_id,
+        'relationship_type', dr.relationship_type,
+        'description', dr.description,
+        'confidence_score', dr.confidence_score,
+        'created_at', dr.created_at,
+        'source_decision', json_build_object(
+            'id', sd.id,
+            'decision_number', sd.decision_number,
+            'status', sd.status,
+            'title', sdv.title,
+            'impact_level', sdv.impact_level
+        ),
+        'target_decision', json_build_object(
+            'id', td.id,
+            'decision_number', td.decision_number,
+            'status', td.status,
+            'title', tdv.title,
+            'impact_level', tdv.impact_level
+        )
     )
+    FROM decision_relationships dr
+    JOIN decisions sd ON dr.source_decision_id = sd.id
+    JOIN decision_versions sdv ON sd.current_version_id = sdv.id
+    JOIN decisions td ON dr.target_decision_id = td.id
+    JOIN decision_versions tdv ON td.current_version_id = tdv.id
+    WHERE sd.organization_id = :org_id
+      AND td.organization_id = :org_id
+"""
 
-    try:
-        response = urllib.request.urlopen(req, timeout=30)
-        data = json.loads(response.read().decode())
+# Hot statements are built once per process. Their SQL text never varies
+# (id lists are bound as one array), so SQLAlchemy's compiled cache and
+# Postgres' statement statistics see a single statement each
+AUTH_SQL = text("""
+    WITH u AS (
+        SELECT id FROM users
+        WHERE auth_provider = 'firebase' AND auth_provider_id = :uid AND deleted_at IS NULL
+    )
+    SELECT
+        (SELECT id FROM u) as user_id,
+        EXISTS (
+            SELECT 1 FROM organization_members
+            WHERE organization_id = :org_id AND user_id = (SELECT id FROM u)
+        ) as is_member
+""")
+
+TABLE_EXISTS_SQL = text("SELECT to_regclass('decision_relationships') IS NOT NULL")
+
+# Keyset-paginated on (created_at, id); id breaks ties between relationships
+# inserted by the same generate run, which share one NOW()
+RELATIONSHIPS_PAGE_SQL = text(_RELATIONSHIPS_SELECT + """
+      AND (CAST(:cursor_at AS text) IS NULL OR (dr.created_at, dr.id) < (:cursor_at, :cursor_id))
+    ORDER BY dr.created_at DESC, dr.id DESC
+    LIMIT :limit
+""")
+
+RELATIONSHIPS_FOR_DECISIONS_SQL = text(_RELATIONSHIPS_SELECT + """
+      AND (dr.source_decision_id = ANY(CAST(:ids AS uuid[]))
+           OR dr.target_decision_id = ANY(CAST(:ids AS uuid[])))
+    ORDER BY dr.created_at DESC
+""")
+
+RECENT_DECISIONS_SQL = text("""
+    SELECT d.id, d.decision_number, d.status, d.created_at,
+           dv.title, dv.impact_level,
+           COALESCE(LEFT(dv.content->>'context', 300), 'N/A') as context,
+           COALESCE(LEFT(dv.content->>'choice', 300), 'N/A') as choice,
+           dv.tags, dv.id as version_id
+    FROM decisions d
+    JOIN decision_versions dv ON d.current_version_id = dv.id
+    WHERE d.organization_id = :org_id AND d.deleted_at IS NULL
+    ORDER BY d.created_at DESC
+    LIMIT 8
+""")
+
+DECISIONS_BY_ID_SQL = text("""
+    SELECT d.id, d.decision_number, d.status, d.created_at,
+           dv.title, dv.impact_level,
+           COALESCE(LEFT(dv.content->>'context', 300), 'N/A') as context,
+           COALESCE(LEFT(dv.content->>'choice', 300), 'N/A') as choice,
+           dv.tags, dv.id as version_id
+    FROM decisions d
+    JOIN decision_versions dv ON d.current_version_id = dv.id
+    WHERE d.organization_id = :org_id
+      AND d.id = ANY(CAST(:ids AS uuid[]))
+      AND d.deleted_at IS NULL
+""")
+
+INSERT_AI_RELATIONSHIPS_SQL = text("""
+    INSERT INTO decision_relationships
+    (id, source_decision_id, target_decision_id,
+     relationship_type, description, confidence_score, created_by, created_at)
+    SELECT v.id, v.src, v.tgt, CAST(v.type AS relationship_type),
+           v.description, v.conf, :user_id, NOW()
+    FROM jsonb_to_recordset(CAST(:rows AS jsonb))
+         AS v(id uuid, src uuid, tgt uuid, type text, description text, conf float)
+    ON CONFLICT (source_decision_id, target_decision_id, relationship_type) DO NOTHING
+    RETURNING id, source_decision_id, target_decision_id,
+              relationship_type::text as relationship_type, description, confidence_score
+""")
+
+
+_db_engine = None
+_relationships_table_exists = False
+
+
+def get_db_engine():
+    """Get the shared database engine, reused across warm invocations."""
+    global _db_engine
+    if _db_engine is not None:
+        return _db_engine
+
+    db_url = os.environ.get("DATABASE_URL", "")
+    if not db_url:
+        return None
+
+    _db_engine = create_engine(
+        db_url,
+        pool_size=5,
+        max_overflow=10,
+        pool_pre_ping=True,
+        pool_recycle=300,
+        connect_args={"sslmode": "require"},
+    )
+    return _db_engine
 
-        candidates = data.get("candidates", [])
-        if not candidates:
-            print("[RELATIONSHIPS] No candidates in Gemini response")
-            return []
 
-        text = candidates[0].get("content", {}).get("parts", [{}])[0].get("text", "")
-        print(f"[RELATIONSHIPS] Gemini raw response: {text[:500]}")
+# Decoded Firebase tokens keyed by SHA-256 of the raw token. Entries are only
+# served until the token's own exp claim, so repeat requests from the same
+# session skip the RSA signature check without extending token lifetime.
+TOKEN_CACHE_MAX_ENTRIES = 1024
+_token_cache = {}
 
-        # Parse JSON from response
-        if "```json" in text:
-            text = text.split("```json")[1].split("```")[0]
-        elif "```" in text:
-            text = text.split("```")[1].split("```")[0]
 
-        result = json.loads(text.strip())
-        print(f"[RELATIONSHIPS] Parsed {len(result) if isinstance(result, list) else 0} relationships from AI")
+def verify_token_cached(token: str) -> dict:
+    """Verify a Firebase ID token, reusing the decoded claims until it expires."""
+    key = hashlib.sha256(token.encode()).hexdigest()
+    decoded = _token_cache.get(key)
+    if decoded and decoded.get("exp", 0) > time.time():
+        return decoded
 
-        if not isinstance(result, list):
-            return []
+    decoded = fb_auth.verify_id_token(token)
+    if len(_token_cache) >= TOKEN_CACHE_MAX_ENTRIES:
+        _token_cache.clear()
+    _token_cache[key] = decoded
+    return decoded
 
-        # Filter by confidence
-        filtered = [r for r in result if r.get("confidence", 0) >= 0.6]
-        print(f"[RELATIONSHIPS] {len(filtered)} relationships passed confidence threshold")
-        return filtered
 
-    except Exception as e:
-        import traceback
-        print(f"[RELATIONSHIPS] Gemini API error: {e}")
-        traceback.print_exc()
-        return []
+# Validated Gemini analysis from a generate run, keyed by a digest of the org
+# and the analyzed decisions' versions. Only the analysis is cached; the insert
+# still runs on every request, so rows deleted in the meantime are recreated
+# rather than replayed with dead ids. Only non-empty results are stored, so a
+# Gemini failure or an empty analysis is retried on the next request.
+GENERATE_CACHE_TTL = 300
+GENERATE_CACHE_MAX_ENTRIES = 256
+_generate_cache = {}
+
+
+def generate_cache_key(org_id, decisions) -> str:
+    """Digest identifying an org's set of decisions at their current versions."""
+    parts = sorted(f"{d['id']}:{d['version_id']}:{d['status']}" for d in decisions)
+    return hashlib.sha256(f"{org_id}|{','.join(parts)}".encode()).hexdigest()
+
+
+def get_cached_generate(key):
+    """Return a cached generate analysis if it has not expired."""
+    entry = _generate_cache.get(key)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def set_cached_generate(key, relationships):
+    """Store a generate analysis for GENERATE_CACHE_TTL seconds."""
+    if len(_generate_cache) >= GENERATE_CACHE_MAX_ENTRIES:
+        _generate_cache.clear()
+    _generate_cache[key] = (time.monotonic() + GENERATE_CACHE_TTL, relationships)
+
+
+RELATIONSHIPS_PAGE_DEFAULT = 100
+RELATIONSHIPS_PAGE_MAX = 200
+
+
+def parse_page_params(params):
+    """Parse limit and cursor for the unfiltered relationships list.
+
+    The cursor is the "created_at|id" of the last relationship on the previous
+    page, as returned in next_cursor. Raises ValueError if either is malformed.
+    """
+    limit = int(params.get("limit", [str(RELATIONSHIPS_PAGE_DEFAULT)])[0])
+    limit = min(RELATIONSHIPS_PAGE_MAX, max(1, limit))
+
+    cursor = params.get("cursor", [None])[0]
+    if not cursor:
+        return limit, None, None
+
+    cursor_at, _, cursor_id = cursor.partition("|")
+    if not cursor_at or not cursor_id:
+        raise ValueError("malformed cursor")
+    return limit, cursor_at, str(UUID(cursor_id))
 
 
 class handler(BaseHTTPRequestHandler):
+    # Every response carries Content-Length, so the connection can stay open
+    protocol_version = "HTTP/1.1"
+
     def _send(self, status, body):
+        if isinstance(body, (dict, list)):
+            payload = orjson.dumps(body)
+        else:
+            payload = body.encode() if body else b""
+
         self.send_response(status)
         self.send_header("Content-Type", "application/json")
+        # A 204 must not carry Content-Length (RFC 7230 section 3.3.2)
+        if status != 204:
+            self.send_header("Content-Length", str(len(payload)))
         self.send_header("Access-Control-Allow-Origin", "*")
         self.send_header("Access-Control-Allow-Methods", "GET, POST, DELETE, OPTIONS")
         self.send_header("Access-Control-Allow-Headers", "Authorization, Content-Type, X-Organization-ID")
         self.end_headers()
-        if body:
-            self.wfile.write(json.dumps(body).encode() if isinstance(body, (dict, list)) else body.encode())
+        if payload:
+            self.wfile.write(payload)
 
     def do_OPTIONS(self):
         self._send(204, None)
@@ -174,6 +439,21 @@ class handler(BaseHTTPRequestHandler):
         self._handle("DELETE")
 
     def _handle(self, method):
+        # Drain the request body before any early return. On a kept-alive
+        # connection an unread body would be parsed as the next request line.
+        try:
+            content_len = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            self.close_connection = True
+            self._send(400, {"error": "Invalid Content-Length"})
+            return
+        # Limit request body size to 1MB
+        if content_len > 1024 * 1024:
+            self.close_connection = True
+            self._send(413, {"error": "Request body too large"})
+            return
+        raw_body = self.rfile.read(content_len) if content_len > 0 else b""
+
         try:
             auth = self.headers.get("Authorization", "")
             if not auth.startswith("Bearer "):
@@ -187,10 +467,6 @@ class handler(BaseHTTPRequestHandler):
 
             token = auth[7:]
 
-            import firebase_admin
-            from firebase_admin import credentials, auth as fb_auth
-            from sqlalchemy import create_engine, text
-
             # Verify Firebase token
             try:
                 try:
@@ -213,7 +489,7 @@ class handler(BaseHTTPRequestHandler):
                     })
                     firebase_admin.initialize_app(cred)
 
-                decoded = fb_auth.verify_id_token(token)
+                decoded = verify_token_cached(token)
                 firebase_uid = decoded.get("uid") or decoded.get("user_id")
                 if not firebase_uid:
                     self._send(401, {"error": "Invalid token"})
@@ -222,50 +498,38 @@ class handler(BaseHTTPRequestHandler):
                 self._send(401, {"error": "Invalid token"})
                 return
 
-            db_url = os.environ.get("DATABASE_URL", "")
-            if not db_url:
+            engine = get_db_engine()
+            if engine is None:
                 self._send(500, {"error": "Database not configured"})
                 return
 
-            engine = create_engine(db_url, connect_args={"sslmode": "require"})
-
             with engine.connect() as conn:
-                # Get user
-                result = conn.execute(text("""
-                    SELECT id FROM users
-                    WHERE auth_provider = 'firebase' AND auth_provider_id = :uid AND deleted_at IS NULL
-                """), {"uid": firebase_uid})
-                user_row = result.fetchone()
-
-                if not user_row:
+                # Resolve the user and their membership in one round-trip
+                result = conn.execute(AUTH_SQL, {"uid": firebase_uid, "org_id": org_id})
+                auth_row = result.fetchone()
+
+                if auth_row.user_id is None:
                     self._send(401, {"error": "User not found"})
                     return
 
-                user_id = str(user_row[0])
+                user_id = str(auth_row.user_id)
 
-                # Check membership
-                result = conn.execute(text("""
-                    SELECT role FROM organization_members
-                    WHERE organization_id = :org_id AND user_id = :user_id
-                """), {"org_id": org_id, "user_id": user_id})
-                if not result.fetchone():
+                if not auth_row.is_member:
                     self._send(403, {"error": "Not a member of this organization"})
                     return
 
                 parsed = urlparse(self.path)
                 params = parse_qs(parsed.query)
 
-                # Check if decision_relationships table exists
-                try:
-                    table_check = conn.execute(text("""
-                        SELECT EXISTS (
-                            SELECT FROM information_schema.tables
-                            WHERE table_name = 'decision_relationships'
-                        )
-                    """))
-                    table_exists = table_check.fetchone()[0]
-                except:
-                    table_exists = False
+                # Check if decision_relationships table exists. Once seen it stays,
+                # so only a missing table is re-checked on later requests
+                global _relationships_table_exists
+                if not _relationships_table_exists:
+                    try:
+                        _relationships_table_exists = bool(conn.execute(TABLE_EXISTS_SQL).scalar())
+                    except:
+                        _relationships_table_exists = False
+                table_exists = _relationships_table_exists
 
                 if not table_exists:
                     # Table doesn't exist - return empty for GET, error for POST
@@ -284,102 +548,37 @@ class handler(BaseHTTPRequestHandler):
                     if decision_ids:
                         # Filter by specific decisions - join with decisions to filter by org
                         ids_list = decision_ids.split(",")
-                        src_placeholders = ",".join([f":src_id{i}" for i in range(len(ids_list))])
-                        tgt_placeholders = ",".join([f":tgt_id{i}" for i in range(len(ids_list))])
-                        id_params = {}
-                        for i, id in enumerate(ids_list):
-                            id_params[f"src_id{i}"] = id
-                            id_params[f"tgt_id{i}"] = id
-
-                        result = conn.execute(text(f"""
-                            SELECT
-                                dr.id,
-                                dr.source_decision_id,
-                                dr.target_decision_id,
-                                dr.relationship_type::text,
-                                dr.description,
-                                dr.confidence_score,
-                                dr.created_at,
-                                sd.decision_number as source_number,
-                                sd.status::text as source_status,
-                                sdv.title as source_title,
-                                sdv.impact_level::text as source_impact,
-                                td.decision_number as target_number,
-                                td.status::text as target_status,
-                                tdv.title as target_title,
-                                tdv.impact_level::text as target_impact
-                            FROM decision_relationships dr
-                            JOIN decisions sd ON dr.source_decision_id = sd.id
-                            JOIN decision_versions sdv ON sd.current_version_id = sdv.id
-                            JOIN decisions td ON dr.target_decision_id = td.id
-                            JOIN decision_versions tdv ON td.current_version_id = tdv.id
-                            WHERE sd.organization_id = :org_id
-                              AND td.organization_id = :org_id
-                              AND (dr.source_decision_id IN ({src_placeholders})
-                                   OR dr.target_decision_id IN ({tgt_placeholders}))
-                            ORDER BY dr.created_at DESC
-                        """), {"org_id": org_id, **id_params})
-                    else:
-                        # Get all relationships for org - filter by decisions belonging to org
-                        result = conn.execute(text("""
-                            SELECT
-                                dr.id,
-                                dr.source_decision_id,
-                                dr.target_decision_id,
-                                dr.relationship_type::text,
-                                dr.description,
-                                dr.confidence_score,
-                                dr.created_at,
-                                sd.decision_number as source_number,
-                                sd.status::text as source_status,
-                                sdv.title as source_title,
-                                sdv.impact_level::text as source_impact,
-                                td.decision_number as target_number,
-                                td.status::text as target_status,
-                                tdv.title as target_title,
-                                tdv.impact_level::text as target_impact
-                            FROM decision_relationships dr
-                            JOIN decisions sd ON dr.source_decision_id = sd.id
-                            JOIN decision_versions sdv ON sd.current_version_id = sdv.id
-                            JOIN decisions td ON dr.target_decision_id = td.id
-                            JOIN decision_versions tdv ON td.current_version_id = tdv.id
-                            WHERE sd.organization_id = :org_id
-                              AND td.organization_id = :org_id
-                            ORDER BY dr.created_at DESC
-                        """), {"org_id": org_id})
-
-                    relationships = []
-                    for row in result.fetchall():
-                        relationships.append({
-                            "id": str(row[0]),
-                            "source_decision_id": str(row[1]),
-                            "target_decision_id": str(row[2]),
-                            "relationship_type": row[3],
-                            "description": row[4],
-                            "confidence_score": row[5],
-                            "created_at": row[6].isoformat() if row[6] else None,
-                            "source_decision": {
-                                "id": str(row[1]),
-                                "decision_number": row[7],
-                                "status": row[8],
-                                "title": row[9],
-                                "impact_level": row[10]
-                            },
-                            "target_decision": {
-                                "id": str(row[2]),
-                                "decision_number": row[11],
-                                "status": row[12],
-                                "title": row[13],
-                                "impact_level": row[14]
-                            }
-                        })
+                        result = conn.execute(RELATIONSHIPS_FOR_DECISIONS_SQL, {"org_id": org_id, "ids": ids_list})
+                        relationships = result.scalars().all()
+                        self._send(200, {"relationships": relationships})
+                        return
+
+                    # Get all relationships for org - filter by decisions belonging to org,
+                    # one keyset page at a time
+                    try:
+                        limit, cursor_at, cursor_id = parse_page_params(params)
+                    except ValueError:
+                        self._send(400, {"error": "Invalid limit or cursor"})
+                        return
+
+                    result = conn.execute(RELATIONSHIPS_PAGE_SQL, {
+                        "org_id": org_id,
+                        "cursor_at": cursor_at,
+                        "cursor_id": cursor_id,
+                        "limit": limit
+                    })
+                    relationships = result.scalars().all()
 
-                    self._send(200, {"relationships": relationships})
+                    next_cursor = None
+                    if len(relationships) == limit:
+                        last = relationships[-1]
+                        next_cursor = f"{last['created_at']}|{last['id']}"
+
+                    self._send(200, {"relationships": relationships, "next_cursor": next_cursor})
 
                 # POST /api/v1/decisions/relationships - Create relationship or generate with AI
                 elif method == "POST":
-                    content_len = int(self.headers.get("Content-Length", 0))
-                    body = json.loads(self.rfile.read(content_len)) if content_len > 0 else {}
+                    body = orjson.loads(raw_body) if raw_body else {}
 
                     action = body.get("action", "create")
 
@@ -389,101 +588,70 @@ class handler(BaseHTTPRequestHandler):
 
                         if not decision_ids:
                             # Get recent decisions (up to 8)
-                            result = conn.execute(text("""
-                                SELECT d.id, d.decision_number, d.status, d.created_at,
-                                       dv.title, dv.impact_level, dv.content, dv.tags
-                                FROM decisions d
-                                JOIN decision_versions dv ON d.current_version_id = dv.id
-                                WHERE d.organization_id = :org_id AND d.deleted_at IS NULL
-                                ORDER BY d.created_at DESC
-                                LIMIT 8
-                            """), {"org_id": org_id})
+                            result = conn.execute(RECENT_DECISIONS_SQL, {"org_id": org_id})
                         else:
-                            placeholders = ",".join([f":id{i}" for i in range(len(decision_ids))])
-                            id_params = {f"id{i}": id for i, id in enumerate(decision_ids)}
-                            result = conn.execute(text(f"""
-                                SELECT d.id, d.decision_number, d.status, d.created_at,
-                                       dv.title, dv.impact_level, dv.content, dv.tags
-                                FROM decisions d
-                                JOIN decision_versions dv ON d.current_version_id = dv.id
-                                WHERE d.organization_id = :org_id
-                                  AND d.id IN ({placeholders})
-                                  AND d.deleted_at IS NULL
-                            """), {"org_id": org_id, **id_params})
+                            result = conn.execute(DECISIONS_BY_ID_SQL, {"org_id": org_id, "ids": list(decision_ids)})
 
                         decisions = []
-                        for row in result.fetchall():
+                        for row in result.mappings():
                             decisions.append({
-                                "id": str(row[0]),
-                                "decision_number": row[1],
-                                "status": row[2],
-                                "created_at": row[3].isoformat() if row[3] else None,
-                                "title": row[4],
-                                "impact_level": row[5],
-                                "content": row[6] if isinstance(row[6], dict) else {},
-                                "tags": row[7] or []
+                                **row,
+                                "id": str(row["id"]),
+                                "created_at": row["created_at"].isoformat() if row["created_at"] else None,
+                                "tags": row["tags"] or [],
+                                "version_id": str(row["version_id"])
                             })
 
                         if len(decisions) < 2:
                             self._send(200, {"relationships": [], "message": "Need at least 2 decisions to analyze"})
                             return
 
-                        print(f"[RELATIONSHIPS] Sending {len(decisions)} decisions to AI for analysis")
-
-                        # Get AI analysis
-                        ai_relationships = analyze_relationships_with_gemini(decisions)
-                        print(f"[RELATIONSHIPS] AI returned {len(ai_relationships)} relationships")
-
-                        # Get existing relationships to avoid duplicates
-                        existing = set()
-                        result = conn.execute(text("""
-                            SELECT dr.source_decision_id, dr.target_decision_id, dr.relationship_type::text
-                            FROM decision_relationships dr
-                            JOIN decisions sd ON dr.source_decision_id = sd.id
-                            WHERE sd.organization_id = :org_id
-                        """), {"org_id": org_id})
-                        for row in result.fetchall():
-                            existing.add((str(row[0]), str(row[1]), row[2]))
-
-                        # Insert new relationships
+                        # Repeat generates over unchanged decisions reuse the last analysis.
+                        # A new version or status change on any decision changes the key
+                        cache_key = generate_cache_key(org_id, decisions)
+                        analysis = get_cached_generate(cache_key)
+                        if analysis is not None:
+                            print(f"[RELATIONSHIPS] Reusing cached analysis for {len(decisions)} decisions")
+                        else:
+                            print(f"[RELATIONSHIPS] Sending {len(decisions)} decisions to AI for analysis")
+
+                            # The analyzed decisions were loaded above scoped to this org and
+                            # excluding deleted ones, so they double as the set of valid endpoints
+                            analyzed_ids = {d["id"] for d in decisions}
+
+                            # Validate each relationship as it streams in. The rows are only
+                            # collected here and written in a single insert once the stream ends
+                            analysis = []
+                            for rel in analyze_relationships_with_gemini(decisions):
+                                # Verify both decisions exist and belong to org
+                                if rel["source_id"] not in analyzed_ids or rel["target_id"] not in analyzed_ids:
+                                    continue
+
+                                # A self-reference would fail the no_self_reference check and abort the batch
+                                if rel["source_id"] == rel["target_id"]:
+                                    continue
+
+                                analysis.append({
+                                    "src": rel["source_id"],
+                                    "tgt": rel["target_id"],
+                                    "type": rel["relationship_type"],
+                                    "description": rel.get("description", ""),
+                                    "conf": rel.get("confidence", 0.7)
+                                })
+
+                            if analysis:
+                                set_cached_generate(cache_key, analysis)
+
+                        # Insert them in one statement, even on a cache hit, so relationships
+                        # deleted since the analysis are recreated. Pairs that already exist (or
+                        # repeat within the batch) hit unique_relationship and are skipped, and
+                        # RETURNING reports only the rows actually created
+                        # Rows keep their UUID values; orjson encodes them natively
                         created = []
-                        for rel in ai_relationships:
-                            key = (rel["source_id"], rel["target_id"], rel["relationship_type"])
-                            if key in existing:
-                                continue
-
-                            # Verify both decisions exist and belong to org
-                            check = conn.execute(text("""
-                                SELECT COUNT(*) FROM decisions
-                                WHERE id IN (:src, :tgt) AND organization_id = :org_id AND deleted_at IS NULL
-                            """), {"src": rel["source_id"], "tgt": rel["target_id"], "org_id": org_id})
-                            if check.fetchone()[0] != 2:
-                                continue
-
-                            rel_id = str(uuid4())
-                            conn.execute(text("""
-                                INSERT INTO decision_relationships
-                                (id, source_decision_id, target_decision_id,
-                                 relationship_type, description, confidence_score, created_by, created_at)
-                                VALUES (:id, :src, :tgt, CAST(:type AS relationship_type), :desc, :conf, :user_id, NOW())
-                            """), {
-                                "id": rel_id,
-                                "src": rel["source_id"],
-                                "tgt": rel["target_id"],
-                                "type": rel["relationship_type"],
-                                "desc": rel.get("description", ""),
-                                "conf": rel.get("confidence", 0.7),
-                                "user_id": user_id
-                            })
-                            created.append({
-                                "id": rel_id,
-                                "source_decision_id": rel["source_id"],
-                                "target_decision_id": rel["target_id"],
-                                "relationship_type": rel["relationship_type"],
-                                "description": rel.get("description", ""),
-                                "confidence_score": rel.get("confidence", 0.7)
-                            })
-                            existing.add(key)
+                        if analysis:
+                            new_rows = [{"id": str(uuid4()), **rel} for rel in analysis]
+                            result = conn.execute(INSERT_AI_RELATIONSHIPS_SQL, {"rows": orjson.dumps(new_rows).decode(), "user_id": user_id})
+                            created = [dict(row) for row in result.mappings()]
 
                         conn.commit()
                         self._send(200, {"relationships": created, "analyzed_count": len(decisions)})
@@ -513,7 +681,7 @@ class handler(BaseHTTPRequestHandler):
                             SELECT COUNT(*) FROM decisions
                             WHERE id IN (:src, :tgt) AND organization_id = :org_id AND deleted_at IS NULL
                         """), {"src": source_id, "tgt": target_id, "org_id": org_id})
-                        if check.fetchone()[0] != 2:
+                        if check.scalar() != 2:
                             self._send(404, {"error": "One or both decisions not found"})
                             return
 
@@ -556,6 +724,5 @@ class handler(BaseHTTPRequestHandler):
                     self._send(405, {"error": "Method not allowed"})
 
         except Exception as e:
-            import traceback
             traceback.print_exc()
             self._send(500, {"error": str(e)})
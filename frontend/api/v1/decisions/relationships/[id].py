@@ -1,9 +1,95 @@
 """Delete relationship endpoint - DELETE /api/v1/decisions/relationships/[id]"""
 
 from http.server import BaseHTTPRequestHandler
-import json
+import hashlib
 import os
-from urllib.parse import urlparse
+import time
+import traceback
+
+import jwt
+import orjson
+from sqlalchemy import create_engine, text
+
+
+_db_engine = None
+
+
+def get_db_engine():
+    """Get the shared database engine, reused across warm invocations."""
+    global _db_engine
+    if _db_engine is not None:
+        return _db_engine
+
+    db_url = os.environ.get("DATABASE_URL", "")
+    if not db_url:
+        return None
+
+    _db_engine = create_engine(
+        db_url,
+        pool_size=5,
+        max_overflow=10,
+        pool_pre_ping=True,
+        pool_recycle=300,
+        connect_args={"sslmode": "require"},
+    )
+    return _db_engine
+
+
+# Google's public keys for Firebase ID tokens. The client keeps the fetched key
+# set in memory, so after the first request in a container tokens are checked
+# locally instead of through firebase_admin and a fetch from googleapis.com.
+FIREBASE_JWKS_URL = "https://www.googleapis.com/service_accounts/v1/jwk/securetoken@system.gserviceaccount.com"
+_jwks_client = jwt.PyJWKClient(FIREBASE_JWKS_URL, lifespan=3600)
+
+
+def verify_firebase_token(token: str, project_id: str) -> dict:
+    """Verify a Firebase ID token's signature and claims offline."""
+    signing_key = _jwks_client.get_signing_key_from_jwt(token)
+    decoded = jwt.decode(
+        token,
+        signing_key.key,
+        algorithms=["RS256"],
+        audience=project_id,
+        issuer=f"https://securetoken.google.com/{project_id}",
+    )
+    if not decoded.get("sub"):
+        raise jwt.InvalidTokenError("Token has no subject")
+    decoded["uid"] = decoded["sub"]
+    return decoded
+
+
+# Decoded Firebase tokens keyed by SHA-256 of the raw token. Entries are only
+# served until the token's own exp claim, so repeat requests from the same
+# session skip the RSA signature check without extending token lifetime.
+TOKEN_CACHE_MAX_ENTRIES = 1024
+_token_cache = {}
+
+
+def verify_token_cached(token: str) -> dict:
+    """Verify a Firebase ID token, reusing the decoded claims until it expires."""
+    key = hashlib.sha256(token.encode()).hexdigest()
+    decoded = _token_cache.get(key)
+    if decoded and decoded.get("exp", 0) > time.time():
+        return decoded
+
+    decoded = verify_firebase_token(token, os.environ.get("FIREBASE_PROJECT_ID", ""))
+    if len(_token_cache) >= TOKEN_CACHE_MAX_ENTRIES:
+        _token_cache.clear()
+    _token_cache[key] = decoded
+    return decoded
+
+
+# Fixed error bodies, serialized once at import instead of on every failure.
+_ERR_UNAUTH = b'{"error":"Not authenticated"}'
+_ERR_NO_ORG = b'{"error":"X-Organization-ID header required"}'
+_ERR_NO_RELATIONSHIP_ID = b'{"error":"Relationship ID required"}'
+_ERR_FIREBASE_NOT_CONFIGURED = b'{"error":"Firebase not configured"}'
+_ERR_INVALID_TOKEN = b'{"error":"Invalid token"}'
+_ERR_DB_NOT_CONFIGURED = b'{"error":"Database not configured"}'
+_ERR_USER_NOT_FOUND = b'{"error":"User not found"}'
+_ERR_NOT_MEMBER = b'{"error":"Not a member of this organization"}'
+_ERR_RELATIONSHIP_NOT_FOUND = b'{"error":"Relationship not found"}'
+
 
 class handler(BaseHTTPRequestHandler):
     def _send(self, status, body):
@@ -14,7 +100,7 @@ class handler(BaseHTTPRequestHandler):
         self.send_header("Access-Control-Allow-Headers", "Authorization, Content-Type, X-Organization-ID")
         self.end_headers()
         if body:
-            self.wfile.write(json.dumps(body).encode() if isinstance(body, dict) else body.encode())
+            self.wfile.write(body if isinstance(body, bytes) else orjson.dumps(body) if isinstance(body, dict) else body.encode())
 
     def do_OPTIONS(self):
         self._send(204, None)
@@ -23,110 +109,91 @@ class handler(BaseHTTPRequestHandler):
         try:
             auth = self.headers.get("Authorization", "")
             if not auth.startswith("Bearer "):
-                self._send(401, {"error": "Not authenticated"})
+                self._send(401, _ERR_UNAUTH)
                 return
 
             org_id = self.headers.get("X-Organization-ID")
             if not org_id:
-                self._send(400, {"error": "X-Organization-ID header required"})
+                self._send(400, _ERR_NO_ORG)
                 return
 
-            # Extract relationship ID from path
-            parsed = urlparse(self.path)
-            path_parts = parsed.path.strip("/").split("/")
-            if len(path_parts) < 5:
-                self._send(400, {"error": "Relationship ID required"})
+            # Extract relationship ID from the last path segment, ignoring
+            # any query string. Anything that isn't UUID-length is rejected
+            # here rather than by Postgres.
+            path = self.path.split("?", 1)[0].rstrip("/")
+            relationship_id = path[path.rfind("/") + 1:]
+            if len(relationship_id) != 36:
+                self._send(400, _ERR_NO_RELATIONSHIP_ID)
                 return
-            relationship_id = path_parts[-1]
 
             token = auth[7:]
 
-            import firebase_admin
-            from firebase_admin import credentials, auth as fb_auth
-            from sqlalchemy import create_engine, text
-
             # Verify Firebase token
+            if not os.environ.get("FIREBASE_PROJECT_ID"):
+                self._send(500, _ERR_FIREBASE_NOT_CONFIGURED)
+                return
+
             try:
-                try:
-                    firebase_admin.get_app()
-                except ValueError:
-                    project_id = os.environ.get("FIREBASE_PROJECT_ID")
-                    client_email = os.environ.get("FIREBASE_CLIENT_EMAIL")
-                    private_key = os.environ.get("FIREBASE_PRIVATE_KEY", "").replace("\\n", "\n")
-
-                    if not all([project_id, client_email, private_key]):
-                        self._send(500, {"error": "Firebase not configured"})
-                        return
-
-                    cred = credentials.Certificate({
-                        "type": "service_account",
-                        "project_id": project_id,
-                        "private_key": private_key,
-                        "client_email": client_email,
-                        "token_uri": "https://oauth2.googleapis.com/token",
-                    })
-                    firebase_admin.initialize_app(cred)
-
-                decoded = fb_auth.verify_id_token(token)
+                decoded = verify_token_cached(token)
                 firebase_uid = decoded.get("uid") or decoded.get("user_id")
                 if not firebase_uid:
-                    self._send(401, {"error": "Invalid token"})
+                    self._send(401, _ERR_INVALID_TOKEN)
                     return
             except Exception:
-                self._send(401, {"error": "Invalid token"})
+                self._send(401, _ERR_INVALID_TOKEN)
                 return
 
-            db_url = os.environ.get("DATABASE_URL", "")
-            if not db_url:
-                self._send(500, {"error": "Database not configured"})
+            engine = get_db_engine()
+            if engine is None:
+                self._send(500, _ERR_DB_NOT_CONFIGURED)
                 return
 
-            engine = create_engine(db_url, connect_args={"sslmode": "require"})
-
             with engine.connect() as conn:
-                # Get user
+                # Authorize and delete in one statement. The delete only runs when
+                # the caller is a member, and the flags tell the failure cases apart.
+                # Both source and target decisions must belong to the organization
                 result = conn.execute(text("""
-                    SELECT id FROM users
-                    WHERE auth_provider = 'firebase' AND auth_provider_id = :uid AND deleted_at IS NULL
-                """), {"uid": firebase_uid})
-                user_row = result.fetchone()
+                    WITH u AS (
+                        SELECT id FROM users
+                        WHERE auth_provider = 'firebase' AND auth_provider_id = :uid AND deleted_at IS NULL
+                    ),
+                    m AS (
+                        SELECT 1 FROM organization_members
+                        WHERE organization_id = :org_id AND user_id = (SELECT id FROM u)
+                    ),
+                    deleted AS (
+                        DELETE FROM decision_relationships dr
+                        USING decisions sd, decisions td
+                        WHERE dr.id = :rel_id
+                          AND dr.source_decision_id = sd.id
+                          AND dr.target_decision_id = td.id
+                          AND sd.organization_id = :org_id
+                          AND td.organization_id = :org_id
+                          AND EXISTS (SELECT 1 FROM m)
+                        RETURNING dr.id
+                    )
+                    SELECT
+                        (SELECT id FROM u) as user_id,
+                        EXISTS (SELECT 1 FROM m) as is_member,
+                        EXISTS (SELECT 1 FROM deleted) as deleted
+                """), {"uid": firebase_uid, "org_id": org_id, "rel_id": relationship_id})
+                row = result.fetchone()
+                conn.commit()
 
-                if not user_row:
-                    self._send(401, {"error": "User not found"})
+                if row.user_id is None:
+                    self._send(401, _ERR_USER_NOT_FOUND)
                     return
 
-                # Check membership
-                result = conn.execute(text("""
-                    SELECT role FROM organization_members
-                    WHERE organization_id = :org_id AND user_id = :user_id
-                """), {"org_id": org_id, "user_id": str(user_row[0])})
-                if not result.fetchone():
-                    self._send(403, {"error": "Not a member of this organization"})
+                if not row.is_member:
+                    self._send(403, _ERR_NOT_MEMBER)
                     return
 
-                # Delete the relationship - verify ownership through decisions table
-                # Both source and target decisions must belong to the organization
-                result = conn.execute(text("""
-                    DELETE FROM decision_relationships dr
-                    USING decisions sd, decisions td
-                    WHERE dr.id = :rel_id
-                      AND dr.source_decision_id = sd.id
-                      AND dr.target_decision_id = td.id
-                      AND sd.organization_id = :org_id
-                      AND td.organization_id = :org_id
-                    RETURNING dr.id
-                """), {"rel_id": relationship_id, "org_id": org_id})
-
-                deleted = result.fetchone()
-                conn.commit()
-
-                if not deleted:
-                    self._send(404, {"error": "Relationship not found"})
+                if not row.deleted:
+                    self._send(404, _ERR_RELATIONSHIP_NOT_FOUND)
                     return
 
                 self._send(200, {"deleted": True, "id": relationship_id})
 
         except Exception as e:
-            import traceback
             traceback.print_exc()
             self._send(500, {"error": str(e)})
@@ -1,8 +1,99 @@
 """Integrations Status API - GET /api/v1/integrations/status"""
 
 from http.server import BaseHTTPRequestHandler
-import json
+import hashlib
 import os
+import time
+import traceback
+
+import jwt
+import orjson
+from sqlalchemy import create_engine, text
+
+
+_db_engine = None
+
+
+def get_db_engine():
+    """Get the shared database engine, reused across warm invocations."""
+    global _db_engine
+    if _db_engine is not None:
+        return _db_engine
+
+    db_url = os.environ.get("DATABASE_URL", "")
+    if not db_url:
+        return None
+
+    _db_engine = create_engine(
+        db_url,
+        pool_size=5,
+        max_overflow=10,
+        pool_pre_ping=True,
+        pool_recycle=300,
+        connect_args={"sslmode": "require"},
+    )
+    return _db_engine
+
+
+# Google's public keys for Firebase ID tokens. The client keeps the fetched key
+# set in memory, so after the first request in a container tokens are checked
+# locally instead of through firebase_admin and a fetch from googleapis.com.
+FIREBASE_JWKS_URL = "https://www.googleapis.com/service_accounts/v1/jwk/securetoken@system.gserviceaccount.com"
+_jwks_client = jwt.PyJWKClient(FIREBASE_JWKS_URL, lifespan=3600)
+
+
+def verify_firebase_token(token: str, project_id: str) -> dict:
+    """Verify a Firebase ID token's signature and claims offline."""
+    signing_key = _jwks_client.get_signing_key_from_jwt(token)
+    decoded = jwt.decode(
+        token,
+        signing_key.key,
+        algorithms=["RS256"],
+        audience=project_id,
+        issuer=f"https://securetoken.google.com/{project_id}",
+    )
+    if not decoded.get("sub"):
+        raise jwt.InvalidTokenError("Token has no subject")
+    decoded["uid"] = decoded["sub"]
+    return decoded
+
+
+# Decoded Firebase tokens keyed by SHA-256 of the raw token. Entries are only
+# served until the token's own exp claim, so repeat requests from the same
+# session skip the RSA signature check without extending token lifetime.
+TOKEN_CACHE_MAX_ENTRIES = 1024
+_token_cache = {}
+
+
+def verify_token_cached(token: str) -> dict:
+    """Verify a Firebase ID token, reusing the decoded claims until it expires."""
+    key = hashlib.sha256(token.encode()).hexdigest()
+    decoded = _token_cache.get(key)
+    if decoded and decoded.get("exp", 0) > time.time():
+        return decoded
+
+    decoded = verify_firebase_token(token, os.environ.get("FIREBASE_PROJECT_ID", ""))
+    if len(_token_cache) >= TOKEN_CACHE_MAX_ENTRIES:
+        _token_cache.clear()
+    _token_cache[key] = decoded
+    return decoded
+
+
+# Fixed error bodies, serialized once at import instead of on every failure.
+_ERR_UNAUTH = b'{"error":"Not authenticated"}'
+_ERR_NO_ORG = b'{"error":"X-Organization-ID header required"}'
+_ERR_FIREBASE_NOT_CONFIGURED = b'{"error":"Firebase not configured"}'
+_ERR_DB_NOT_CONFIGURED = b'{"error":"Database not configured"}'
+_ERR_USER_NOT_FOUND = b'{"error":"User not found"}'
+_ERR_NOT_MEMBER = b'{"error":"Not a member of this organization"}'
+_ERR_ORG_NOT_FOUND = b'{"error":"Organization not found"}'
+
+# The status response always has the same shape, so only the Slack leaf values
+# are encoded per request and spliced into the pre-built body.
+_STATUS_BODY = (
+    b'{"slack":{"connected":%b,"team_name":%b,"channel_name":%b,"installed_at":%b},'
+    b'"teams":{"connected":false,"channel_name":null,"installed_at":null}}'
+)
 
 
 class handler(BaseHTTPRequestHandler):
@@ -13,7 +104,7 @@ class handler(BaseHTTPRequestHandler):
         self.send_header("Access-Control-Allow-Methods", "GET, OPTIONS")
         self.send_header("Access-Control-Allow-Headers", "Authorization, Content-Type, X-Organization-ID")
         self.end_headers()
-        self.wfile.write(json.dumps(body).encode())
+        self.wfile.write(body if isinstance(body, bytes) else orjson.dumps(body))
 
     def do_OPTIONS(self):
         self._send(204, {})
@@ -22,122 +113,85 @@ class handler(BaseHTTPRequestHandler):
         try:
             auth = self.headers.get("Authorization", "")
             if not auth.startswith("Bearer "):
-                self._send(401, {"error": "Not authenticated"})
+                self._send(401, _ERR_UNAUTH)
                 return
 
             org_id = self.headers.get("X-Organization-ID")
             if not org_id:
-                self._send(400, {"error": "X-Organization-ID header required"})
+                self._send(400, _ERR_NO_ORG)
                 return
 
             token = auth[7:]
 
-            import firebase_admin
-            from firebase_admin import credentials, auth as fb_auth
-            from sqlalchemy import create_engine, text
-
             # Verify Firebase token
+            if not os.environ.get("FIREBASE_PROJECT_ID"):
+                self._send(500, _ERR_FIREBASE_NOT_CONFIGURED)
+                return
+
             try:
-                try:
-                    firebase_admin.get_app()
-                except ValueError:
-                    project_id = os.environ.get("FIREBASE_PROJECT_ID")
-                    client_email = os.environ.get("FIREBASE_CLIENT_EMAIL")
-                    private_key = os.environ.get("FIREBASE_PRIVATE_KEY", "").replace("\\n", "\n")
-
-                    if not all([project_id, client_email, private_key]):
-                        self._send(500, {"error": "Firebase not configured"})
-                        return
-
-                    cred = credentials.Certificate({
-                        "type": "service_account",
-                        "project_id": project_id,
-                        "private_key": private_key,
-                        "client_email": client_email,
-                        "token_uri": "https://oauth2.googleapis.com/token",
-                    })
-                    firebase_admin.initialize_app(cred)
-
-                decoded = fb_auth.verify_id_token(token)
+                decoded = verify_token_cached(token)
                 firebase_uid = decoded.get("uid") or decoded.get("user_id")
             except Exception as e:
                 self._send(401, {"error": f"Invalid token: {str(e)}"})
                 return
 
-            db_url = os.environ.get("DATABASE_URL", "")
-            if not db_url:
-                self._send(500, {"error": "Database not configured"})
+            engine = get_db_engine()
+            if engine is None:
+                self._send(500, _ERR_DB_NOT_CONFIGURED)
                 return
 
-            engine = create_engine(db_url, connect_args={"sslmode": "require"})
-
             with engine.connect() as conn:
-                # Get user
+                # Resolve the user, their membership and the organization's
+                # Slack fields in one round-trip
                 result = conn.execute(text("""
-                    SELECT id FROM users
-                    WHERE auth_provider = 'firebase' AND auth_provider_id = :uid AND deleted_at IS NULL
-                """), {"uid": firebase_uid})
-                user_row = result.fetchone()
-
-                if not user_row:
-                    self._send(401, {"error": "User not found"})
+                    WITH u AS (
+                        SELECT id FROM users
+                        WHERE auth_provider = 'firebase' AND auth_provider_id = :uid AND deleted_at IS NULL
+                    )
+                    SELECT
+                        (SELECT id FROM u) as user_id,
+                        EXISTS (
+                            SELECT 1 FROM organization_members
+                            WHERE organization_id = :org_id AND user_id = (SELECT id FROM u)
+                        ) as is_member,
+                        o.id IS NOT NULL as org_found,
+                        o.slack_team_id, o.slack_access_token, o.slack_team_name,
+                        o.slack_channel_name, o.slack_connected_at
+                    FROM (SELECT 1) as one
+                    LEFT JOIN organizations o ON o.id = :org_id AND o.deleted_at IS NULL
+                """), {"uid": firebase_uid, "org_id": org_id})
+                row = result.fetchone()
+
+                if row.user_id is None:
+                    self._send(401, _ERR_USER_NOT_FOUND)
                     return
 
-                user_id = user_row[0]
+                if not row.is_member:
+                    self._send(403, _ERR_NOT_MEMBER)
+                    return
 
-                # Check membership
-                result = conn.execute(text("""
-                    SELECT role FROM organization_members
-                    WHERE organization_id = :org_id AND user_id = :user_id
-                """), {"org_id": org_id, "user_id": user_id})
-                if not result.fetchone():
-                    self._send(403, {"error": "Not a member of this organization"})
+                if not row.org_found:
+                    self._send(404, _ERR_ORG_NOT_FOUND)
                     return
 
-                # Check organization subscription tier
-                result = conn.execute(text("""
-                    SELECT subscription_tier FROM organizations WHERE id = :org_id AND deleted_at IS NULL
-                """), {"org_id": org_id})
-                org_row = result.fetchone()
+                _, _, _, team_id, access_token, team_name, channel_name, connected_at = row
 
-                if not org_row:
-                    self._send(404, {"error": "Organization not found"})
-                    return
+                # Has team_id and access_token = connected
+                slack_connected = bool(team_id and access_token)
+                if slack_connected:
+                    slack_team_name = team_name
+                    slack_channel_name = channel_name
+                    slack_connected_at = str(connected_at) if connected_at else None
+                else:
+                    slack_team_name = slack_channel_name = slack_connected_at = None
 
-                # Check actual Slack connection status from organization
-                result = conn.execute(text("""
-                    SELECT slack_team_id, slack_access_token, slack_team_name, slack_channel_name, slack_connected_at
-                    FROM organizations WHERE id = :org_id AND deleted_at IS NULL
-                """), {"org_id": org_id})
-                org_data = result.fetchone()
-
-                slack_connected = False
-                slack_team_name = None
-                slack_channel_name = None
-                slack_connected_at = None
-
-                if org_data and org_data[0] and org_data[1]:
-                    # Has team_id and access_token = connected
-                    slack_connected = True
-                    slack_team_name = org_data[2] if len(org_data) > 2 else None
-                    slack_channel_name = org_data[3] if len(org_data) > 3 else None
-                    slack_connected_at = str(org_data[4]) if len(org_data) > 4 and org_data[4] else None
-
-                self._send(200, {
-                    "slack": {
-                        "connected": slack_connected,
-                        "team_name": slack_team_name,
-                        "channel_name": slack_channel_name,
-                        "installed_at": slack_connected_at
-                    },
-                    "teams": {
-                        "connected": False,
-                        "channel_name": None,
-                        "installed_at": None
-                    }
-                })
+                self._send(200, _STATUS_BODY % (
+                    orjson.dumps(slack_connected),
+                    orjson.dumps(slack_team_name),
+                    orjson.dumps(slack_channel_name),
+                    orjson.dumps(slack_connected_at),
+                ))
 
         except Exception as e:
-            import traceback
             traceback.print_exc()
             self._send(500, {"error": str(e)})
@@ -7,16 +7,62 @@ Single endpoint that routes:
 """
 
 from http.server import BaseHTTPRequestHandler
+import functools
 import json
 import os
 import hashlib
 import hmac
+import io
 import time
 import re
-from urllib.parse import urlparse, parse_qs, unquote
+import threading
+from urllib.parse import urlparse, parse_qs, quote, unquote
 from uuid import uuid4
 from datetime import datetime
-import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import httpx
+import orjson
+from sqlalchemy import text
+
+try:
+    from cryptography.fernet import Fernet
+except ImportError:
+    Fernet = None
+
+
+# Base URL of the web app, used for decision links in Slack and Teams messages
+FRONTEND_URL = os.environ.get("FRONTEND_URL", "https://imputable.vercel.app")
+DECISIONS_URL = f"{FRONTEND_URL}/decisions/"
+
+
+def _decision_url(decision_id) -> str:
+    """Link to a decision's page in the web app."""
+    return DECISIONS_URL + str(decision_id)
+
+
+# Shared HTTP client for Slack and Gemini so TCP + TLS connections are kept
+# alive across calls and warm invocations instead of re-established each time
+_http_client = httpx.Client(timeout=10)
+
+
+def slack_api_get(token: str, url: str, timeout: float) -> dict:
+    """Call a Slack Web API read method over the shared connection pool."""
+    response = _http_client.get(url, headers={"Authorization": f"Bearer {token}"}, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+
+def slack_api_post(token: str, url: str, payload: dict, timeout: float) -> dict:
+    """Call a Slack Web API write method over the shared connection pool."""
+    response = _http_client.post(
+        url,
+        content=orjson.dumps(payload),
+        headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
+        timeout=timeout
+    )
+    response.raise_for_status()
+    return orjson.loads(response.content)
 
 
 # =============================================================================
@@ -101,6 +147,16 @@ CONFIDENCE GUIDELINES:
 - 0.3-0.5: Possible decision, significant uncertainty
 - 0.0-0.3: Very unclear, may not be a decision at all (has_conflict or missing_info likely true)"""
 
+# Static parts of the extraction request, built once instead of per call
+AI_SYSTEM_PART = {"text": AI_SYSTEM_PROMPT}
+
+AI_GENERATION_CONFIG = {
+    "temperature": 0.2,
+    "topP": 0.8,
+    "maxOutputTokens": 2048,
+    "responseMimeType": "application/json"
+}
+
 
 def analyze_with_gemini(messages: list, channel_name: str = None, hint: str = None) -> dict:
     """Analyze messages with Google Gemini API.
@@ -114,19 +170,20 @@ def analyze_with_gemini(messages: list, channel_name: str = None, hint: str = No
     if not gemini_key:
         return None
 
-    # Format transcript
-    lines = []
+    # Format transcript into one growing buffer
+    buf = io.StringIO()
     if channel_name:
-        lines.append(f"Channel: #{channel_name}\n")
+        buf.write(f"Channel: #{channel_name}\n\n")
     if hint:
-        lines.append(f"User hint: Focus on the discussion about '{hint}'\n")
-    lines.append("=== CONVERSATION TRANSCRIPT ===\n")
+        buf.write(f"User hint: Focus on the discussion about '{hint}'\n\n")
+    buf.write("=== CONVERSATION TRANSCRIPT ===\n\n")
     for msg in messages:
-        author = msg.get("author", "Unknown")
-        text = msg.get("text", "")
-        lines.append(f"{author}:\n  {text}\n")
-    lines.append("=== END TRANSCRIPT ===")
-    transcript = "\n".join(lines)
+        buf.write(msg.get("author", "Unknown"))
+        buf.write(":\n  ")
+        buf.write(msg.get("text", ""))
+        buf.write("\n\n")
+    buf.write("=== END TRANSCRIPT ===")
+    transcript = buf.getvalue()
 
     # Build the analysis prompt
     analysis_prompt = "\n\nAnalyze this conversation and extract the decision"
@@ -136,30 +193,20 @@ def analyze_with_gemini(messages: list, channel_name: str = None, hint: str = No
 
     # Call Gemini
     url = f"{GEMINI_API_URL}?key={gemini_key}"
-    payload = json.dumps({
+    payload = orjson.dumps({
         "contents": [{
             "parts": [
-                {"text": AI_SYSTEM_PROMPT},
+                AI_SYSTEM_PART,
                 {"text": analysis_prompt}
             ]
         }],
-        "generationConfig": {
-            "temperature": 0.2,
-            "topP": 0.8,
-            "maxOutputTokens": 2048,
-            "responseMimeType": "application/json"
-        }
-    }).encode()
-
-    req = urllib.request.Request(
-        url,
-        data=payload,
-        headers={"Content-Type": "application/json"}
-    )
+        "generationConfig": AI_GENERATION_CONFIG
+    })
 
     try:
-        response = urllib.request.urlopen(req, timeout=30)
-        data = json.loads(response.read().decode())
+        response = _http_client.post(url, content=payload, headers={"Content-Type": "application/json"}, timeout=30)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
 
         # Extract text from response
         candidates = data.get("candidates", [])
@@ -174,7 +221,7 @@ def analyze_with_gemini(messages: list, channel_name: str = None, hint: str = No
         elif "```" in text:
             text = text.split("```")[1].split("```")[0]
 
-        result = json.loads(text.strip())
+        result = orjson.loads(text.strip())
 
         # Ensure we got a dict, not a list or other type
         if not isinstance(result, dict):
@@ -187,6 +234,35 @@ def analyze_with_gemini(messages: list, channel_name: str = None, hint: str = No
         return None
 
 
+# Analyses currently running, keyed by the conversation they cover. Slack
+# retries and repeated shortcut clicks on the same thread then wait for the
+# first Gemini call instead of starting their own.
+_gemini_inflight = {}
+_gemini_inflight_lock = threading.Lock()
+
+
+def analyze_with_gemini_once(key: tuple, messages: list, channel_name: str = None, hint: str = None) -> dict:
+    """Run analyze_with_gemini, sharing one call between concurrent requests for the same key."""
+    with _gemini_inflight_lock:
+        future = _gemini_inflight.get(key)
+        leader = future is None
+        if leader:
+            future = Future()
+            _gemini_inflight[key] = future
+
+    if not leader:
+        return future.result()
+
+    result = None
+    try:
+        result = analyze_with_gemini(messages, channel_name, hint=hint)
+        return result
+    finally:
+        with _gemini_inflight_lock:
+            _gemini_inflight.pop(key, None)
+        future.set_result(result)
+
+
 def semantic_search_decisions(query: str, decisions: list) -> dict:
     """Use Gemini to find the most relevant decisions based on semantic understanding.
 
@@ -249,7 +325,7 @@ If no relevant decisions found, return:
 """
 
     url = f"{GEMINI_API_URL}?key={gemini_key}"
-    payload = json.dumps({
+    payload = orjson.dumps({
         "contents": [{
             "parts": [{"text": search_prompt}]
         }],
@@ -259,17 +335,12 @@ If no relevant decisions found, return:
             "maxOutputTokens": 1024,
             "responseMimeType": "application/json"
         }
-    }).encode()
-
-    req = urllib.request.Request(
-        url,
-        data=payload,
-        headers={"Content-Type": "application/json"}
-    )
+    })
 
     try:
-        response = urllib.request.urlopen(req, timeout=15)
-        data = json.loads(response.read().decode())
+        response = _http_client.post(url, content=payload, headers={"Content-Type": "application/json"}, timeout=15)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
 
         candidates = data.get("candidates", [])
         if not candidates:
@@ -283,33 +354,46 @@ If no relevant decisions found, return:
         elif "```" in text:
             text = text.split("```")[1].split("```")[0]
 
-        result = json.loads(text.strip())
+        result = orjson.loads(text.strip())
         return result
     except Exception as e:
         print(f"Semantic search error: {e}")
         return {"matches": [], "explanation": "Search failed. Try a simpler query."}
 
 
+# Message subtypes that are not part of the discussion
+THREAD_SKIP_SUBTYPES = frozenset({"bot_message", "channel_join", "channel_leave"})
+
+# Upper bound on conversations.replies pages (100 messages each) per thread
+THREAD_MAX_PAGES = 10
+
+
 def fetch_slack_thread(token: str, channel_id: str, thread_ts: str) -> list:
-    """Fetch all messages in a Slack thread."""
+    """Fetch all messages in a Slack thread, following pagination cursors."""
     messages = []
-
-    url = f"https://slack.com/api/conversations.replies?channel={channel_id}&ts={thread_ts}&limit=100"
-    req = urllib.request.Request(url, headers={"Authorization": f"Bearer {token}"})
+    base_url = (f"https://slack.com/api/conversations.replies?channel={channel_id}&ts={thread_ts}"
+                f"&limit=100&include_all_metadata=false")
+    cursor = ""
 
     try:
-        response = urllib.request.urlopen(req, timeout=10)
-        data = json.loads(response.read().decode())
+        for _ in range(THREAD_MAX_PAGES):
+            url = f"{base_url}&cursor={quote(cursor)}" if cursor else base_url
+            data = slack_api_get(token, url, timeout=10)
+            if not data.get("ok"):
+                break
 
-        if data.get("ok"):
             for msg in data.get("messages", []):
-                if msg.get("subtype") in ("bot_message", "channel_join", "channel_leave"):
+                if msg.get("subtype") in THREAD_SKIP_SUBTYPES:
                     continue
                 messages.append({
                     "author": msg.get("user", "Unknown"),
                     "text": msg.get("text", ""),
                     "timestamp": msg.get("ts", "")
                 })
+
+            cursor = data.get("response_metadata", {}).get("next_cursor", "")
+            if not cursor:
+                break
     except Exception as e:
         print(f"Slack API error: {e}")
 
@@ -327,11 +411,9 @@ def fetch_channel_context(token: str, channel_id: str, target_ts: str, count: in
     # Fetch messages before and including the target (oldest first)
     # Using latest=target_ts to get messages up to and including target
     url_before = f"https://slack.com/api/conversations.history?channel={channel_id}&latest={target_ts}&limit={count}&inclusive=true"
-    req = urllib.request.Request(url_before, headers={"Authorization": f"Bearer {token}"})
 
     try:
-        response = urllib.request.urlopen(req, timeout=10)
-        data = json.loads(response.read().decode())
+        data = slack_api_get(token, url_before, timeout=10)
 
         if data.get("ok"):
             for msg in data.get("messages", []):
@@ -351,11 +433,9 @@ def fetch_channel_context(token: str, channel_id: str, target_ts: str, count: in
 
     # Fetch messages after the target
     url_after = f"https://slack.com/api/conversations.history?channel={channel_id}&oldest={target_ts}&limit={count}&inclusive=false"
-    req = urllib.request.Request(url_after, headers={"Authorization": f"Bearer {token}"})
 
     try:
-        response = urllib.request.urlopen(req, timeout=10)
-        data = json.loads(response.read().decode())
+        data = slack_api_get(token, url_after, timeout=10)
 
         if data.get("ok"):
             for msg in data.get("messages", []):
@@ -390,11 +470,9 @@ def fetch_recent_channel_messages(token: str, channel_id: str, limit: int = 50)
     messages = []
 
     url = f"https://slack.com/api/conversations.history?channel={channel_id}&limit={limit}"
-    req = urllib.request.Request(url, headers={"Authorization": f"Bearer {token}"})
 
     try:
-        response = urllib.request.urlopen(req, timeout=10)
-        data = json.loads(response.read().decode())
+        data = slack_api_get(token, url, timeout=10)
 
         if data.get("ok"):
             for msg in data.get("messages", []):
@@ -418,6 +496,30 @@ def fetch_recent_channel_messages(token: str, channel_id: str, limit: int = 50)
     return messages
 
 
+# users.info lookups for a thread are independent, so they run concurrently
+# instead of paying Slack's latency once per participant
+_slack_lookup_executor = ThreadPoolExecutor(max_workers=10)
+
+# Display names keyed by (workspace token hash, user ID). Names change rarely,
+# so warm containers skip users.info for participants seen in the last hour.
+SLACK_USER_NAME_TTL = 3600
+SLACK_USER_NAME_MAX_ENTRIES = 50000
+_slack_user_names = {}
+
+
+def fetch_slack_user_name(token: str, user_id: str):
+    """Look up one Slack user's display name, or None if Slack returns no user.
+
+    Raises on network or parse errors so callers can avoid caching a fallback.
+    """
+    url = f"https://slack.com/api/users.info?user={user_id}"
+    data = slack_api_get(token, url, timeout=5)
+    if data.get("ok"):
+        user = data.get("user", {})
+        return user.get("real_name") or user.get("name") or user_id
+    return None
+
+
 def resolve_slack_user_names(token: str, messages: list) -> list:
     """Resolve Slack user IDs to display names."""
     user_ids = set()
@@ -426,18 +528,29 @@ def resolve_slack_user_names(token: str, messages: list) -> list:
         if author.startswith("U"):
             user_ids.add(author)
 
+    token_key = hashlib.sha256(token.encode()).hexdigest()
+    now = time.monotonic()
+
     user_names = {}
+    futures = {}
     for user_id in user_ids:
-        url = f"https://slack.com/api/users.info?user={user_id}"
-        req = urllib.request.Request(url, headers={"Authorization": f"Bearer {token}"})
+        cached = _slack_user_names.get((token_key, user_id))
+        if cached and cached[0] > now:
+            user_names[user_id] = cached[1]
+        else:
+            futures[user_id] = _slack_lookup_executor.submit(fetch_slack_user_name, token, user_id)
+
+    for user_id, future in futures.items():
         try:
-            response = urllib.request.urlopen(req, timeout=5)
-            data = json.loads(response.read().decode())
-            if data.get("ok"):
-                user = data.get("user", {})
-                user_names[user_id] = user.get("real_name") or user.get("name") or user_id
+            name = future.result()
         except Exception:
             user_names[user_id] = user_id
+            continue
+        if name is not None:
+            user_names[user_id] = name
+            if len(_slack_user_names) >= SLACK_USER_NAME_MAX_ENTRIES:
+                _slack_user_names.clear()
+            _slack_user_names[(token_key, user_id)] = (now + SLACK_USER_NAME_TTL, name)
 
     for msg in messages:
         author = msg.get("author", "")
@@ -458,10 +571,8 @@ def get_slack_user_info(token: str, user_id: str) -> dict:
     Returns None if user not found or API error.
     """
     url = f"https://slack.com/api/users.info?user={user_id}"
-    req = urllib.request.Request(url, headers={"Authorization": f"Bearer {token}"})
     try:
-        response = urllib.request.urlopen(req, timeout=5)
-        data = json.loads(response.read().decode())
+        data = slack_api_get(token, url, timeout=5)
         if data.get("ok"):
             user = data.get("user", {})
             return {
@@ -495,10 +606,8 @@ def lookup_slack_user_by_name(token: str, name: str) -> dict:
     # Use users.list to find the user (for small workspaces)
     # For larger workspaces, you'd want users.lookupByEmail if you have email
     url = "https://slack.com/api/users.list?limit=500"
-    req = urllib.request.Request(url, headers={"Authorization": f"Bearer {token}"})
     try:
-        response = urllib.request.urlopen(req, timeout=10)
-        data = json.loads(response.read().decode())
+        data = slack_api_get(token, url, timeout=10)
         if data.get("ok"):
             clean_lower = clean_name.lower()
             for user in data.get("members", []):
@@ -528,8 +637,6 @@ def resolve_or_create_user_from_slack(conn, org_id: str, slack_user_info: dict,
 
     Returns the user_id (UUID string).
     """
-    from sqlalchemy import text
-
     slack_id = slack_user_info.get("id")
     email = slack_user_info.get("email")
     real_name = slack_user_info.get("real_name") or slack_user_info.get("name") or "Slack User"
@@ -551,9 +658,7 @@ def resolve_or_create_user_from_slack(conn, org_id: str, slack_user_info: dict,
 
     # Try to find by slack_user_id
     if slack_id:
-        result = conn.execute(text("""
-            SELECT id FROM users WHERE slack_user_id = :slack_id AND deleted_at IS NULL
-        """), {"slack_id": slack_id})
+        result = conn.execute(USER_BY_SLACK_ID_SQL, {"slack_id": slack_id})
         row = result.fetchone()
         if row:
             return str(row[0])
@@ -585,8 +690,6 @@ def get_active_member_user_id(conn, org_id: str, slack_user_id: str) -> tuple:
         - status: "active", "inactive", or "not_found"
         - error_message: Error message to show user, or None if active
     """
-    from sqlalchemy import text
-
     result = conn.execute(text("""
         SELECT u.id, om.status
         FROM users u
@@ -675,15 +778,9 @@ def send_approval_dm(token: str, approver_slack_id: str, decision_id: str, decis
 
     # Open a DM channel with the user
     dm_url = "https://slack.com/api/conversations.open"
-    dm_payload = json.dumps({"users": approver_slack_id}).encode()
-    dm_req = urllib.request.Request(dm_url, data=dm_payload, headers={
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    })
 
     try:
-        dm_response = urllib.request.urlopen(dm_req, timeout=5)
-        dm_data = json.loads(dm_response.read().decode())
+        dm_data = slack_api_post(token, dm_url, {"users": approver_slack_id}, timeout=5)
         if not dm_data.get("ok"):
             print(f"[SLACK] Error opening DM with {approver_slack_id}: {dm_data.get('error')}")
             return {"success": False}
@@ -692,18 +789,11 @@ def send_approval_dm(token: str, approver_slack_id: str, decision_id: str, decis
 
         # Send the message
         msg_url = "https://slack.com/api/chat.postMessage"
-        msg_payload = json.dumps({
+        msg_data = slack_api_post(token, msg_url, {
             "channel": channel_id,
             "text": f"Approval requested for DECISION-{decision_number}: {title}",
             "blocks": blocks
-        }).encode()
-        msg_req = urllib.request.Request(msg_url, data=msg_payload, headers={
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json"
-        })
-
-        msg_response = urllib.request.urlopen(msg_req, timeout=5)
-        msg_data = json.loads(msg_response.read().decode())
+        }, timeout=5)
         if not msg_data.get("ok"):
             print(f"[SLACK] Error sending approval DM: {msg_data.get('error')}")
             return {"success": False}
@@ -717,6 +807,21 @@ def send_approval_dm(token: str, approver_slack_id: str, decision_id: str, decis
         return {"success": False}
 
 
+def send_slack_user_notice(token: str, slack_user_id: str, text: str, blocks: list = None) -> None:
+    """DM a Slack user the outcome of something they submitted; failures are only logged."""
+    if not token or not slack_user_id:
+        return
+    message = {"channel": slack_user_id, "text": text}
+    if blocks:
+        message["blocks"] = blocks
+    try:
+        data = slack_api_post(token, "https://slack.com/api/chat.postMessage", message, timeout=5)
+        if not data.get("ok"):
+            print(f"[SLACK] Error notifying {slack_user_id}: {data.get('error')}")
+    except Exception as e:
+        print(f"[SLACK] Error notifying {slack_user_id}: {e}")
+
+
 def update_approval_dm(token: str, channel_id: str, message_ts: str, decision_id: str,
                        decision_number: int, title: str, status: str, approver_name: str,
                        comment: str = None) -> bool:
@@ -775,20 +880,14 @@ def update_approval_dm(token: str, channel_id: str, message_ts: str, decision_id
 
     # Update the message
     update_url = "https://slack.com/api/chat.update"
-    update_payload = json.dumps({
-        "channel": channel_id,
-        "ts": message_ts,
-        "text": f"DECISION-{decision_number} has been {status}",
-        "blocks": blocks
-    }).encode()
-    update_req = urllib.request.Request(update_url, data=update_payload, headers={
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    })
 
     try:
-        update_response = urllib.request.urlopen(update_req, timeout=5)
-        update_data = json.loads(update_response.read().decode())
+        update_data = slack_api_post(token, update_url, {
+            "channel": channel_id,
+            "ts": message_ts,
+            "text": f"DECISION-{decision_number} has been {status}",
+            "blocks": blocks
+        }, timeout=5)
         if not update_data.get("ok"):
             print(f"[SLACK] Error updating approval DM: {update_data.get('error')}")
             return False
@@ -826,38 +925,71 @@ def get_db_connection():
     return _db_engine
 
 
+# Decrypted tokens keyed by SHA-256 of the ciphertext. An org's stored token is
+# decrypted on nearly every webhook, so warm containers reuse the plaintext
+# instead of repeating the Fernet HMAC check and AES decrypt.
+DECRYPT_CACHE_TTL = 600
+DECRYPT_CACHE_MAX_ENTRIES = 1024
+_decrypt_cache = {}
+_fernet = None
+
+
 def decrypt_token(encrypted: str) -> str:
     """Decrypt a stored token."""
+    global _fernet
     encryption_key = os.environ.get("ENCRYPTION_KEY", "")
-    if not encryption_key:
+    if not encryption_key or Fernet is None:
         return encrypted
+
+    key = hashlib.sha256(encrypted.encode()).hexdigest()
+    cached = _decrypt_cache.get(key)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
     try:
-        from cryptography.fernet import Fernet
-        f = Fernet(encryption_key.encode())
-        return f.decrypt(encrypted.encode()).decode()
+        if _fernet is None:
+            _fernet = Fernet(encryption_key.encode())
+        decrypted = _fernet.decrypt(encrypted.encode()).decode()
     except Exception:
         return encrypted
 
+    if len(_decrypt_cache) >= DECRYPT_CACHE_MAX_ENTRIES:
+        _decrypt_cache.clear()
+    _decrypt_cache[key] = (time.monotonic() + DECRYPT_CACHE_TTL, decrypted)
+    return decrypted
+
+
+# Encoded once at import; the environment does not change within a container
+SLACK_SIGNING_SECRET = os.environ.get("SLACK_SIGNING_SECRET", "").encode()
+
+# "v0=" followed by a hex SHA-256 digest
+SLACK_SIGNATURE_LENGTH = 3 + 64
+
 
 def verify_slack_signature(body: bytes, timestamp: str, signature: str) -> bool:
     """Verify Slack request signature."""
-    signing_secret = os.environ.get("SLACK_SIGNING_SECRET", "")
-    if not signing_secret:
+    if not SLACK_SIGNING_SECRET:
+        return False
+
+    # Reject malformed signatures before hashing the body
+    if not signature or len(signature) != SLACK_SIGNATURE_LENGTH or not signature.startswith("v0="):
         return False
 
     # Check timestamp (5 min window)
     try:
         if abs(time.time() - int(timestamp)) > 300:
             return False
-    except ValueError:
+    except (TypeError, ValueError):
         return False
 
-    sig_basestring = f"v0:{timestamp}:{body.decode()}"
-    expected = "v0=" + hmac.new(
-        signing_secret.encode(),
-        sig_basestring.encode(),
-        hashlib.sha256
-    ).hexdigest()
+    # Feed the raw body straight into the HMAC rather than decoding and
+    # re-encoding it into one concatenated base string
+    mac = hmac.new(SLACK_SIGNING_SECRET, digestmod=hashlib.sha256)
+    mac.update(b"v0:")
+    mac.update(timestamp.encode("ascii"))
+    mac.update(b":")
+    mac.update(body)
+    expected = "v0=" + mac.hexdigest()
 
     return hmac.compare_digest(expected, signature)
 
@@ -866,31 +998,70 @@ def verify_slack_signature(body: bytes, timestamp: str, signature: str) -> bool:
 # SLACK BLOCKS & MODALS
 # =============================================================================
 
+# Blocks that never change are built once at import. Callers only hand them
+# to Slack for serialization, so the same lists are returned every time.
+_MAIN_MENU_HEADER = {"type": "header", "text": {"type": "plain_text", "text": "Imputable", "emoji": True}}
+_MAIN_MENU_ACTIONS = [
+    {"type": "divider"},
+    {"type": "section", "text": {"type": "mrkdwn", "text": "*Quick Actions*"}},
+    {"type": "actions", "elements": [
+        {"type": "button", "text": {"type": "plain_text", "text": "New Decision", "emoji": True}, "style": "primary", "action_id": "open_create_decision_modal"},
+        {"type": "button", "text": {"type": "plain_text", "text": "View Decisions", "emoji": True}, "action_id": "list_decisions"},
+        {"type": "button", "text": {"type": "plain_text", "text": "Help", "emoji": True}, "action_id": "show_help"}
+    ]}
+]
+
+_HELP_BLOCKS = [
+    {"type": "header", "text": {"type": "plain_text", "text": "Imputable Commands", "emoji": True}},
+    {"type": "section", "text": {"type": "mrkdwn", "text": "*Available Commands:*\n\n`/decision` - Show main menu\n`/decision add <title>` - Create a new decision\n`/decision list` - View recent decisions\n`/decision search <query>` - Search decisions\n`/decision poll <question>` - Start consensus poll\n`/decision log` - AI-analyze recent conversation and log as decision\n`/decision log <topic>` - Same, but focused on a specific topic\n`/decision help` - Show this help"}},
+    {"type": "divider"},
+    {"type": "context", "elements": [{"type": "mrkdwn", "text": "You can also right-click any message and select *Log as Decision* to capture it."}]}
+]
+
+_STATUS_EMOJI = {
+    "draft": ":white_circle:",
+    "pending_review": ":large_yellow_circle:",
+    "approved": ":large_green_circle:",
+    "deprecated": ":red_circle:",
+    "superseded": ":black_circle:",
+}
+
+_STATUS_LABELS = {
+    "draft": "Draft",
+    "pending_review": "Pending Review",
+    "approved": "Approved",
+    "deprecated": "Deprecated",
+    "superseded": "Superseded",
+}
+
+
+# The menu only varies by organization name, so each workspace's blocks are
+# built once per warm container
+@functools.lru_cache(maxsize=256)
+def _main_menu_blocks(org_name: str) -> list:
+    return [
+        _MAIN_MENU_HEADER,
+        {"type": "section", "text": {"type": "mrkdwn", "text": f"Decision ledger for *{org_name}*"}},
+        *_MAIN_MENU_ACTIONS
+    ]
+
+
+# Vote button labels for a poll nobody has voted on yet
+_POLL_AGREE_ZERO = {"type": "plain_text", "text": "Agree (0)", "emoji": True}
+_POLL_CONCERN_ZERO = {"type": "plain_text", "text": "Concern (0)", "emoji": True}
+_POLL_BLOCK_ZERO = {"type": "plain_text", "text": "Block (0)", "emoji": True}
+
+
 class SlackBlocks:
     """Slack Block Kit builders."""
 
     @staticmethod
     def main_menu(org_name: str = "your organization"):
-        return [
-            {"type": "header", "text": {"type": "plain_text", "text": "Imputable", "emoji": True}},
-            {"type": "section", "text": {"type": "mrkdwn", "text": f"Decision ledger for *{org_name}*"}},
-            {"type": "divider"},
-            {"type": "section", "text": {"type": "mrkdwn", "text": "*Quick Actions*"}},
-            {"type": "actions", "elements": [
-                {"type": "button", "text": {"type": "plain_text", "text": "New Decision", "emoji": True}, "style": "primary", "action_id": "open_create_decision_modal"},
-                {"type": "button", "text": {"type": "plain_text", "text": "View Decisions", "emoji": True}, "action_id": "list_decisions"},
-                {"type": "button", "text": {"type": "plain_text", "text": "Help", "emoji": True}, "action_id": "show_help"}
-            ]}
-        ]
+        return _main_menu_blocks(org_name)
 
     @staticmethod
     def help_message():
-        return [
-            {"type": "header", "text": {"type": "plain_text", "text": "Imputable Commands", "emoji": True}},
-            {"type": "section", "text": {"type": "mrkdwn", "text": "*Available Commands:*\n\n`/decision` - Show main menu\n`/decision add <title>` - Create a new decision\n`/decision list` - View recent decisions\n`/decision search <query>` - Search decisions\n`/decision poll <question>` - Start consensus poll\n`/decision log` - AI-analyze recent conversation and log as decision\n`/decision log <topic>` - Same, but focused on a specific topic\n`/decision help` - Show this help"}},
-            {"type": "divider"},
-            {"type": "context", "elements": [{"type": "mrkdwn", "text": "You can also right-click any message and select *Log as Decision* to capture it."}]}
-        ]
+        return _HELP_BLOCKS
 
     @staticmethod
     def search_results(query: str, decisions: list):
@@ -901,16 +1072,15 @@ class SlackBlocks:
 
         blocks = [{"type": "section", "text": {"type": "mrkdwn", "text": f"*Search results for:* {query}"}}]
 
-        status_emoji = {"draft": ":white_circle:", "pending_review": ":large_yellow_circle:", "approved": ":large_green_circle:", "deprecated": ":red_circle:", "superseded": ":black_circle:"}
-
+        emoji_get = _STATUS_EMOJI.get
         for d in decisions[:5]:
             dec_id, dec_num, title, status = d
-            emoji = status_emoji.get(status, ":white_circle:")
-            frontend_url = os.environ.get("FRONTEND_URL", "https://imputable.vercel.app")
+            emoji = emoji_get(status, ":white_circle:")
+            url = _decision_url(dec_id)
             blocks.append({
                 "type": "section",
-                "text": {"type": "mrkdwn", "text": f"{emoji} *<{frontend_url}/decisions/{dec_id}|DECISION-{dec_num}>*\n{title}"},
-                "accessory": {"type": "button", "text": {"type": "plain_text", "text": "View"}, "url": f"{frontend_url}/decisions/{dec_id}"}
+                "text": {"type": "mrkdwn", "text": f"{emoji} *<{url}|DECISION-{dec_num}>*\n{title}"},
+                "accessory": {"type": "button", "text": {"type": "plain_text", "text": "View"}, "url": url}
             })
 
         return blocks
@@ -920,9 +1090,8 @@ class SlackBlocks:
         agree = votes.get("agree", [])
         concern = votes.get("concern", [])
         block = votes.get("block", [])
-        total = len(agree) + len(concern) + len(block)
-
-        frontend_url = os.environ.get("FRONTEND_URL", "https://imputable.vercel.app")
+        n_agree, n_concern, n_block = len(agree), len(concern), len(block)
+        total = n_agree + n_concern + n_block
 
         # Dynamic threshold based on channel size (~60% of members, min 2, max 10)
         import math
@@ -931,31 +1100,45 @@ class SlackBlocks:
         else:
             threshold = 3  # Fallback if channel size unknown
 
+        # A fresh poll has no votes, so the status is always "agrees needed"
+        # and there is no voter list or approval prompt to build
+        if not total and decision_status != "approved":
+            return [
+                {"type": "header", "text": {"type": "plain_text", "text": f"{title[:75]}", "emoji": True}},
+                {"type": "section", "text": {"type": "mrkdwn", "text": f"*Consensus Poll* - 0/{threshold} agrees needed"}},
+                {"type": "actions", "block_id": f"poll_{decision_id}", "elements": [
+                    {"type": "button", "text": _POLL_AGREE_ZERO, "style": "primary", "action_id": "poll_vote_agree", "value": decision_id},
+                    {"type": "button", "text": _POLL_CONCERN_ZERO, "action_id": "poll_vote_concern", "value": decision_id},
+                    {"type": "button", "text": _POLL_BLOCK_ZERO, "style": "danger", "action_id": "poll_vote_block", "value": decision_id}
+                ]},
+                {"type": "context", "elements": [{"type": "mrkdwn", "text": f":white_circle: <{_decision_url(decision_id)}|View full decision>"}]}
+            ]
+
         # Smart threshold detection
         # Consensus reached: threshold agrees with no blocks
         # Blocked: Any blocks present
         # Concerns: Has concerns but no blocks
-        consensus_reached = len(agree) >= threshold and len(block) == 0
-        is_blocked = len(block) > 0
-        has_concerns = len(concern) > 0 and not is_blocked
+        consensus_reached = n_agree >= threshold and n_block == 0
+        is_blocked = n_block > 0
+        has_concerns = n_concern > 0 and not is_blocked
 
         # Determine status text
         if decision_status == "approved":
             status_text = ":white_check_mark: *Decision Approved*"
             status_emoji = ":large_green_circle:"
         elif is_blocked:
-            status_text = f":no_entry: *Blocked* - {len(block)} team member{'s' if len(block) > 1 else ''} blocked this decision"
+            status_text = f":no_entry: *Blocked* - {n_block} team member{'s' if n_block > 1 else ''} blocked this decision"
             status_emoji = ":red_circle:"
         elif consensus_reached:
             status_text = ":tada: *Consensus Reached!*"
             status_emoji = ":large_green_circle:"
         elif has_concerns:
-            status_text = f":warning: *{len(concern)} concern{'s' if len(concern) > 1 else ''}* - Discussion may be needed"
+            status_text = f":warning: *{n_concern} concern{'s' if n_concern > 1 else ''}* - Discussion may be needed"
             status_emoji = ":large_yellow_circle:"
         else:
-            remaining = threshold - len(agree)
+            remaining = threshold - n_agree
             if remaining > 0:
-                status_text = f"*Consensus Poll* - {len(agree)}/{threshold} agrees needed"
+                status_text = f"*Consensus Poll* - {n_agree}/{threshold} agrees needed"
             else:
                 status_text = f"*Consensus Poll* - {total} vote{'s' if total != 1 else ''}"
             status_emoji = ":white_circle:"
@@ -968,9 +1151,9 @@ class SlackBlocks:
         # Only show voting buttons if not approved
         if decision_status != "approved":
             blocks.append({"type": "actions", "block_id": f"poll_{decision_id}", "elements": [
-                {"type": "button", "text": {"type": "plain_text", "text": f"Agree ({len(agree)})", "emoji": True}, "style": "primary", "action_id": "poll_vote_agree", "value": decision_id},
-                {"type": "button", "text": {"type": "plain_text", "text": f"Concern ({len(concern)})", "emoji": True}, "action_id": "poll_vote_concern", "value": decision_id},
-                {"type": "button", "text": {"type": "plain_text", "text": f"Block ({len(block)})", "emoji": True}, "style": "danger", "action_id": "poll_vote_block", "value": decision_id}
+                {"type": "button", "text": {"type": "plain_text", "text": f"Agree ({n_agree})", "emoji": True}, "style": "primary", "action_id": "poll_vote_agree", "value": decision_id},
+                {"type": "button", "text": {"type": "plain_text", "text": f"Concern ({n_concern})", "emoji": True}, "action_id": "poll_vote_concern", "value": decision_id},
+                {"type": "button", "text": {"type": "plain_text", "text": f"Block ({n_block})", "emoji": True}, "style": "danger", "action_id": "poll_vote_block", "value": decision_id}
             ]})
 
         # Show who voted
@@ -1001,14 +1184,13 @@ class SlackBlocks:
                 }
             })
 
-        blocks.append({"type": "context", "elements": [{"type": "mrkdwn", "text": f"{status_emoji} <{frontend_url}/decisions/{decision_id}|View full decision>"}]})
+        blocks.append({"type": "context", "elements": [{"type": "mrkdwn", "text": f"{status_emoji} <{_decision_url(decision_id)}|View full decision>"}]})
 
         return blocks
 
     @staticmethod
     def semantic_search_results(query: str, decisions: list, explanation: str = "", best_match: str = ""):
         """Format AI-powered semantic search results."""
-        frontend_url = os.environ.get("FRONTEND_URL", "https://imputable.vercel.app")
 
         if not decisions:
             blocks = [
@@ -1031,34 +1213,58 @@ class SlackBlocks:
 
         blocks.append({"type": "divider"})
 
-        status_emoji = {"draft": ":white_circle:", "pending_review": ":large_yellow_circle:", "approved": ":large_green_circle:", "deprecated": ":red_circle:", "superseded": ":black_circle:"}
-
+        emoji_get = _STATUS_EMOJI.get
         for d in decisions[:5]:
             dec_id, dec_num, title, status = d
-            emoji = status_emoji.get(status, ":white_circle:")
+            emoji = emoji_get(status, ":white_circle:")
+            url = _decision_url(dec_id)
             blocks.append({
                 "type": "section",
-                "text": {"type": "mrkdwn", "text": f"{emoji} *<{frontend_url}/decisions/{dec_id}|DECISION-{dec_num}>*\n{title}"},
-                "accessory": {"type": "button", "text": {"type": "plain_text", "text": "View"}, "url": f"{frontend_url}/decisions/{dec_id}", "action_id": f"view_decision_{dec_id}"}
+                "text": {"type": "mrkdwn", "text": f"{emoji} *<{url}|DECISION-{dec_num}>*\n{title}"},
+                "accessory": {"type": "button", "text": {"type": "plain_text", "text": "View"}, "url": url, "action_id": f"view_decision_{dec_id}"}
             })
 
         return blocks
 
     @staticmethod
     def decision_created(decision_id: str, decision_number: int, title: str):
-        frontend_url = os.environ.get("FRONTEND_URL", "https://imputable.vercel.app")
         return [
-            {"type": "section", "text": {"type": "mrkdwn", "text": f":white_check_mark: *Decision logged*\n*<{frontend_url}/decisions/{decision_id}|DECISION-{decision_number}>*: {title}"}}
+            {"type": "section", "text": {"type": "mrkdwn", "text": f":white_check_mark: *Decision logged*\n*<{_decision_url(decision_id)}|DECISION-{decision_number}>*: {title}"}}
         ]
 
     @staticmethod
     def duplicate_warning(decision_id: str, decision_number: int, title: str):
-        frontend_url = os.environ.get("FRONTEND_URL", "https://imputable.vercel.app")
         return [
-            {"type": "section", "text": {"type": "mrkdwn", "text": f":warning: This message was already logged as *<{frontend_url}/decisions/{decision_id}|DECISION-{decision_number}>*: {title}"}}
+            {"type": "section", "text": {"type": "mrkdwn", "text": f":warning: This message was already logged as *<{_decision_url(decision_id)}|DECISION-{decision_number}>*: {title}"}}
         ]
 
 
+# Impact level choices shared by every decision modal
+_IMPACT_OPTIONS = [
+    {"text": {"type": "plain_text", "text": "Low"}, "value": "low"},
+    {"text": {"type": "plain_text", "text": "Medium"}, "value": "medium"},
+    {"text": {"type": "plain_text", "text": "High"}, "value": "high"},
+    {"text": {"type": "plain_text", "text": "Critical"}, "value": "critical"}
+]
+_IMPACT_OPTIONS_BY_VALUE = {o["value"]: o for o in _IMPACT_OPTIONS}
+_IMPACT_OPTION_MEDIUM = _IMPACT_OPTIONS_BY_VALUE["medium"]
+
+# Confidence display tiers for AI-drafted modals, highest threshold first. The
+# last tier catches everything below, including negative scores.
+_CONFIDENCE_TIERS = (
+    (80, ":white_check_mark:", "High confidence"),
+    (50, ":large_yellow_circle:", "Medium confidence"),
+    (float("-inf"), ":warning:", "Low confidence - please review carefully"),
+)
+
+# private_metadata for AI-drafted modals always has the same keys, so only the
+# values are encoded per modal and spliced into this pre-built object
+_AI_MODAL_METADATA = (
+    b'{"channel_id":%b,"message_ts":%b,"thread_ts":%b,"ai_generated":true,'
+    b'"confidence_score":%b,"suggested_status":%b}'
+)
+
+
 class SlackModals:
     """Slack modal builders."""
 
@@ -1075,18 +1281,13 @@ class SlackModals:
                 {"type": "input", "block_id": "context_block", "element": {"type": "plain_text_input", "action_id": "context_input", "multiline": True, "initial_value": prefill_context, "placeholder": {"type": "plain_text", "text": "What led to this decision?"}}, "label": {"type": "plain_text", "text": "Context"}, "optional": True},
                 {"type": "input", "block_id": "choice_block", "element": {"type": "plain_text_input", "action_id": "choice_input", "multiline": True, "placeholder": {"type": "plain_text", "text": "Describe the decision"}}, "label": {"type": "plain_text", "text": "Decision"}},
                 {"type": "input", "block_id": "rationale_block", "element": {"type": "plain_text_input", "action_id": "rationale_input", "multiline": True, "placeholder": {"type": "plain_text", "text": "Why this choice?"}}, "label": {"type": "plain_text", "text": "Rationale"}, "optional": True},
-                {"type": "input", "block_id": "impact_block", "element": {"type": "static_select", "action_id": "impact_select", "initial_option": {"text": {"type": "plain_text", "text": "Medium"}, "value": "medium"}, "options": [
-                    {"text": {"type": "plain_text", "text": "Low"}, "value": "low"},
-                    {"text": {"type": "plain_text", "text": "Medium"}, "value": "medium"},
-                    {"text": {"type": "plain_text", "text": "High"}, "value": "high"},
-                    {"text": {"type": "plain_text", "text": "Critical"}, "value": "critical"}
-                ]}, "label": {"type": "plain_text", "text": "Impact Level"}}
+                {"type": "input", "block_id": "impact_block", "element": {"type": "static_select", "action_id": "impact_select", "initial_option": _IMPACT_OPTION_MEDIUM, "options": _IMPACT_OPTIONS}, "label": {"type": "plain_text", "text": "Impact Level"}}
             ]
         }
 
     @staticmethod
     def log_message(prefill_title: str, message_text: str, channel_id: str, message_ts: str, thread_ts: str = None):
-        metadata = json.dumps({"channel_id": channel_id, "message_ts": message_ts, "thread_ts": thread_ts, "ai_generated": False})
+        metadata = orjson.dumps({"channel_id": channel_id, "message_ts": message_ts, "thread_ts": thread_ts, "ai_generated": False}).decode()
         return {
             "type": "modal",
             "callback_id": "log_message_modal",
@@ -1099,12 +1300,7 @@ class SlackModals:
                 {"type": "divider"},
                 {"type": "input", "block_id": "title_block", "element": {"type": "plain_text_input", "action_id": "title_input", "initial_value": prefill_title[:150], "placeholder": {"type": "plain_text", "text": "Decision title"}}, "label": {"type": "plain_text", "text": "Title"}},
                 {"type": "input", "block_id": "context_block", "element": {"type": "plain_text_input", "action_id": "context_input", "multiline": True, "placeholder": {"type": "plain_text", "text": "Additional context"}}, "label": {"type": "plain_text", "text": "Context"}, "optional": True},
-                {"type": "input", "block_id": "impact_block", "element": {"type": "static_select", "action_id": "impact_select", "initial_option": {"text": {"type": "plain_text", "text": "Medium"}, "value": "medium"}, "options": [
-                    {"text": {"type": "plain_text", "text": "Low"}, "value": "low"},
-                    {"text": {"type": "plain_text", "text": "Medium"}, "value": "medium"},
-                    {"text": {"type": "plain_text", "text": "High"}, "value": "high"},
-                    {"text": {"type": "plain_text", "text": "Critical"}, "value": "critical"}
-                ]}, "label": {"type": "plain_text", "text": "Impact Level"}}
+                {"type": "input", "block_id": "impact_block", "element": {"type": "static_select", "action_id": "impact_select", "initial_option": _IMPACT_OPTION_MEDIUM, "options": _IMPACT_OPTIONS}, "label": {"type": "plain_text", "text": "Impact Level"}}
             ]
         }
 
@@ -1115,50 +1311,46 @@ class SlackModals:
         if not isinstance(analysis, dict):
             analysis = {}
 
+        # Read each field the modal needs once, truncated to Slack's input limits
+        get = analysis.get
+        title = get("title", "")[:150]
+        context = get("context", "")[:3000]
+        choice = get("choice", "")[:3000]
+        rationale = get("rationale", "")[:3000]
+        suggested_status = get("suggested_status", "draft")
+        suggested_impact = get("suggested_impact", "medium")
+
         # Format alternatives
-        alternatives_text = ""
-        alternatives = analysis.get("alternatives", [])
-        if alternatives and isinstance(alternatives, list):
-            alt_lines = []
-            for alt in alternatives[:5]:
-                if isinstance(alt, dict):
-                    alt_lines.append(f"- {alt.get('name', 'Unknown')}: {alt.get('rejected_reason', 'No reason given')}")
-            alternatives_text = "\n".join(alt_lines)
+        alternatives = get("alternatives")
+        if not isinstance(alternatives, list):
+            alternatives = ()
+        alternatives_text = "\n".join(
+            f"- {alt.get('name', 'Unknown')}: {alt.get('rejected_reason', 'No reason given')}"
+            for alt in alternatives[:5] if isinstance(alt, dict)
+        )
 
         # Confidence display
-        confidence = analysis.get("confidence_score", 0.5)
+        confidence = get("confidence_score", 0.5)
         confidence_pct = int(confidence * 100)
-        if confidence_pct >= 80:
-            confidence_emoji = ":white_check_mark:"
-            confidence_text = "High confidence"
-        elif confidence_pct >= 50:
-            confidence_emoji = ":large_yellow_circle:"
-            confidence_text = "Medium confidence"
-        else:
-            confidence_emoji = ":warning:"
-            confidence_text = "Low confidence - please review carefully"
+        confidence_emoji, confidence_text = next(
+            (emoji, label) for threshold, emoji, label in _CONFIDENCE_TIERS if confidence_pct >= threshold
+        )
 
         # Dissenters and deadlines
-        dissenters = ", ".join(analysis.get("key_dissenters", [])[:5]) or "None identified"
-        deadlines = ", ".join(analysis.get("deadlines", [])[:3]) or "None mentioned"
-
-        metadata = json.dumps({
-            "channel_id": channel_id,
-            "message_ts": message_ts,
-            "thread_ts": thread_ts,
-            "ai_generated": True,
-            "confidence_score": confidence,
-            "suggested_status": analysis.get("suggested_status", "draft")
-        })
+        dissenters = ", ".join(get("key_dissenters", [])[:5]) or "None identified"
+        deadlines = ", ".join(get("deadlines", [])[:3]) or "None mentioned"
 
-        impact_value = analysis.get("suggested_impact", "medium")
-        impact_options = [
-            {"text": {"type": "plain_text", "text": "Low"}, "value": "low"},
-            {"text": {"type": "plain_text", "text": "Medium"}, "value": "medium"},
-            {"text": {"type": "plain_text", "text": "High"}, "value": "high"},
-            {"text": {"type": "plain_text", "text": "Critical"}, "value": "critical"}
-        ]
-        initial_impact = next((o for o in impact_options if o["value"] == impact_value), impact_options[1])
+        status_label = _STATUS_LABELS.get(suggested_status) or suggested_status.replace("_", " ").title()
+
+        metadata = (_AI_MODAL_METADATA % (
+            orjson.dumps(channel_id),
+            orjson.dumps(message_ts),
+            orjson.dumps(thread_ts),
+            orjson.dumps(confidence),
+            orjson.dumps(suggested_status),
+        )).decode()
+
+        initial_impact = _IMPACT_OPTIONS_BY_VALUE.get(suggested_impact, _IMPACT_OPTION_MEDIUM)
 
         return {
             "type": "modal",
@@ -1170,28 +1362,183 @@ class SlackModals:
             "blocks": [
                 {"type": "section", "text": {"type": "mrkdwn", "text": f"{confidence_emoji} *AI Analysis Complete* ({confidence_pct}% confidence)\n_{confidence_text}_"}},
                 {"type": "divider"},
-                {"type": "input", "block_id": "title_block", "element": {"type": "plain_text_input", "action_id": "title_input", "initial_value": analysis.get("title", "")[:150], "placeholder": {"type": "plain_text", "text": "Decision title"}}, "label": {"type": "plain_text", "text": "Title"}},
-                {"type": "input", "block_id": "context_block", "element": {"type": "plain_text_input", "action_id": "context_input", "multiline": True, "initial_value": analysis.get("context", "")[:3000], "placeholder": {"type": "plain_text", "text": "Background and problem"}}, "label": {"type": "plain_text", "text": "Context"}, "optional": True},
-                {"type": "input", "block_id": "choice_block", "element": {"type": "plain_text_input", "action_id": "choice_input", "multiline": True, "initial_value": analysis.get("choice", "")[:3000], "placeholder": {"type": "plain_text", "text": "What was decided"}}, "label": {"type": "plain_text", "text": "Decision"}},
-                {"type": "input", "block_id": "rationale_block", "element": {"type": "plain_text_input", "action_id": "rationale_input", "multiline": True, "initial_value": analysis.get("rationale", "")[:3000], "placeholder": {"type": "plain_text", "text": "Why this choice"}}, "label": {"type": "plain_text", "text": "Rationale"}, "optional": True},
+                {"type": "input", "block_id": "title_block", "element": {"type": "plain_text_input", "action_id": "title_input", "initial_value": title, "placeholder": {"type": "plain_text", "text": "Decision title"}}, "label": {"type": "plain_text", "text": "Title"}},
+                {"type": "input", "block_id": "context_block", "element": {"type": "plain_text_input", "action_id": "context_input", "multiline": True, "initial_value": context, "placeholder": {"type": "plain_text", "text": "Background and problem"}}, "label": {"type": "plain_text", "text": "Context"}, "optional": True},
+                {"type": "input", "block_id": "choice_block", "element": {"type": "plain_text_input", "action_id": "choice_input", "multiline": True, "initial_value": choice, "placeholder": {"type": "plain_text", "text": "What was decided"}}, "label": {"type": "plain_text", "text": "Decision"}},
+                {"type": "input", "block_id": "rationale_block", "element": {"type": "plain_text_input", "action_id": "rationale_input", "multiline": True, "initial_value": rationale, "placeholder": {"type": "plain_text", "text": "Why this choice"}}, "label": {"type": "plain_text", "text": "Rationale"}, "optional": True},
                 {"type": "input", "block_id": "alternatives_block", "element": {"type": "plain_text_input", "action_id": "alternatives_input", "multiline": True, "initial_value": alternatives_text[:3000], "placeholder": {"type": "plain_text", "text": "- Option: Reason rejected"}}, "label": {"type": "plain_text", "text": "Alternatives Considered"}, "optional": True},
-                {"type": "input", "block_id": "impact_block", "element": {"type": "static_select", "action_id": "impact_select", "initial_option": initial_impact, "options": impact_options}, "label": {"type": "plain_text", "text": "Impact Level"}},
+                {"type": "input", "block_id": "impact_block", "element": {"type": "static_select", "action_id": "impact_select", "initial_option": initial_impact, "options": _IMPACT_OPTIONS}, "label": {"type": "plain_text", "text": "Impact Level"}},
                 {"type": "divider"},
                 {"type": "context", "elements": [{"type": "mrkdwn", "text": f":busts_in_silhouette: *Key Dissenters:* {dissenters}"}]},
                 {"type": "context", "elements": [{"type": "mrkdwn", "text": f":calendar: *Deadlines:* {deadlines}"}]},
-                {"type": "context", "elements": [{"type": "mrkdwn", "text": f":sparkles: *Suggested Status:* {analysis.get('suggested_status', 'draft').replace('_', ' ').title()}"}]}
+                {"type": "context", "elements": [{"type": "mrkdwn", "text": f":sparkles: *Suggested Status:* {status_label}"}]}
             ]
         }
 
 
+# =============================================================================
+# SHARED QUERIES
+# =============================================================================
+
+# Statements run from more than one handler, built once at import rather than
+# re-parsed for bind parameters on every request
+
+USER_BY_SLACK_ID_SQL = text("""
+    SELECT id FROM users WHERE slack_user_id = :slack_id AND deleted_at IS NULL
+""")
+
+RECENT_DECISIONS_SQL = text("""
+    SELECT d.id, d.decision_number, dv.title, d.status, dv.content, d.created_at
+    FROM decisions d
+    JOIN decision_versions dv ON d.current_version_id = dv.id
+    WHERE d.organization_id = :org_id AND d.deleted_at IS NULL
+    ORDER BY d.created_at DESC LIMIT 50
+""")
+
+# Decisions are created in one round trip. The number comes from the org's
+# decision_counters row, whose lock serializes concurrent creates; the MAX()
+# floor seeds new orgs and skips past numbers taken by writers that bypass the
+# counter. The decision row is inserted already pointing at its first version:
+# the two foreign keys between them are checked at the end of the statement,
+# when both rows exist, and a later UPDATE in the same statement could not see
+# the new decision row anyway.
+CREATE_POLL_DECISION_SQL = text("""
+    WITH counter AS (
+        INSERT INTO decision_counters (organization_id, next_number)
+        SELECT :org_id, COALESCE(MAX(decision_number), 0) + 2
+        FROM decisions WHERE organization_id = :org_id
+        ON CONFLICT (organization_id) DO UPDATE
+        SET next_number = GREATEST(decision_counters.next_number, EXCLUDED.next_number - 1) + 1
+        RETURNING next_number - 1 AS num
+    ), ins_dec AS (
+        INSERT INTO decisions (id, organization_id, decision_number, status, created_by, source, slack_channel_id, current_version_id, is_temporary, created_at, updated_at)
+        SELECT :did, :org_id, counter.num, 'pending_review', :user_id, 'slack', :channel_id, :vid, false, NOW(), NOW() FROM counter
+        RETURNING decision_number
+    ), ins_ver AS (
+        INSERT INTO decision_versions (id, decision_id, version_number, title, impact_level, content, tags, created_by, created_at, custom_fields)
+        VALUES (:vid, :did, 1, :title, 'medium', :content, :tags, :user_id, NOW(), :custom_fields)
+    )
+    SELECT decision_number FROM ins_dec
+""")
+
+POLL_VOTES_SQL = text("""
+    SELECT vote_type, external_user_name FROM poll_votes WHERE decision_id = :did
+""")
+
+# Also records the source message in logged_messages when :msg_id and
+# :channel_id are both given, for duplicate detection
+CREATE_SLACK_DECISION_SQL = text("""
+    WITH counter AS (
+        INSERT INTO decision_counters (organization_id, next_number)
+        SELECT :org_id, COALESCE(MAX(decision_number), 0) + 2
+        FROM decisions WHERE organization_id = :org_id
+        ON CONFLICT (organization_id) DO UPDATE
+        SET next_number = GREATEST(decision_counters.next_number, EXCLUDED.next_number - 1) + 1
+        RETURNING next_number - 1 AS num
+    ), ins_dec AS (
+        INSERT INTO decisions (id, organization_id, decision_number, status, created_by, source, slack_channel_id, slack_message_ts, slack_thread_ts, current_version_id, is_temporary, created_at, updated_at)
+        SELECT :did, :org_id, counter.num, :status, :user_id, 'slack', :channel_id, :msg_ts, :thread_ts, :vid, false, NOW(), NOW() FROM counter
+        RETURNING decision_number
+    ), ins_ver AS (
+        INSERT INTO decision_versions (id, decision_id, version_number, title, impact_level, content, tags, created_by, created_at, custom_fields)
+        VALUES (:vid, :did, 1, :title, :impact, :content, :tags, :user_id, NOW(), :custom_fields)
+    ), ins_msg AS (
+        INSERT INTO logged_messages (id, source, message_id, channel_id, decision_id, created_at)
+        SELECT :log_id, 'slack', :msg_id, :channel_id, :did, NOW()
+        WHERE :msg_id IS NOT NULL AND :channel_id IS NOT NULL
+        ON CONFLICT (source, message_id, channel_id) DO NOTHING
+    )
+    SELECT decision_number FROM ins_dec
+""")
+
+FIND_POLL_VOTE_SQL = text("""
+    SELECT id FROM poll_votes
+    WHERE decision_id = :did AND external_user_id = :uid AND source = 'slack'
+""")
+
+UPDATE_POLL_VOTE_SQL = text("""
+    UPDATE poll_votes SET vote_type = :vote, external_user_name = :name, updated_at = NOW()
+    WHERE id = :id
+""")
+
+INSERT_POLL_VOTE_SQL = text("""
+    INSERT INTO poll_votes (id, decision_id, external_user_id, external_user_name, vote_type, source, created_at, updated_at)
+    VALUES (:id, :did, :uid, :name, :vote, 'slack', NOW(), NOW())
+""")
+
+POLL_DECISION_SQL = text("""
+    SELECT d.decision_number, dv.title, d.status
+    FROM decisions d
+    JOIN decision_versions dv ON d.current_version_id = dv.id
+    WHERE d.id = :did
+""")
+
+APPROVE_DECISION_SQL = text("""
+    UPDATE decisions SET status = 'approved', updated_at = NOW()
+    WHERE id = :did AND status != 'approved'
+""")
+
+POLL_DECISION_FIELDS_SQL = text("""
+    SELECT d.decision_number, dv.title, d.status, dv.custom_fields
+    FROM decisions d
+    JOIN decision_versions dv ON d.current_version_id = dv.id
+    WHERE d.id = :did
+""")
+
+POLL_DECISION_STATE_SQL = text("""
+    SELECT d.decision_number, dv.title, d.status, dv.custom_fields, d.created_at
+    FROM decisions d
+    JOIN decision_versions dv ON d.current_version_id = dv.id
+    WHERE d.id = :did
+""")
+
+ORG_BY_SLACK_TEAM_SQL = text("SELECT id, name, slack_access_token FROM organizations WHERE slack_team_id = :team_id")
+
+ORG_BY_TEAMS_TENANT_SQL = text("SELECT id, name FROM organizations WHERE teams_tenant_id = :tenant_id")
+
+# Organization (id, name) keyed by Teams tenant id. A tenant id is only ever
+# set once, so warm containers serve these entries for the full TTL. Slack
+# lookups are not cached: installs and disconnects (decision_ledger/api/
+# integrations.py) rewrite slack_access_token and slack_team_id from another
+# deployment. The token must be read live, which is already one query, so a
+# cache would save nothing. Misses are not cached, so a newly connected tenant
+# works on its first request.
+ORG_CACHE_TTL = 300
+ORG_CACHE_MAX_ENTRIES = 1024
+_org_cache = {}
+
+
+def get_org_by_slack_team(conn, team_id: str):
+    """Return (id, name, slack_access_token) for a Slack workspace, or None."""
+    return conn.execute(ORG_BY_SLACK_TEAM_SQL, {"team_id": team_id}).fetchone()
+
+
+def get_org_by_teams_tenant(conn, tenant_id: str):
+    """Return (id, name) for a Teams tenant, or None."""
+    cached = _org_cache.get(tenant_id)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    row = conn.execute(ORG_BY_TEAMS_TENANT_SQL, {"tenant_id": tenant_id}).fetchone()
+    if not row:
+        return None
+    org = (row[0], row[1])
+    if len(_org_cache) >= ORG_CACHE_MAX_ENTRIES:
+        _org_cache.clear()
+    _org_cache[tenant_id] = (time.monotonic() + ORG_CACHE_TTL, org)
+    return org
+
+
 # =============================================================================
 # SLACK HANDLERS
 # =============================================================================
 
+# "/decision poll DECISION-123 ..." polls an existing decision instead of creating one
+DECISION_REF_REGEX = re.compile(r"^DECISION-(\d+)\s*(.*)$", re.IGNORECASE)
+
+
 def handle_slack_command(form_data: dict, conn) -> dict:
     """Handle /decisions slash command."""
-    from sqlalchemy import text
-
     team_id = form_data.get("team_id", "")
     channel_id = form_data.get("channel_id", "")
     user_id = form_data.get("user_id", "")
@@ -1200,8 +1547,7 @@ def handle_slack_command(form_data: dict, conn) -> dict:
     cmd_text = form_data.get("text", "").strip()
 
     # Get org
-    result = conn.execute(text("SELECT id, name, slack_access_token FROM organizations WHERE slack_team_id = :team_id"), {"team_id": team_id})
-    org = result.fetchone()
+    org = get_org_by_slack_team(conn, team_id)
 
     if not org:
         return {"response_type": "ephemeral", "text": ":warning: This workspace is not connected to Imputable."}
@@ -1266,13 +1612,7 @@ def handle_slack_command(form_data: dict, conn) -> dict:
         query = cmd_text[7:].strip()
 
         # First, fetch all decisions for semantic search
-        result = conn.execute(text("""
-            SELECT d.id, d.decision_number, dv.title, d.status, dv.content, d.created_at
-            FROM decisions d
-            JOIN decision_versions dv ON d.current_version_id = dv.id
-            WHERE d.organization_id = :org_id AND d.deleted_at IS NULL
-            ORDER BY d.created_at DESC LIMIT 50
-        """), {"org_id": org_id})
+        result = conn.execute(RECENT_DECISIONS_SQL, {"org_id": org_id})
         all_decisions = result.fetchall()
 
         if not all_decisions:
@@ -1317,7 +1657,7 @@ def handle_slack_command(form_data: dict, conn) -> dict:
         question = cmd_text[5:].strip()
 
         # Check if referencing existing decision (DECISION-123)
-        dec_match = re.match(r"^DECISION-(\d+)\s*(.*)$", question, re.IGNORECASE)
+        dec_match = DECISION_REF_REGEX.match(question)
         decision_status = "pending_review"  # Default for new decisions
 
         if dec_match:
@@ -1341,9 +1681,6 @@ def handle_slack_command(form_data: dict, conn) -> dict:
                 return {"response_type": "ephemeral", "text": f":warning: {error_msg}"}
 
             # Create new decision from question
-            result = conn.execute(text("SELECT COALESCE(MAX(decision_number), 0) + 1 FROM decisions WHERE organization_id = :org_id"), {"org_id": org_id})
-            next_num = result.fetchone()[0]
-
             decision_id = str(uuid4())
             version_id = str(uuid4())
 
@@ -1352,40 +1689,27 @@ def handle_slack_command(form_data: dict, conn) -> dict:
             if slack_token:
                 token = decrypt_token(slack_token)
                 try:
-                    members_req = urllib.request.Request(
-                        f"https://slack.com/api/conversations.members?channel={channel_id}&limit=100",
-                        headers={"Authorization": f"Bearer {token}"}
-                    )
-                    members_resp = urllib.request.urlopen(members_req, timeout=5)
-                    members_data = json.loads(members_resp.read().decode())
+                    members_data = slack_api_get(token, f"https://slack.com/api/conversations.members?channel={channel_id}&limit=100", timeout=5)
                     if members_data.get("ok"):
                         channel_member_count = len(members_data.get("members", []))
                 except Exception as e:
                     print(f"[SLACK POLL] Failed to get channel members: {e}")
 
-            conn.execute(text("""
-                INSERT INTO decisions (id, organization_id, decision_number, status, created_by, source, slack_channel_id, is_temporary, created_at, updated_at)
-                VALUES (:id, :org_id, :num, 'pending_review', :user_id, 'slack', :channel_id, false, NOW(), NOW())
-            """), {"id": decision_id, "org_id": org_id, "num": next_num, "user_id": db_user_id, "channel_id": channel_id})
-
             content = json.dumps({"context": "This decision was proposed via Slack poll for team consensus.", "choice": f"Team is voting on: {question}", "rationale": None, "alternatives": []})
             tags = '{"slack-logged", "poll"}'
             custom_fields = json.dumps({"channel_member_count": channel_member_count, "poll_creator_slack_id": user_id})
-            conn.execute(text("""
-                INSERT INTO decision_versions (id, decision_id, version_number, title, impact_level, content, tags, created_by, created_at, custom_fields)
-                VALUES (:id, :did, 1, :title, 'medium', :content, :tags, :user_id, NOW(), :custom_fields)
-            """), {"id": version_id, "did": decision_id, "title": question[:255], "content": content, "tags": tags, "user_id": db_user_id, "custom_fields": custom_fields})
-
-            conn.execute(text("UPDATE decisions SET current_version_id = :vid WHERE id = :did"), {"vid": version_id, "did": decision_id})
+            result = conn.execute(CREATE_POLL_DECISION_SQL, {
+                "did": decision_id, "vid": version_id, "org_id": org_id, "user_id": db_user_id, "channel_id": channel_id,
+                "title": question[:255], "content": content, "tags": tags, "custom_fields": custom_fields
+            })
+            next_num = result.fetchone()[0]
             conn.commit()
 
             decision_number = next_num
             title = question[:255]
 
         # Get current votes and custom_fields
-        result = conn.execute(text("""
-            SELECT vote_type, external_user_name FROM poll_votes WHERE decision_id = :did
-        """), {"did": decision_id})
+        result = conn.execute(POLL_VOTES_SQL, {"did": decision_id})
 
         votes = {"agree": [], "concern": [], "block": []}
         for row in result.fetchall():
@@ -1417,14 +1741,8 @@ def handle_slack_command(form_data: dict, conn) -> dict:
             token = decrypt_token(slack_token)
             modal = SlackModals.create_decision(prefill_title=prefill)
 
-            payload = json.dumps({"trigger_id": trigger_id, "view": modal}).encode()
-            req = urllib.request.Request(
-                "https://slack.com/api/views.open",
-                data=payload,
-                headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-            )
             try:
-                urllib.request.urlopen(req, timeout=10)
+                slack_api_post(token, "https://slack.com/api/views.open", {"trigger_id": trigger_id, "view": modal}, timeout=10)
             except Exception:
                 pass
 
@@ -1451,15 +1769,8 @@ def handle_slack_command(form_data: dict, conn) -> dict:
         }
 
         view_id = None
-        payload_data = json.dumps({"trigger_id": trigger_id, "view": loading_modal}).encode()
-        req = urllib.request.Request(
-            "https://slack.com/api/views.open",
-            data=payload_data,
-            headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-        )
         try:
-            resp = urllib.request.urlopen(req, timeout=5)
-            resp_data = json.loads(resp.read().decode())
+            resp_data = slack_api_post(token, "https://slack.com/api/views.open", {"trigger_id": trigger_id, "view": loading_modal}, timeout=5)
             if resp_data.get("ok"):
                 view_id = resp_data.get("view", {}).get("id")
         except Exception as e:
@@ -1481,14 +1792,8 @@ def handle_slack_command(form_data: dict, conn) -> dict:
                             {"type": "section", "text": {"type": "mrkdwn", "text": ":warning: No recent messages found in this channel to analyze."}}
                         ]
                     }
-                    update_data = json.dumps({"view_id": view_id, "view": error_modal}).encode()
-                    req = urllib.request.Request(
-                        "https://slack.com/api/views.update",
-                        data=update_data,
-                        headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-                    )
                     try:
-                        urllib.request.urlopen(req, timeout=10)
+                        slack_api_post(token, "https://slack.com/api/views.update", {"view_id": view_id, "view": error_modal}, timeout=10)
                     except Exception:
                         pass
                 return {"response_type": "ephemeral", "text": ""}
@@ -1499,9 +1804,7 @@ def handle_slack_command(form_data: dict, conn) -> dict:
             channel_name = ""
             try:
                 channel_info_url = f"https://slack.com/api/conversations.info?channel={channel_id}"
-                req = urllib.request.Request(channel_info_url, headers={"Authorization": f"Bearer {token}"})
-                resp = urllib.request.urlopen(req, timeout=5)
-                channel_data = json.loads(resp.read().decode())
+                channel_data = slack_api_get(token, channel_info_url, timeout=5)
                 if channel_data.get("ok"):
                     channel_name = channel_data.get("channel", {}).get("name", "")
             except Exception:
@@ -1511,7 +1814,7 @@ def handle_slack_command(form_data: dict, conn) -> dict:
             gemini_key = os.environ.get("GEMINI_API_KEY", "")
             analysis = None
             if gemini_key:
-                analysis = analyze_with_gemini(messages, channel_name, hint=hint if hint else None)
+                analysis = analyze_with_gemini_once((channel_id, None, hint or None), messages, channel_name, hint=hint if hint else None)
 
             # Build modal
             if analysis:
@@ -1524,14 +1827,8 @@ def handle_slack_command(form_data: dict, conn) -> dict:
 
             # Update modal with results
             if view_id:
-                update_data = json.dumps({"view_id": view_id, "view": modal}).encode()
-                req = urllib.request.Request(
-                    "https://slack.com/api/views.update",
-                    data=update_data,
-                    headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-                )
                 try:
-                    urllib.request.urlopen(req, timeout=10)
+                    slack_api_post(token, "https://slack.com/api/views.update", {"view_id": view_id, "view": modal}, timeout=10)
                 except Exception as e:
                     print(f"[SLACK LOG CMD] Failed to update modal: {e}")
 
@@ -1548,14 +1845,8 @@ def handle_slack_command(form_data: dict, conn) -> dict:
                         {"type": "section", "text": {"type": "mrkdwn", "text": f":warning: An error occurred while analyzing the conversation. Please try again."}}
                     ]
                 }
-                update_data = json.dumps({"view_id": view_id, "view": error_modal}).encode()
-                req = urllib.request.Request(
-                    "https://slack.com/api/views.update",
-                    data=update_data,
-                    headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-                )
                 try:
-                    urllib.request.urlopen(req, timeout=10)
+                    slack_api_post(token, "https://slack.com/api/views.update", {"view_id": view_id, "view": error_modal}, timeout=10)
                 except Exception:
                     pass
 
@@ -1567,8 +1858,6 @@ def handle_slack_command(form_data: dict, conn) -> dict:
 
 def handle_slack_interactions(payload: dict, conn) -> dict:
     """Handle Slack interactive components."""
-    from sqlalchemy import text
-
     interaction_type = payload.get("type")
     team_id = payload.get("team", {}).get("id")
     user = payload.get("user", {})
@@ -1577,13 +1866,12 @@ def handle_slack_interactions(payload: dict, conn) -> dict:
     trigger_id = payload.get("trigger_id")
 
     # Get org
-    result = conn.execute(text("SELECT id, slack_access_token FROM organizations WHERE slack_team_id = :team_id"), {"team_id": team_id})
-    org = result.fetchone()
+    org = get_org_by_slack_team(conn, team_id)
 
     if not org:
         return {}
 
-    org_id, slack_token = str(org[0]), org[1]
+    org_id, slack_token = str(org[0]), org[2]
     token = decrypt_token(slack_token) if slack_token else None
 
     # Check membership for interactions that require it
@@ -1642,15 +1930,8 @@ def handle_slack_interactions(payload: dict, conn) -> dict:
 
             view_id = None
             if trigger_id:
-                payload_data = json.dumps({"trigger_id": trigger_id, "view": loading_modal}).encode()
-                req = urllib.request.Request(
-                    "https://slack.com/api/views.open",
-                    data=payload_data,
-                    headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-                )
                 try:
-                    resp = urllib.request.urlopen(req, timeout=10)
-                    resp_data = json.loads(resp.read().decode())
+                    resp_data = slack_api_post(token, "https://slack.com/api/views.open", {"trigger_id": trigger_id, "view": loading_modal}, timeout=10)
                     print(f"[SLACK] Loading modal response: ok={resp_data.get('ok')}, error={resp_data.get('error')}")
                     if resp_data.get("ok"):
                         view_id = resp_data.get("view", {}).get("id")
@@ -1675,7 +1956,7 @@ def handle_slack_interactions(payload: dict, conn) -> dict:
                             messages = [{"author": message.get("user", "Unknown"), "text": message_text, "timestamp": message_ts}]
 
                     messages = resolve_slack_user_names(token, messages)
-                    analysis = analyze_with_gemini(messages, channel_name)
+                    analysis = analyze_with_gemini_once((channel_id, thread_ts or message_ts, None), messages, channel_name)
                 else:
                     analysis = None
 
@@ -1687,15 +1968,8 @@ def handle_slack_interactions(payload: dict, conn) -> dict:
 
                 # Update the loading modal with the actual content
                 if view_id:
-                    payload_data = json.dumps({"view_id": view_id, "view": modal}).encode()
-                    req = urllib.request.Request(
-                        "https://slack.com/api/views.update",
-                        data=payload_data,
-                        headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-                    )
                     try:
-                        resp = urllib.request.urlopen(req, timeout=10)
-                        resp_data = json.loads(resp.read().decode())
+                        resp_data = slack_api_post(token, "https://slack.com/api/views.update", {"view_id": view_id, "view": modal}, timeout=10)
                         print(f"[SLACK] views.update response: ok={resp_data.get('ok')}, error={resp_data.get('error')}")
                     except Exception as e:
                         print(f"[SLACK] Failed to update modal: {e}")
@@ -1706,14 +1980,8 @@ def handle_slack_interactions(payload: dict, conn) -> dict:
                 if view_id:
                     prefill_title = message_text.split("\n")[0][:100] if message_text else "Decision from Slack"
                     modal = SlackModals.log_message(prefill_title, message_text, channel_id, message_ts, thread_ts)
-                    payload_data = json.dumps({"view_id": view_id, "view": modal}).encode()
-                    req = urllib.request.Request(
-                        "https://slack.com/api/views.update",
-                        data=payload_data,
-                        headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-                    )
                     try:
-                        urllib.request.urlopen(req, timeout=10)
+                        slack_api_post(token, "https://slack.com/api/views.update", {"view_id": view_id, "view": modal}, timeout=10)
                     except Exception:
                         pass
 
@@ -1724,127 +1992,8 @@ def handle_slack_interactions(payload: dict, conn) -> dict:
         callback_id = payload.get("view", {}).get("callback_id")
         values = payload.get("view", {}).get("state", {}).get("values", {})
 
-        if callback_id in ("create_decision_modal", "log_message_modal"):
-            title = values.get("title_block", {}).get("title_input", {}).get("value", "").strip()
-            context = values.get("context_block", {}).get("context_input", {}).get("value", "") or ""
-            impact = values.get("impact_block", {}).get("impact_select", {}).get("selected_option", {}).get("value", "medium")
-
-            if not title:
-                return {"response_action": "errors", "errors": {"title_block": "Title is required"}}
-
-            # For log_message_modal, get metadata
-            metadata = {}
-            if callback_id == "log_message_modal":
-                try:
-                    metadata = json.loads(payload.get("view", {}).get("private_metadata", "{}"))
-                except:
-                    pass
-
-            choice = values.get("choice_block", {}).get("choice_input", {}).get("value", "") or context or title
-            rationale = values.get("rationale_block", {}).get("rationale_input", {}).get("value", "") or ""
-
-            # Parse alternatives from text format (for AI-generated modals)
-            alternatives = []
-            alternatives_text = values.get("alternatives_block", {}).get("alternatives_input", {}).get("value", "") or ""
-            if alternatives_text:
-                for line in alternatives_text.strip().split("\n"):
-                    line = line.strip()
-                    if line.startswith("- "):
-                        line = line[2:]
-                    if ": " in line:
-                        name, reason = line.split(": ", 1)
-                        alternatives.append({"name": name.strip(), "rejected_reason": reason.strip()})
-                    elif line:
-                        alternatives.append({"name": line, "rejected_reason": ""})
-
-            # Check if AI-generated
-            ai_generated = metadata.get("ai_generated", False)
-            confidence_score = metadata.get("confidence_score", 0.0)
-            suggested_status = metadata.get("suggested_status", "draft")
-
-            # Verify user is an active member
-            db_user_id, member_status, error_msg = get_active_member_user_id(conn, org_id, user_id)
-            if not db_user_id:
-                return {"response_action": "errors", "errors": {"title_block": error_msg}}
-
-            # Get next decision number
-            result = conn.execute(text("SELECT COALESCE(MAX(decision_number), 0) + 1 FROM decisions WHERE organization_id = :org_id"), {"org_id": org_id})
-            next_num = result.fetchone()[0]
-
-            decision_id = str(uuid4())
-            version_id = str(uuid4())
-
-            # Determine status - use AI suggestion if high confidence
-            decision_status = "draft"
-            if ai_generated and confidence_score >= 0.8 and suggested_status in ("draft", "pending_review", "approved"):
-                decision_status = suggested_status
-
-            # Create decision
-            conn.execute(text("""
-                INSERT INTO decisions (id, organization_id, decision_number, status, created_by, source, slack_channel_id, slack_message_ts, slack_thread_ts, is_temporary, created_at, updated_at)
-                VALUES (:id, :org_id, :num, :status, :user_id, 'slack', :channel_id, :msg_ts, :thread_ts, false, NOW(), NOW())
-            """), {
-                "id": decision_id, "org_id": org_id, "num": next_num, "status": decision_status, "user_id": db_user_id,
-                "channel_id": metadata.get("channel_id"), "msg_ts": metadata.get("message_ts"), "thread_ts": metadata.get("thread_ts")
-            })
-
-            content = json.dumps({"context": context, "choice": choice, "rationale": rationale, "alternatives": alternatives})
-
-            # Build tags
-            tags = ["slack-logged"]
-            if ai_generated:
-                tags.append("ai-generated")
-
-            # Build custom_fields for AI metadata
-            custom_fields = {}
-            if ai_generated:
-                custom_fields = {
-                    "ai_generated": True,
-                    "ai_confidence_score": confidence_score,
-                    "verified_by_user": True,
-                    "verified_by_slack_user_id": user_id
-                }
-
-            conn.execute(text("""
-                INSERT INTO decision_versions (id, decision_id, version_number, title, impact_level, content, tags, created_by, created_at, custom_fields)
-                VALUES (:id, :did, 1, :title, :impact, :content, :tags, :user_id, NOW(), :custom_fields)
-            """), {
-                "id": version_id, "did": decision_id, "title": title[:255], "impact": impact,
-                "content": content, "tags": tags, "user_id": db_user_id,
-                "custom_fields": json.dumps(custom_fields) if custom_fields else None
-            })
-
-            conn.execute(text("UPDATE decisions SET current_version_id = :vid WHERE id = :did"), {"vid": version_id, "did": decision_id})
-
-            # Track logged message for duplicate detection (use thread_ts for AI to avoid duplicates)
-            check_ts = metadata.get("thread_ts") or metadata.get("message_ts")
-            if check_ts and metadata.get("channel_id"):
-                conn.execute(text("""
-                    INSERT INTO logged_messages (id, source, message_id, channel_id, decision_id, created_at)
-                    VALUES (:id, 'slack', :msg_id, :channel_id, :did, NOW())
-                    ON CONFLICT (source, message_id, channel_id) DO NOTHING
-                """), {"id": str(uuid4()), "msg_id": check_ts, "channel_id": metadata.get("channel_id"), "did": decision_id})
-
-            conn.commit()
-
-            # Post confirmation to channel if we have one
-            if token and metadata.get("channel_id"):
-                msg_payload = json.dumps({
-                    "channel": metadata.get("channel_id"),
-                    "text": f"Decision logged: DECISION-{next_num}",
-                    "blocks": SlackBlocks.decision_created(decision_id, next_num, title)
-                }).encode()
-                req = urllib.request.Request(
-                    "https://slack.com/api/chat.postMessage",
-                    data=msg_payload,
-                    headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-                )
-                try:
-                    urllib.request.urlopen(req, timeout=10)
-                except Exception:
-                    pass
-
-            return {}
+        # create_decision_modal and log_message_modal submissions never reach
+        # here: the interactions fast path acks them and fires async_save
 
         # Handle reject decision modal submission
         if callback_id == "reject_decision_modal":
@@ -1887,36 +2036,22 @@ def handle_slack_interactions(payload: dict, conn) -> dict:
                     continue
 
                 # Upsert vote
-                result = conn.execute(text("""
-                    SELECT id FROM poll_votes
-                    WHERE decision_id = :did AND external_user_id = :uid AND source = 'slack'
-                """), {"did": decision_id, "uid": user_id})
+                result = conn.execute(FIND_POLL_VOTE_SQL, {"did": decision_id, "uid": user_id})
                 existing = result.fetchone()
 
                 if existing:
-                    conn.execute(text("""
-                        UPDATE poll_votes SET vote_type = :vote, external_user_name = :name, updated_at = NOW()
-                        WHERE id = :id
-                    """), {"vote": vote_type, "name": user_name, "id": existing[0]})
+                    conn.execute(UPDATE_POLL_VOTE_SQL, {"vote": vote_type, "name": user_name, "id": existing[0]})
                 else:
-                    conn.execute(text("""
-                        INSERT INTO poll_votes (id, decision_id, external_user_id, external_user_name, vote_type, source, created_at, updated_at)
-                        VALUES (:id, :did, :uid, :name, :vote, 'slack', NOW(), NOW())
-                    """), {"id": str(uuid4()), "did": decision_id, "uid": user_id, "name": user_name, "vote": vote_type})
+                    conn.execute(INSERT_POLL_VOTE_SQL, {"id": str(uuid4()), "did": decision_id, "uid": user_id, "name": user_name, "vote": vote_type})
 
                 conn.commit()
 
                 # Get updated votes and decision info
-                result = conn.execute(text("""
-                    SELECT d.decision_number, dv.title, d.status
-                    FROM decisions d
-                    JOIN decision_versions dv ON d.current_version_id = dv.id
-                    WHERE d.id = :did
-                """), {"did": decision_id})
+                result = conn.execute(POLL_DECISION_SQL, {"did": decision_id})
                 dec = result.fetchone()
 
                 if dec:
-                    result = conn.execute(text("SELECT vote_type, external_user_name FROM poll_votes WHERE decision_id = :did"), {"did": decision_id})
+                    result = conn.execute(POLL_VOTES_SQL, {"did": decision_id})
                     votes = {"agree": [], "concern": [], "block": []}
                     for row in result.fetchall():
                         vt, name = row[0], row[1] or "Someone"
@@ -1949,24 +2084,16 @@ def handle_slack_interactions(payload: dict, conn) -> dict:
                         }
 
                     # Update decision status to approved
-                    conn.execute(text("""
-                        UPDATE decisions SET status = 'approved', updated_at = NOW()
-                        WHERE id = :did AND status != 'approved'
-                    """), {"did": decision_id})
+                    conn.execute(APPROVE_DECISION_SQL, {"did": decision_id})
                     conn.commit()
 
                     # Get updated decision info including custom_fields
-                    result = conn.execute(text("""
-                        SELECT d.decision_number, dv.title, d.status, dv.custom_fields
-                        FROM decisions d
-                        JOIN decision_versions dv ON d.current_version_id = dv.id
-                        WHERE d.id = :did
-                    """), {"did": decision_id})
+                    result = conn.execute(POLL_DECISION_FIELDS_SQL, {"did": decision_id})
                     dec = result.fetchone()
 
                     if dec:
                         # Get votes
-                        result = conn.execute(text("SELECT vote_type, external_user_name FROM poll_votes WHERE decision_id = :did"), {"did": decision_id})
+                        result = conn.execute(POLL_VOTES_SQL, {"did": decision_id})
                         votes = {"agree": [], "concern": [], "block": []}
                         for row in result.fetchall():
                             vt, name = row[0], row[1] or "Someone"
@@ -2030,13 +2157,8 @@ def handle_slack_interactions(payload: dict, conn) -> dict:
                     }
                     # Open the modal
                     modal_url = "https://slack.com/api/views.open"
-                    modal_payload = json.dumps({"trigger_id": trigger_id, "view": modal}).encode()
-                    modal_req = urllib.request.Request(modal_url, data=modal_payload, headers={
-                        "Authorization": f"Bearer {token}",
-                        "Content-Type": "application/json"
-                    })
                     try:
-                        urllib.request.urlopen(modal_req, timeout=5)
+                        slack_api_post(token, modal_url, {"trigger_id": trigger_id, "view": modal}, timeout=5)
                     except Exception as e:
                         print(f"[SLACK] Error opening reject modal: {e}")
                     return {}
@@ -2050,12 +2172,8 @@ def handle_approval_action(conn, decision_id: str, slack_user_id: str, user_name
 
     This mirrors the logic in /api/v1/decisions/[id].py POST handler.
     """
-    from sqlalchemy import text
-
     # Get the user's database ID
-    result = conn.execute(text("""
-        SELECT id FROM users WHERE slack_user_id = :slack_id AND deleted_at IS NULL
-    """), {"slack_id": slack_user_id})
+    result = conn.execute(USER_BY_SLACK_ID_SQL, {"slack_id": slack_user_id})
     user_row = result.fetchone()
 
     if not user_row:
@@ -2261,21 +2379,12 @@ def send_approval_channel_notification(token: str, channel_id: str, decision_id:
          "url": decision_url, "style": "primary", "action_id": "view_decision"}
     ]})
 
-    payload = json.dumps({
-        "channel": channel_id,
-        "text": f"{approver_name} {action_text} DECISION-{decision_number}",
-        "attachments": [{"color": color, "blocks": blocks}]
-    }).encode()
-
-    req = urllib.request.Request(
-        "https://slack.com/api/chat.postMessage",
-        data=payload,
-        headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-    )
-
     try:
-        response = urllib.request.urlopen(req, timeout=10)
-        data = json.loads(response.read().decode())
+        data = slack_api_post(token, "https://slack.com/api/chat.postMessage", {
+            "channel": channel_id,
+            "text": f"{approver_name} {action_text} DECISION-{decision_number}",
+            "attachments": [{"color": color, "blocks": blocks}]
+        }, timeout=10)
         if not data.get("ok"):
             print(f"[SLACK] Error sending channel notification: {data.get('error')}")
             return False
@@ -2292,21 +2401,17 @@ def send_approval_channel_notification(token: str, channel_id: str, decision_id:
 
 def handle_teams_activity(activity: dict, conn) -> dict:
     """Handle Teams Bot Framework activity."""
-    from sqlalchemy import text
-
     activity_type = activity.get("type")
     conversation = activity.get("conversation", {})
     tenant_id = conversation.get("tenantId") or activity.get("channelData", {}).get("tenant", {}).get("id")
 
     # Get org by tenant
-    result = conn.execute(text("SELECT id, name FROM organizations WHERE teams_tenant_id = :tenant_id"), {"tenant_id": tenant_id})
-    org = result.fetchone()
+    org = get_org_by_teams_tenant(conn, tenant_id)
 
     if not org:
         return {"type": "message", "text": "This Teams workspace is not connected to Imputable."}
 
     org_id, org_name = str(org[0]), org[1]
-    frontend_url = os.environ.get("FRONTEND_URL", "https://imputable.vercel.app")
 
     if activity_type == "message":
         text_content = activity.get("text", "").strip()
@@ -2322,7 +2427,7 @@ def handle_teams_activity(activity: dict, conn) -> dict:
         if text_lower in ("help", "?", ""):
             return {
                 "type": "message",
-                "text": f"**Imputable Bot**\n\nCommands:\n- `search <query>` - Search decisions\n- `poll <question>` - Start consensus poll\n- `help` - Show this message\n\n[Open Imputable]({frontend_url})"
+                "text": f"**Imputable Bot**\n\nCommands:\n- `search <query>` - Search decisions\n- `poll <question>` - Start consensus poll\n- `help` - Show this message\n\n[Open Imputable]({FRONTEND_URL})"
             }
 
         # Search
@@ -2343,7 +2448,7 @@ def handle_teams_activity(activity: dict, conn) -> dict:
 
             lines = [f"**Search results for:** {query}\n"]
             for d in decisions:
-                lines.append(f"- [DECISION-{d[1]}: {d[2]}]({frontend_url}/decisions/{d[0]})")
+                lines.append(f"- [DECISION-{d[1]}: {d[2]}]({_decision_url(d[0])})")
 
             return {"type": "message", "text": "\n".join(lines)}
 
@@ -2371,7 +2476,7 @@ class handler(BaseHTTPRequestHandler):
         if body is not None and body != {}:
             self.send_header("Content-Type", "application/json")
             self.end_headers()
-            self.wfile.write(json.dumps(body).encode() if isinstance(body, (dict, list)) else body.encode() if isinstance(body, str) else body)
+            self.wfile.write(orjson.dumps(body) if isinstance(body, (dict, list)) else body.encode() if isinstance(body, str) else body)
         else:
             self.send_header("Content-Length", "0")
             self.end_headers()
@@ -2393,8 +2498,10 @@ class handler(BaseHTTPRequestHandler):
             # Handle async save request (fired from view_submission, no signature needed)
             if platform == "slack" and req_type == "async_save":
                 print(f"[SLACK ASYNC SAVE] Received async save request")
+                token = ""
+                notify_user_id = None
                 try:
-                    data = json.loads(body.decode()) if body else {}
+                    data = orjson.loads(body) if body else {}
                     if data.get("action") != "save_decision":
                         print(f"[SLACK ASYNC SAVE] Invalid action: {data.get('action')}")
                         self._send(200, {})
@@ -2415,10 +2522,15 @@ class handler(BaseHTTPRequestHandler):
                     user_id = user.get("id", "")
                     user_name = user.get("username", "") or user.get("name", "")
 
+                    # Submissions without a channel (create_decision_modal) get no
+                    # channel confirmation, so tell the submitter directly
+                    notify_user_id = None if metadata.get("channel_id") else user_id
+
                     # Extract form values
                     title = values.get("title_block", {}).get("title_input", {}).get("value", "").strip()
                     if not title:
                         print(f"[SLACK ASYNC SAVE] No title provided")
+                        send_slack_user_notice(token, notify_user_id, ":warning: Your decision was not saved: a title is required.")
                         self._send(200, {})
                         return
 
@@ -2451,34 +2563,22 @@ class handler(BaseHTTPRequestHandler):
                     engine = get_db_connection()
                     if engine:
                         with engine.connect() as conn:
-                            from sqlalchemy import text
-
-                            # Single query to get org_id, user_id, and next decision number
-                            result = conn.execute(text("""
-                                SELECT
-                                    o.id as org_id,
-                                    u.id as user_id,
-                                    COALESCE(MAX(d.decision_number), 0) + 1 as next_num
-                                FROM organizations o
-                                LEFT JOIN users u ON u.slack_user_id = :slack_user_id
-                                LEFT JOIN decisions d ON d.organization_id = o.id
-                                WHERE o.slack_team_id = :team_id
-                                GROUP BY o.id, u.id
-                            """), {"team_id": team_id, "slack_user_id": user_id})
-                            row = result.fetchone()
-
-                            if not row or not row[0]:
+                            org = get_org_by_slack_team(conn, team_id)
+                            if not org:
                                 print(f"[SLACK ASYNC SAVE] Org not found for team_id: {team_id}")
+                                send_slack_user_notice(token, notify_user_id, ":warning: Your decision was not saved: this workspace is not connected to Imputable.")
                                 self._send(200, {})
                                 return
 
-                            org_id = str(row[0])
-                            next_num = row[2]
+                            org_id = str(org[0])
+                            if not token and org[2]:
+                                token = decrypt_token(org[2])
 
                             # Verify user is an active member (don't auto-create)
                             db_user_id, member_status, error_msg = get_active_member_user_id(conn, org_id, user_id)
                             if not db_user_id:
                                 print(f"[SLACK ASYNC SAVE] User not active member: {error_msg}")
+                                send_slack_user_notice(token, notify_user_id, f":warning: Your decision was not saved: {error_msg}")
                                 self._send(200, {})
                                 return
 
@@ -2513,32 +2613,15 @@ class handler(BaseHTTPRequestHandler):
 
                             check_ts = metadata.get("thread_ts") or metadata.get("message_ts")
 
-                            # Insert decision
-                            conn.execute(text("""
-                                INSERT INTO decisions (id, organization_id, decision_number, status, created_by, source, slack_channel_id, slack_message_ts, slack_thread_ts, is_temporary, created_at, updated_at)
-                                VALUES (:id, :org_id, :num, :status, :user_id, 'slack', :channel_id, :msg_ts, :thread_ts, false, NOW(), NOW())
-                            """), {
-                                "id": decision_id, "org_id": org_id, "num": next_num, "status": decision_status, "user_id": db_user_id,
-                                "channel_id": metadata.get("channel_id"), "msg_ts": metadata.get("message_ts"), "thread_ts": metadata.get("thread_ts")
-                            })
-
-                            conn.execute(text("""
-                                INSERT INTO decision_versions (id, decision_id, version_number, title, impact_level, content, tags, created_by, created_at, custom_fields)
-                                VALUES (:id, :did, 1, :title, :impact, :content, :tags, :user_id, NOW(), :custom_fields)
-                            """), {
-                                "id": version_id, "did": decision_id, "title": title[:255], "impact": impact,
-                                "content": content, "tags": tags, "user_id": db_user_id,
-                                "custom_fields": json.dumps(custom_fields) if custom_fields else None
+                            # Insert decision, version and logged message
+                            result = conn.execute(CREATE_SLACK_DECISION_SQL, {
+                                "did": decision_id, "vid": version_id, "org_id": org_id, "status": decision_status, "user_id": db_user_id,
+                                "channel_id": metadata.get("channel_id"), "msg_ts": metadata.get("message_ts"), "thread_ts": metadata.get("thread_ts"),
+                                "title": title[:255], "impact": impact, "content": content, "tags": tags,
+                                "custom_fields": json.dumps(custom_fields) if custom_fields else None,
+                                "log_id": str(uuid4()), "msg_id": check_ts or None
                             })
-
-                            conn.execute(text("UPDATE decisions SET current_version_id = :vid WHERE id = :did"), {"vid": version_id, "did": decision_id})
-
-                            if check_ts and metadata.get("channel_id"):
-                                conn.execute(text("""
-                                    INSERT INTO logged_messages (id, source, message_id, channel_id, decision_id, created_at)
-                                    VALUES (:id, 'slack', :msg_id, :channel_id, :did, NOW())
-                                    ON CONFLICT (source, message_id, channel_id) DO NOTHING
-                                """), {"id": str(uuid4()), "msg_id": check_ts, "channel_id": metadata.get("channel_id"), "did": decision_id})
+                            next_num = result.fetchone()[0]
 
                             # Handle required approver - create RequiredReviewer and send DM
                             approver_slack_id = None
@@ -2575,6 +2658,12 @@ class handler(BaseHTTPRequestHandler):
                             conn.commit()
                             print(f"[SLACK ASYNC SAVE] Decision saved to DB: DECISION-{next_num}")
 
+                            send_slack_user_notice(
+                                token, notify_user_id,
+                                f"Decision logged: DECISION-{next_num}",
+                                SlackBlocks.decision_created(decision_id, next_num, title)
+                            )
+
                             # Send DM to approver AFTER commit (so decision exists)
                             if approver_slack_id and token:
                                 try:
@@ -2608,11 +2697,15 @@ class handler(BaseHTTPRequestHandler):
                                         print(f"[SLACK ASYNC SAVE] Stored DM info for approver")
                                 except Exception as dm_err:
                                     print(f"[SLACK ASYNC SAVE] Error sending approval DM: {dm_err}")
+                    else:
+                        print("[SLACK ASYNC SAVE] Database not configured")
+                        send_slack_user_notice(token, notify_user_id, ":warning: Your decision could not be saved. Please try again.")
 
                 except Exception as e:
                     print(f"[SLACK ASYNC SAVE] Error: {e}")
                     import traceback
                     traceback.print_exc()
+                    send_slack_user_notice(token, notify_user_id, ":warning: Your decision could not be saved. Please try again.")
 
                 self._send(200, {"ok": True})
                 return
@@ -2621,7 +2714,7 @@ class handler(BaseHTTPRequestHandler):
             if platform == "slack" and req_type == "async_poll":
                 print(f"[SLACK ASYNC POLL] Received async poll request")
                 try:
-                    data = json.loads(body.decode()) if body else {}
+                    data = orjson.loads(body) if body else {}
                     team_id = data.get("team_id")
                     channel_id = data.get("channel_id")
                     user_id = data.get("user_id")
@@ -2638,31 +2731,27 @@ class handler(BaseHTTPRequestHandler):
                     engine = get_db_connection()
                     if engine:
                         with engine.connect() as conn:
-                            from sqlalchemy import text
-
                             # Get org
-                            result = conn.execute(text("SELECT id, slack_access_token FROM organizations WHERE slack_team_id = :team_id"), {"team_id": team_id})
-                            org = result.fetchone()
+                            org = get_org_by_slack_team(conn, team_id)
                             if not org:
                                 self._send(200, {})
                                 return
 
                             org_id = str(org[0])
-                            if not token and org[1]:
-                                token = decrypt_token(org[1])
+                            if not token and org[2]:
+                                token = decrypt_token(org[2])
 
                             # Verify user is an active member
                             db_user_id, member_status, error_msg = get_active_member_user_id(conn, org_id, user_id)
                             if not db_user_id:
                                 # Send error via response_url
                                 if response_url:
-                                    error_payload = json.dumps({
+                                    error_payload = orjson.dumps({
                                         "response_type": "ephemeral",
                                         "text": f":warning: {error_msg}"
-                                    }).encode()
+                                    })
                                     try:
-                                        req = urllib.request.Request(response_url, data=error_payload, headers={"Content-Type": "application/json"})
-                                        urllib.request.urlopen(req, timeout=5)
+                                        _http_client.post(response_url, content=error_payload, headers={"Content-Type": "application/json"}, timeout=5)
                                     except Exception:
                                         pass
                                 self._send(200, {})
@@ -2672,40 +2761,25 @@ class handler(BaseHTTPRequestHandler):
                             channel_member_count = 0
                             if token:
                                 try:
-                                    members_req = urllib.request.Request(
-                                        f"https://slack.com/api/conversations.members?channel={channel_id}&limit=100",
-                                        headers={"Authorization": f"Bearer {token}"}
-                                    )
-                                    members_resp = urllib.request.urlopen(members_req, timeout=5)
-                                    members_data = json.loads(members_resp.read().decode())
+                                    members_data = slack_api_get(token, f"https://slack.com/api/conversations.members?channel={channel_id}&limit=100", timeout=5)
                                     if members_data.get("ok"):
                                         channel_member_count = len(members_data.get("members", []))
                                         print(f"[SLACK ASYNC POLL] Channel has {channel_member_count} members")
                                 except Exception as e:
                                     print(f"[SLACK ASYNC POLL] Failed to get channel members: {e}")
 
-                            # Get next decision number
-                            result = conn.execute(text("SELECT COALESCE(MAX(decision_number), 0) + 1 FROM decisions WHERE organization_id = :org_id"), {"org_id": org_id})
-                            next_num = result.fetchone()[0]
-
                             decision_id = str(uuid4())
                             version_id = str(uuid4())
 
                             # Create decision
-                            conn.execute(text("""
-                                INSERT INTO decisions (id, organization_id, decision_number, status, created_by, source, slack_channel_id, is_temporary, created_at, updated_at)
-                                VALUES (:id, :org_id, :num, 'pending_review', :user_id, 'slack', :channel_id, false, NOW(), NOW())
-                            """), {"id": decision_id, "org_id": org_id, "num": next_num, "user_id": db_user_id, "channel_id": channel_id})
-
                             content = json.dumps({"context": "This decision was proposed via Slack poll for team consensus.", "choice": f"Team is voting on: {question}", "rationale": None, "alternatives": []})
                             tags = '{"slack-logged", "poll"}'
                             custom_fields = json.dumps({"channel_member_count": channel_member_count, "poll_creator_slack_id": user_id})
-                            conn.execute(text("""
-                                INSERT INTO decision_versions (id, decision_id, version_number, title, impact_level, content, tags, created_by, created_at, custom_fields)
-                                VALUES (:id, :did, 1, :title, 'medium', :content, :tags, :user_id, NOW(), :custom_fields)
-                            """), {"id": version_id, "did": decision_id, "title": question[:255], "content": content, "tags": tags, "user_id": db_user_id, "custom_fields": custom_fields})
-
-                            conn.execute(text("UPDATE decisions SET current_version_id = :vid WHERE id = :did"), {"vid": version_id, "did": decision_id})
+                            result = conn.execute(CREATE_POLL_DECISION_SQL, {
+                                "did": decision_id, "vid": version_id, "org_id": org_id, "user_id": db_user_id, "channel_id": channel_id,
+                                "title": question[:255], "content": content, "tags": tags, "custom_fields": custom_fields
+                            })
+                            next_num = result.fetchone()[0]
                             conn.commit()
 
                             # Build poll blocks
@@ -2714,19 +2788,19 @@ class handler(BaseHTTPRequestHandler):
 
                             # Replace loading message with poll via response_url
                             if response_url:
-                                poll_payload = json.dumps({
+                                poll_payload = orjson.dumps({
                                     "response_type": "in_channel",
                                     "replace_original": True,
                                     "text": f"Poll: {question[:100]}",
                                     "blocks": blocks
-                                }).encode()
-                                req = urllib.request.Request(
-                                    response_url,
-                                    data=poll_payload,
-                                    headers={"Content-Type": "application/json"}
-                                )
+                                })
                                 try:
-                                    urllib.request.urlopen(req, timeout=10)
+                                    _http_client.post(
+                                        response_url,
+                                        content=poll_payload,
+                                        headers={"Content-Type": "application/json"},
+                                        timeout=10
+                                    )
                                     print(f"[SLACK ASYNC POLL] Posted poll via response_url")
                                 except Exception as e:
                                     print(f"[SLACK ASYNC POLL] Failed to post poll: {e}")
@@ -2743,7 +2817,7 @@ class handler(BaseHTTPRequestHandler):
             if platform == "slack" and req_type == "async_search":
                 print(f"[SLACK ASYNC SEARCH] Received async search request")
                 try:
-                    data = json.loads(body.decode()) if body else {}
+                    data = orjson.loads(body) if body else {}
                     team_id = data.get("team_id")
                     query = data.get("query", "")
                     response_url = data.get("response_url")
@@ -2755,21 +2829,17 @@ class handler(BaseHTTPRequestHandler):
                     engine = get_db_connection()
                     if engine:
                         with engine.connect() as conn:
-                            from sqlalchemy import text
-
                             # Get org
-                            result = conn.execute(text("SELECT id FROM organizations WHERE slack_team_id = :team_id"), {"team_id": team_id})
-                            org = result.fetchone()
+                            org = get_org_by_slack_team(conn, team_id)
                             if not org:
                                 # Send error via response_url
-                                error_payload = json.dumps({
+                                error_payload = orjson.dumps({
                                     "response_type": "ephemeral",
                                     "replace_original": True,
                                     "text": ":warning: Organization not found."
-                                }).encode()
-                                req = urllib.request.Request(response_url, data=error_payload, headers={"Content-Type": "application/json"})
+                                })
                                 try:
-                                    urllib.request.urlopen(req, timeout=5)
+                                    _http_client.post(response_url, content=error_payload, headers={"Content-Type": "application/json"}, timeout=5)
                                 except:
                                     pass
                                 self._send(200, {})
@@ -2778,24 +2848,17 @@ class handler(BaseHTTPRequestHandler):
                             org_id = str(org[0])
 
                             # Fetch decisions for semantic search
-                            result = conn.execute(text("""
-                                SELECT d.id, d.decision_number, dv.title, d.status, dv.content, d.created_at
-                                FROM decisions d
-                                JOIN decision_versions dv ON d.current_version_id = dv.id
-                                WHERE d.organization_id = :org_id AND d.deleted_at IS NULL
-                                ORDER BY d.created_at DESC LIMIT 50
-                            """), {"org_id": org_id})
+                            result = conn.execute(RECENT_DECISIONS_SQL, {"org_id": org_id})
                             all_decisions = result.fetchall()
 
                             if not all_decisions:
-                                no_results_payload = json.dumps({
+                                no_results_payload = orjson.dumps({
                                     "response_type": "ephemeral",
                                     "replace_original": True,
                                     "text": ":mag: No decisions found in your organization yet."
-                                }).encode()
-                                req = urllib.request.Request(response_url, data=no_results_payload, headers={"Content-Type": "application/json"})
+                                })
                                 try:
-                                    urllib.request.urlopen(req, timeout=5)
+                                    _http_client.post(response_url, content=no_results_payload, headers={"Content-Type": "application/json"}, timeout=5)
                                 except:
                                     pass
                                 self._send(200, {})
@@ -2835,14 +2898,13 @@ class handler(BaseHTTPRequestHandler):
                                 blocks = SlackBlocks.semantic_search_results(query, matched_decisions, explanation, best_match)
 
                             # Send results via response_url, replacing the "Searching..." message
-                            results_payload = json.dumps({
+                            results_payload = orjson.dumps({
                                 "response_type": "ephemeral",
                                 "replace_original": True,
                                 "blocks": blocks
-                            }).encode()
-                            req = urllib.request.Request(response_url, data=results_payload, headers={"Content-Type": "application/json"})
+                            })
                             try:
-                                urllib.request.urlopen(req, timeout=10)
+                                _http_client.post(response_url, content=results_payload, headers={"Content-Type": "application/json"}, timeout=10)
                                 print(f"[SLACK ASYNC SEARCH] Sent results for query: {query}")
                             except Exception as e:
                                 print(f"[SLACK ASYNC SEARCH] Failed to send results: {e}")
@@ -2857,10 +2919,9 @@ class handler(BaseHTTPRequestHandler):
 
             # ASYNC POLL VOTE handler
             if platform == "slack" and req_type == "async_poll_vote":
-                from sqlalchemy import text
                 print(f"[SLACK ASYNC VOTE] Received async vote request")
                 try:
-                    data = json.loads(body.decode())
+                    data = orjson.loads(body)
                     team_id = data.get("team_id", "")
                     decision_id = data.get("decision_id", "")
                     vote_type = data.get("vote_type", "")
@@ -2872,36 +2933,22 @@ class handler(BaseHTTPRequestHandler):
                     if engine:
                         with engine.connect() as conn:
                             # Upsert vote
-                            result = conn.execute(text("""
-                                SELECT id FROM poll_votes
-                                WHERE decision_id = :did AND external_user_id = :uid AND source = 'slack'
-                            """), {"did": decision_id, "uid": user_id})
+                            result = conn.execute(FIND_POLL_VOTE_SQL, {"did": decision_id, "uid": user_id})
                             existing = result.fetchone()
 
                             if existing:
-                                conn.execute(text("""
-                                    UPDATE poll_votes SET vote_type = :vote, external_user_name = :name, updated_at = NOW()
-                                    WHERE id = :id
-                                """), {"vote": vote_type, "name": user_name, "id": existing[0]})
+                                conn.execute(UPDATE_POLL_VOTE_SQL, {"vote": vote_type, "name": user_name, "id": existing[0]})
                             else:
-                                conn.execute(text("""
-                                    INSERT INTO poll_votes (id, decision_id, external_user_id, external_user_name, vote_type, source, created_at, updated_at)
-                                    VALUES (:id, :did, :uid, :name, :vote, 'slack', NOW(), NOW())
-                                """), {"id": str(uuid4()), "did": decision_id, "uid": user_id, "name": user_name, "vote": vote_type})
+                                conn.execute(INSERT_POLL_VOTE_SQL, {"id": str(uuid4()), "did": decision_id, "uid": user_id, "name": user_name, "vote": vote_type})
 
                             conn.commit()
 
                             # Get updated votes and decision info
-                            result = conn.execute(text("""
-                                SELECT d.decision_number, dv.title, d.status, dv.custom_fields, d.created_at
-                                FROM decisions d
-                                JOIN decision_versions dv ON d.current_version_id = dv.id
-                                WHERE d.id = :did
-                            """), {"did": decision_id})
+                            result = conn.execute(POLL_DECISION_STATE_SQL, {"did": decision_id})
                             dec = result.fetchone()
 
                             if dec and response_url:
-                                result = conn.execute(text("SELECT vote_type, external_user_name FROM poll_votes WHERE decision_id = :did"), {"did": decision_id})
+                                result = conn.execute(POLL_VOTES_SQL, {"did": decision_id})
                                 votes = {"agree": [], "concern": [], "block": []}
                                 for row in result.fetchall():
                                     vt, name = row[0], row[1] or "Someone"
@@ -2935,34 +2982,31 @@ class handler(BaseHTTPRequestHandler):
                                             # Send DM to creator
                                             token = os.environ.get("SLACK_BOT_TOKEN", "")
                                             if token:
-                                                frontend_url = os.environ.get("FRONTEND_URL", "https://imputable.vercel.app")
                                                 dm_blocks = [
                                                     {"type": "section", "text": {"type": "mrkdwn", "text": f":tada: *Consensus reached on your poll!*\n\n*{dec[1]}*\n\nThe team has reached consensus. You can now approve this decision."}},
                                                     {"type": "actions", "elements": [
-                                                        {"type": "button", "text": {"type": "plain_text", "text": "View Decision"}, "url": f"{frontend_url}/decisions/{decision_id}"}
+                                                        {"type": "button", "text": {"type": "plain_text", "text": "View Decision"}, "url": _decision_url(decision_id)}
                                                     ]}
                                                 ]
-                                                dm_payload = json.dumps({"channel": creator_slack_id, "text": f"Consensus reached on: {dec[1]}", "blocks": dm_blocks}).encode()
-                                                dm_req = urllib.request.Request("https://slack.com/api/chat.postMessage", data=dm_payload, headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"})
                                                 try:
-                                                    urllib.request.urlopen(dm_req, timeout=5)
+                                                    slack_api_post(token, "https://slack.com/api/chat.postMessage", {"channel": creator_slack_id, "text": f"Consensus reached on: {dec[1]}", "blocks": dm_blocks}, timeout=5)
                                                     print(f"[SLACK ASYNC VOTE] Sent consensus DM to creator {creator_slack_id}")
                                                 except Exception as dm_e:
                                                     print(f"[SLACK ASYNC VOTE] Failed to send DM: {dm_e}")
 
                                 blocks = SlackBlocks.consensus_poll(decision_id, dec[0], dec[1], votes, dec[2], channel_member_count, creator_slack_id)
-                                update_payload = json.dumps({
+                                update_payload = orjson.dumps({
                                     "replace_original": True,
                                     "blocks": blocks
-                                }).encode()
+                                })
 
-                                req = urllib.request.Request(
-                                    response_url,
-                                    data=update_payload,
-                                    headers={"Content-Type": "application/json"}
-                                )
                                 try:
-                                    urllib.request.urlopen(req, timeout=5)
+                                    _http_client.post(
+                                        response_url,
+                                        content=update_payload,
+                                        headers={"Content-Type": "application/json"},
+                                        timeout=5
+                                    )
                                     print(f"[SLACK ASYNC VOTE] Updated poll via response_url")
                                 except Exception as e:
                                     print(f"[SLACK ASYNC VOTE] Failed to update: {e}")
@@ -2977,10 +3021,9 @@ class handler(BaseHTTPRequestHandler):
 
             # ASYNC POLL APPROVE handler
             if platform == "slack" and req_type == "async_poll_approve":
-                from sqlalchemy import text
                 print(f"[SLACK ASYNC APPROVE] Received async approve request")
                 try:
-                    data = json.loads(body.decode())
+                    data = orjson.loads(body)
                     team_id = data.get("team_id", "")
                     decision_id = data.get("decision_id", "")
                     user_id = data.get("user_id", "")
@@ -2991,23 +3034,15 @@ class handler(BaseHTTPRequestHandler):
                     if engine:
                         with engine.connect() as conn:
                             # Update decision status to approved
-                            conn.execute(text("""
-                                UPDATE decisions SET status = 'approved', updated_at = NOW()
-                                WHERE id = :did AND status != 'approved'
-                            """), {"did": decision_id})
+                            conn.execute(APPROVE_DECISION_SQL, {"did": decision_id})
                             conn.commit()
 
                             # Get updated decision info
-                            result = conn.execute(text("""
-                                SELECT d.decision_number, dv.title, d.status
-                                FROM decisions d
-                                JOIN decision_versions dv ON d.current_version_id = dv.id
-                                WHERE d.id = :did
-                            """), {"did": decision_id})
+                            result = conn.execute(POLL_DECISION_SQL, {"did": decision_id})
                             dec = result.fetchone()
 
                             if dec and response_url:
-                                result = conn.execute(text("SELECT vote_type, external_user_name FROM poll_votes WHERE decision_id = :did"), {"did": decision_id})
+                                result = conn.execute(POLL_VOTES_SQL, {"did": decision_id})
                                 votes = {"agree": [], "concern": [], "block": []}
                                 for row in result.fetchall():
                                     vt, name = row[0], row[1] or "Someone"
@@ -3015,18 +3050,18 @@ class handler(BaseHTTPRequestHandler):
                                         votes[vt].append(name)
 
                                 blocks = SlackBlocks.consensus_poll(decision_id, dec[0], dec[1], votes, dec[2])
-                                update_payload = json.dumps({
+                                update_payload = orjson.dumps({
                                     "replace_original": True,
                                     "blocks": blocks
-                                }).encode()
+                                })
 
-                                req = urllib.request.Request(
-                                    response_url,
-                                    data=update_payload,
-                                    headers={"Content-Type": "application/json"}
-                                )
                                 try:
-                                    urllib.request.urlopen(req, timeout=5)
+                                    _http_client.post(
+                                        response_url,
+                                        content=update_payload,
+                                        headers={"Content-Type": "application/json"},
+                                        timeout=5
+                                    )
                                     print(f"[SLACK ASYNC APPROVE] Updated poll via response_url")
                                 except Exception as e:
                                     print(f"[SLACK ASYNC APPROVE] Failed to update: {e}")
@@ -3042,7 +3077,7 @@ class handler(BaseHTTPRequestHandler):
             # Async handler for /decision log AI analysis
             if platform == "slack" and req_type == "async_log":
                 try:
-                    data = json.loads(body.decode())
+                    data = orjson.loads(body)
                     view_id = data.get("view_id", "")
                     channel_id = data.get("channel_id", "")
                     hint = data.get("hint", "")
@@ -3061,12 +3096,7 @@ class handler(BaseHTTPRequestHandler):
                         # Get channel name
                         channel_name = ""
                         try:
-                            channel_req = urllib.request.Request(
-                                f"https://slack.com/api/conversations.info?channel={channel_id}",
-                                headers={"Authorization": f"Bearer {token}"}
-                            )
-                            channel_resp = urllib.request.urlopen(channel_req, timeout=5)
-                            channel_data = json.loads(channel_resp.read().decode())
+                            channel_data = slack_api_get(token, f"https://slack.com/api/conversations.info?channel={channel_id}", timeout=5)
                             if channel_data.get("ok"):
                                 channel_name = channel_data.get("channel", {}).get("name", "")
                         except:
@@ -3075,7 +3105,7 @@ class handler(BaseHTTPRequestHandler):
                         # AI analysis
                         gemini_key = os.environ.get("GEMINI_API_KEY", "")
                         if gemini_key:
-                            analysis = analyze_with_gemini(messages, channel_name, hint=hint if hint else None)
+                            analysis = analyze_with_gemini_once((channel_id, None, hint or None), messages, channel_name, hint=hint if hint else None)
                             if analysis:
                                 latest_ts = messages[-1].get("timestamp", "") if messages else ""
                                 modal = SlackModals.ai_prefilled_modal(analysis, channel_id, latest_ts, None)
@@ -3087,13 +3117,7 @@ class handler(BaseHTTPRequestHandler):
                             modal = SlackModals.log_message(prefill_title, "", channel_id, "", None)
 
                         # Update modal with results
-                        update_data = json.dumps({"view_id": view_id, "view": modal}).encode()
-                        update_req = urllib.request.Request(
-                            "https://slack.com/api/views.update",
-                            data=update_data,
-                            headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-                        )
-                        urllib.request.urlopen(update_req, timeout=10)
+                        slack_api_post(token, "https://slack.com/api/views.update", {"view_id": view_id, "view": modal}, timeout=10)
                     else:
                         # No messages - show error modal
                         error_modal = {
@@ -3103,13 +3127,7 @@ class handler(BaseHTTPRequestHandler):
                             "close": {"type": "plain_text", "text": "Close"},
                             "blocks": [{"type": "section", "text": {"type": "mrkdwn", "text": ":warning: No recent messages found in this channel to analyze."}}]
                         }
-                        update_data = json.dumps({"view_id": view_id, "view": error_modal}).encode()
-                        update_req = urllib.request.Request(
-                            "https://slack.com/api/views.update",
-                            data=update_data,
-                            headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-                        )
-                        urllib.request.urlopen(update_req, timeout=5)
+                        slack_api_post(token, "https://slack.com/api/views.update", {"view_id": view_id, "view": error_modal}, timeout=5)
 
                 except Exception as e:
                     print(f"[SLACK] Async log error: {e}")
@@ -3123,19 +3141,65 @@ class handler(BaseHTTPRequestHandler):
                                 "close": {"type": "plain_text", "text": "Close"},
                                 "blocks": [{"type": "section", "text": {"type": "mrkdwn", "text": ":warning: *Failed to analyze conversation.*\n\nPlease try again or use `/decision add` to create a decision manually."}}]
                             }
-                            update_data = json.dumps({"view_id": view_id, "view": error_modal}).encode()
-                            update_req = urllib.request.Request(
-                                "https://slack.com/api/views.update",
-                                data=update_data,
-                                headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-                            )
-                            urllib.request.urlopen(update_req, timeout=5)
+                            slack_api_post(token, "https://slack.com/api/views.update", {"view_id": view_id, "view": error_modal}, timeout=5)
                     except:
                         pass
 
                 self._send(200, {"ok": True})
                 return
 
+            # Async handler for message shortcut AI analysis
+            if platform == "slack" and req_type == "async_shortcut":
+                try:
+                    data = orjson.loads(body)
+                    view_id = data.get("view_id", "")
+                    channel_id = data.get("channel_id", "")
+                    channel_name = data.get("channel_name", "")
+                    message_text = data.get("message_text", "")
+                    message_ts = data.get("message_ts", "")
+                    thread_ts = data.get("thread_ts") or message_ts
+                    token = data.get("token", "")
+
+                    if not view_id or not token:
+                        self._send(200, {"ok": False})
+                        return
+
+                    prefill_title = message_text.split("\n")[0][:100] if message_text else "Decision from Slack"
+                    modal = None
+                    gemini_key = os.environ.get("GEMINI_API_KEY", "")
+                    if gemini_key:
+                        try:
+                            # Fetch messages for context
+                            if thread_ts != message_ts:
+                                # Message is in a thread - fetch the whole thread
+                                messages = fetch_slack_thread(token, channel_id, thread_ts)
+                            else:
+                                # Not in a thread - fetch surrounding channel messages for context
+                                messages = fetch_channel_context(token, channel_id, message_ts, count=25)
+                                if not messages:
+                                    # Fallback to just the single message
+                                    messages = [{"author": data.get("message_user", "Unknown"), "text": message_text, "timestamp": message_ts}]
+                            messages = resolve_slack_user_names(token, messages)
+                            analysis = analyze_with_gemini_once((channel_id, thread_ts, None), messages, channel_name)
+                            if analysis:
+                                modal = SlackModals.ai_prefilled_modal(analysis, channel_id, message_ts, thread_ts)
+                        except Exception as e:
+                            print(f"[SLACK] Async shortcut AI error: {e}")
+
+                    if modal is None:
+                        modal = SlackModals.log_message(prefill_title, message_text, channel_id, message_ts, thread_ts)
+
+                    # Update modal with results
+                    resp_data = slack_api_post(token, "https://slack.com/api/views.update", {"view_id": view_id, "view": modal}, timeout=10)
+                    print(f"[SLACK] Async shortcut views.update: ok={resp_data.get('ok')}, error={resp_data.get('error')}")
+                except Exception as e:
+                    print(f"[SLACK] Async shortcut error: {e}")
+                    import traceback
+                    traceback.print_exc()
+
+                self._send(200, {"ok": True})
+                return
+
             # FAST PATH for slash commands - respond immediately, process async
             if platform == "slack" and req_type == "command":
                 # Verify signature first
@@ -3168,22 +3232,22 @@ class handler(BaseHTTPRequestHandler):
                     webhook_base = os.environ.get("WEBHOOK_URL", "https://imputable.vercel.app")
                     poll_url = f"{webhook_base}/api/v1/integrations/webhook?platform=slack&type=async_poll"
 
-                    poll_payload = json.dumps({
+                    poll_payload = orjson.dumps({
                         "team_id": team_id,
                         "channel_id": channel_id,
                         "user_id": user_id,
                         "user_name": user_name,
                         "question": question,
                         "response_url": response_url
-                    }).encode()
+                    })
 
-                    req = urllib.request.Request(
-                        poll_url,
-                        data=poll_payload,
-                        headers={"Content-Type": "application/json"}
-                    )
                     try:
-                        urllib.request.urlopen(req, timeout=0.1)
+                        _http_client.post(
+                            poll_url,
+                            content=poll_payload,
+                            headers={"Content-Type": "application/json"},
+                            timeout=0.1
+                        )
                     except:
                         pass  # Expected to timeout
 
@@ -3201,19 +3265,19 @@ class handler(BaseHTTPRequestHandler):
                     webhook_base = os.environ.get("WEBHOOK_URL", "https://imputable.vercel.app")
                     search_url = f"{webhook_base}/api/v1/integrations/webhook?platform=slack&type=async_search"
 
-                    search_payload = json.dumps({
+                    search_payload = orjson.dumps({
                         "team_id": team_id,
                         "query": query,
                         "response_url": response_url
-                    }).encode()
+                    })
 
-                    req = urllib.request.Request(
-                        search_url,
-                        data=search_payload,
-                        headers={"Content-Type": "application/json"}
-                    )
                     try:
-                        urllib.request.urlopen(req, timeout=0.1)
+                        _http_client.post(
+                            search_url,
+                            content=search_payload,
+                            headers={"Content-Type": "application/json"},
+                            timeout=0.1
+                        )
                     except:
                         pass  # Expected to timeout
 
@@ -3239,24 +3303,16 @@ class handler(BaseHTTPRequestHandler):
                         engine = get_db_connection()
                         if engine:
                             with engine.connect() as conn:
-                                from sqlalchemy import text
-                                result = conn.execute(text("SELECT slack_access_token FROM organizations WHERE slack_team_id = :team_id"), {"team_id": team_id})
-                                org = result.fetchone()
-                                token = decrypt_token(org[0]) if org and org[0] else None
+                                org = get_org_by_slack_team(conn, team_id)
+                                token = decrypt_token(org[2]) if org and org[2] else None
 
                     if not token:
                         self._send(200, {"response_type": "ephemeral", "text": ":warning: Workspace not connected. Please reconnect Slack in settings."})
                         return
 
                     modal = SlackModals.create_decision(prefill_title=prefill)
-                    payload_data = json.dumps({"trigger_id": trigger_id, "view": modal}).encode()
-                    req = urllib.request.Request(
-                        "https://slack.com/api/views.open",
-                        data=payload_data,
-                        headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-                    )
                     try:
-                        urllib.request.urlopen(req, timeout=5)
+                        slack_api_post(token, "https://slack.com/api/views.open", {"trigger_id": trigger_id, "view": modal}, timeout=5)
                         self._send(200, {})
                     except Exception as e:
                         print(f"[SLACK] Failed to open add modal: {e}")
@@ -3282,10 +3338,8 @@ class handler(BaseHTTPRequestHandler):
                         engine = get_db_connection()
                         if engine:
                             with engine.connect() as conn:
-                                from sqlalchemy import text
-                                result = conn.execute(text("SELECT slack_access_token FROM organizations WHERE slack_team_id = :team_id"), {"team_id": team_id})
-                                org = result.fetchone()
-                                token = decrypt_token(org[0]) if org and org[0] else None
+                                org = get_org_by_slack_team(conn, team_id)
+                                token = decrypt_token(org[2]) if org and org[2] else None
 
                     if not token:
                         self._send(200, {"response_type": "ephemeral", "text": ":warning: Workspace not connected. Please reconnect Slack in settings."})
@@ -3300,15 +3354,8 @@ class handler(BaseHTTPRequestHandler):
                         "blocks": [{"type": "section", "text": {"type": "mrkdwn", "text": ":sparkles: *AI is analyzing the recent conversation...*\n\nThis may take a few seconds."}}]
                     }
 
-                    payload_data = json.dumps({"trigger_id": trigger_id, "view": loading_modal}).encode()
-                    req = urllib.request.Request(
-                        "https://slack.com/api/views.open",
-                        data=payload_data,
-                        headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-                    )
                     try:
-                        resp = urllib.request.urlopen(req, timeout=5)
-                        resp_data = json.loads(resp.read().decode())
+                        resp_data = slack_api_post(token, "https://slack.com/api/views.open", {"trigger_id": trigger_id, "view": loading_modal}, timeout=5)
                         view_id = resp_data.get("view", {}).get("id") if resp_data.get("ok") else None
 
                         if view_id:
@@ -3316,20 +3363,20 @@ class handler(BaseHTTPRequestHandler):
                             webhook_base = os.environ.get("WEBHOOK_URL", "https://imputable.vercel.app")
                             async_url = f"{webhook_base}/api/v1/integrations/webhook?platform=slack&type=async_log"
 
-                            async_payload = json.dumps({
+                            async_payload = orjson.dumps({
                                 "view_id": view_id,
                                 "channel_id": channel_id,
                                 "hint": hint,
                                 "token": token
-                            }).encode()
+                            })
 
-                            async_req = urllib.request.Request(
-                                async_url,
-                                data=async_payload,
-                                headers={"Content-Type": "application/json"}
-                            )
                             try:
-                                urllib.request.urlopen(async_req, timeout=0.1)
+                                _http_client.post(
+                                    async_url,
+                                    content=async_payload,
+                                    headers={"Content-Type": "application/json"},
+                                    timeout=0.1
+                                )
                             except:
                                 pass  # Expected to timeout
 
@@ -3359,7 +3406,7 @@ class handler(BaseHTTPRequestHandler):
                         break
 
                 try:
-                    payload = json.loads(payload_str) if payload_str else {}
+                    payload = orjson.loads(payload_str) if payload_str else {}
                 except json.JSONDecodeError as e:
                     print(f"[SLACK FAST PATH] JSON parse error: {e}")
                     self._send(200, {"response_type": "ephemeral", "text": "Error processing request."})
@@ -3404,34 +3451,34 @@ class handler(BaseHTTPRequestHandler):
                                 if block.get("type") == "context":
                                     elements = block.get("elements", [])
                                     for elem in elements:
-                                        text = elem.get("text", "")
-                                        if ":white_check_mark:" in text and "View" not in text:
+                                        elem_text = elem.get("text", "")
+                                        if ":white_check_mark:" in elem_text and "View" not in elem_text:
                                             # Agree votes
-                                            parts = text.replace(":white_check_mark:", "").strip()
+                                            parts = elem_text.replace(":white_check_mark:", "").strip()
                                             if parts:
                                                 votes["agree"] = [n.strip() for n in parts.split(",") if n.strip()]
-                                        if ":warning:" in text:
+                                        if ":warning:" in elem_text:
                                             # Concern votes - extract from section after |
-                                            if "|" in text:
-                                                for section in text.split("|"):
+                                            if "|" in elem_text:
+                                                for section in elem_text.split("|"):
                                                     if ":warning:" in section:
                                                         parts = section.replace(":warning:", "").strip()
                                                         if parts:
                                                             votes["concern"] = [n.strip() for n in parts.split(",") if n.strip()]
                                             else:
-                                                parts = text.replace(":warning:", "").strip()
+                                                parts = elem_text.replace(":warning:", "").strip()
                                                 if parts:
                                                     votes["concern"] = [n.strip() for n in parts.split(",") if n.strip()]
-                                        if ":no_entry:" in text:
+                                        if ":no_entry:" in elem_text:
                                             # Block votes
-                                            if "|" in text:
-                                                for section in text.split("|"):
+                                            if "|" in elem_text:
+                                                for section in elem_text.split("|"):
                                                     if ":no_entry:" in section:
                                                         parts = section.replace(":no_entry:", "").strip()
                                                         if parts:
                                                             votes["block"] = [n.strip() for n in parts.split(",") if n.strip()]
                                             else:
-                                                parts = text.replace(":no_entry:", "").strip()
+                                                parts = elem_text.replace(":no_entry:", "").strip()
                                                 if parts:
                                                     votes["block"] = [n.strip() for n in parts.split(",") if n.strip()]
 
@@ -3450,22 +3497,22 @@ class handler(BaseHTTPRequestHandler):
                             webhook_base = os.environ.get("WEBHOOK_URL", "https://imputable.vercel.app")
                             vote_url = f"{webhook_base}/api/v1/integrations/webhook?platform=slack&type=async_poll_vote"
 
-                            vote_payload = json.dumps({
+                            vote_payload = orjson.dumps({
                                 "team_id": team_id,
                                 "decision_id": decision_id,
                                 "vote_type": vote_type,
                                 "user_id": user_id,
                                 "user_name": user_name,
                                 "response_url": response_url
-                            }).encode()
+                            })
 
-                            req = urllib.request.Request(
-                                vote_url,
-                                data=vote_payload,
-                                headers={"Content-Type": "application/json"}
-                            )
                             try:
-                                urllib.request.urlopen(req, timeout=0.1)
+                                _http_client.post(
+                                    vote_url,
+                                    content=vote_payload,
+                                    headers={"Content-Type": "application/json"},
+                                    timeout=0.1
+                                )
                             except:
                                 pass  # Expected to timeout
 
@@ -3485,36 +3532,22 @@ class handler(BaseHTTPRequestHandler):
                                 if engine:
                                     with engine.connect() as conn:
                                         # Upsert vote
-                                        result = conn.execute(text("""
-                                            SELECT id FROM poll_votes
-                                            WHERE decision_id = :did AND external_user_id = :uid AND source = 'slack'
-                                        """), {"did": decision_id, "uid": user_id})
+                                        result = conn.execute(FIND_POLL_VOTE_SQL, {"did": decision_id, "uid": user_id})
                                         existing = result.fetchone()
 
                                         if existing:
-                                            conn.execute(text("""
-                                                UPDATE poll_votes SET vote_type = :vote, external_user_name = :name, updated_at = NOW()
-                                                WHERE id = :id
-                                            """), {"vote": vote_type, "name": user_name, "id": existing[0]})
+                                            conn.execute(UPDATE_POLL_VOTE_SQL, {"vote": vote_type, "name": user_name, "id": existing[0]})
                                         else:
-                                            conn.execute(text("""
-                                                INSERT INTO poll_votes (id, decision_id, external_user_id, external_user_name, vote_type, source, created_at, updated_at)
-                                                VALUES (:id, :did, :uid, :name, :vote, 'slack', NOW(), NOW())
-                                            """), {"id": str(uuid4()), "did": decision_id, "uid": user_id, "name": user_name, "vote": vote_type})
+                                            conn.execute(INSERT_POLL_VOTE_SQL, {"id": str(uuid4()), "did": decision_id, "uid": user_id, "name": user_name, "vote": vote_type})
 
                                         conn.commit()
 
                                         # Get updated votes and decision info
-                                        result = conn.execute(text("""
-                                            SELECT d.decision_number, dv.title, d.status, dv.custom_fields, d.created_at
-                                            FROM decisions d
-                                            JOIN decision_versions dv ON d.current_version_id = dv.id
-                                            WHERE d.id = :did
-                                        """), {"did": decision_id})
+                                        result = conn.execute(POLL_DECISION_STATE_SQL, {"did": decision_id})
                                         dec = result.fetchone()
 
                                         if dec:
-                                            result = conn.execute(text("SELECT vote_type, external_user_name FROM poll_votes WHERE decision_id = :did"), {"did": decision_id})
+                                            result = conn.execute(POLL_VOTES_SQL, {"did": decision_id})
                                             votes = {"agree": [], "concern": [], "block": []}
                                             for row in result.fetchall():
                                                 vt, name = row[0], row[1] or "Someone"
@@ -3549,17 +3582,14 @@ class handler(BaseHTTPRequestHandler):
                                                         # Send DM to creator
                                                         token = os.environ.get("SLACK_BOT_TOKEN", "")
                                                         if token:
-                                                            frontend_url = os.environ.get("FRONTEND_URL", "https://imputable.vercel.app")
                                                             dm_blocks = [
                                                                 {"type": "section", "text": {"type": "mrkdwn", "text": f":tada: *Consensus reached on your poll!*\n\n*{dec[1]}*\n\nThe team has reached consensus. You can now approve this decision."}},
                                                                 {"type": "actions", "elements": [
-                                                                    {"type": "button", "text": {"type": "plain_text", "text": "View Decision"}, "url": f"{frontend_url}/decisions/{decision_id}"}
+                                                                    {"type": "button", "text": {"type": "plain_text", "text": "View Decision"}, "url": _decision_url(decision_id)}
                                                                 ]}
                                                             ]
-                                                            dm_payload = json.dumps({"channel": creator_slack_id, "text": f"Consensus reached on: {dec[1]}", "blocks": dm_blocks}).encode()
-                                                            dm_req = urllib.request.Request("https://slack.com/api/chat.postMessage", data=dm_payload, headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"})
                                                             try:
-                                                                urllib.request.urlopen(dm_req, timeout=5)
+                                                                slack_api_post(token, "https://slack.com/api/chat.postMessage", {"channel": creator_slack_id, "text": f"Consensus reached on: {dec[1]}", "blocks": dm_blocks}, timeout=5)
                                                                 print(f"[SLACK POLL VOTE] Sent consensus DM to creator {creator_slack_id}")
                                                             except Exception as dm_e:
                                                                 print(f"[SLACK POLL VOTE] Failed to send DM: {dm_e}")
@@ -3577,7 +3607,6 @@ class handler(BaseHTTPRequestHandler):
 
                     # Also handle poll_approve_decision inline
                     if actions and actions[0].get("action_id") == "poll_approve_decision":
-                        from sqlalchemy import text
                         action = actions[0]
                         action_value = action.get("value", "")
                         user_info = payload.get("user", {})
@@ -3605,23 +3634,15 @@ class handler(BaseHTTPRequestHandler):
                                 if engine:
                                     with engine.connect() as conn:
                                         # Update decision status to approved
-                                        conn.execute(text("""
-                                            UPDATE decisions SET status = 'approved', updated_at = NOW()
-                                            WHERE id = :did AND status != 'approved'
-                                        """), {"did": decision_id})
+                                        conn.execute(APPROVE_DECISION_SQL, {"did": decision_id})
                                         conn.commit()
 
                                         # Get updated decision info
-                                        result = conn.execute(text("""
-                                            SELECT d.decision_number, dv.title, d.status, dv.custom_fields
-                                            FROM decisions d
-                                            JOIN decision_versions dv ON d.current_version_id = dv.id
-                                            WHERE d.id = :did
-                                        """), {"did": decision_id})
+                                        result = conn.execute(POLL_DECISION_FIELDS_SQL, {"did": decision_id})
                                         dec = result.fetchone()
 
                                         if dec:
-                                            result = conn.execute(text("SELECT vote_type, external_user_name FROM poll_votes WHERE decision_id = :did"), {"did": decision_id})
+                                            result = conn.execute(POLL_VOTES_SQL, {"did": decision_id})
                                             votes = {"agree": [], "concern": [], "block": []}
                                             for row in result.fetchall():
                                                 vt, name = row[0], row[1] or "Someone"
@@ -3666,10 +3687,8 @@ class handler(BaseHTTPRequestHandler):
                         engine = get_db_connection()
                         if engine:
                             with engine.connect() as conn:
-                                from sqlalchemy import text
-                                result = conn.execute(text("SELECT slack_access_token FROM organizations WHERE slack_team_id = :team_id"), {"team_id": team_id})
-                                org = result.fetchone()
-                                token = decrypt_token(org[0]) if org and org[0] else None
+                                org = get_org_by_slack_team(conn, team_id)
+                                token = decrypt_token(org[2]) if org and org[2] else None
 
                     if token and trigger_id:
                         # AI loading modal
@@ -3682,62 +3701,37 @@ class handler(BaseHTTPRequestHandler):
                         }
 
                         # Open modal IMMEDIATELY
-                        payload_data = json.dumps({"trigger_id": trigger_id, "view": modal}).encode()
-                        req = urllib.request.Request(
-                            "https://slack.com/api/views.open",
-                            data=payload_data,
-                            headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-                        )
                         try:
-                            resp = urllib.request.urlopen(req, timeout=5)
-                            resp_data = json.loads(resp.read().decode())
+                            resp_data = slack_api_post(token, "https://slack.com/api/views.open", {"trigger_id": trigger_id, "view": modal}, timeout=5)
                             print(f"[SLACK FAST PATH] views.open: ok={resp_data.get('ok')}, error={resp_data.get('error')}")
                             view_id = resp_data.get("view", {}).get("id") if resp_data.get("ok") else None
 
-                            # Do AI analysis and update modal
+                            # Fire async request for AI analysis so Slack gets its ack
+                            # within 3 seconds; the async handler updates the modal
                             if view_id:
-                                gemini_key = os.environ.get("GEMINI_API_KEY", "")
-                                if gemini_key:
-                                    try:
-                                        channel_name = channel.get("name", "")
-                                        # Fetch messages for context
-                                        if thread_ts and thread_ts != message_ts:
-                                            # Message is in a thread - fetch the whole thread
-                                            messages = fetch_slack_thread(token, channel_id, thread_ts)
-                                        else:
-                                            # Not in a thread - fetch surrounding channel messages for context
-                                            messages = fetch_channel_context(token, channel_id, message_ts, count=25)
-                                            if not messages:
-                                                # Fallback to just the single message
-                                                messages = [{"author": message.get("user", "Unknown"), "text": message_text, "timestamp": message_ts}]
-                                        messages = resolve_slack_user_names(token, messages)
-                                        analysis = analyze_with_gemini(messages, channel_name)
-                                        if analysis:
-                                            modal = SlackModals.ai_prefilled_modal(analysis, channel_id, message_ts, thread_ts)
-                                        else:
-                                            prefill_title = message_text.split("\n")[0][:100] if message_text else "Decision from Slack"
-                                            modal = SlackModals.log_message(prefill_title, message_text, channel_id, message_ts, thread_ts)
-                                    except Exception as e:
-                                        print(f"[SLACK FAST PATH] AI error: {e}")
-                                        prefill_title = message_text.split("\n")[0][:100] if message_text else "Decision from Slack"
-                                        modal = SlackModals.log_message(prefill_title, message_text, channel_id, message_ts, thread_ts)
-                                else:
-                                    prefill_title = message_text.split("\n")[0][:100] if message_text else "Decision from Slack"
-                                    modal = SlackModals.log_message(prefill_title, message_text, channel_id, message_ts, thread_ts)
-
-                                # Update modal with results
-                                update_data = json.dumps({"view_id": view_id, "view": modal}).encode()
-                                req = urllib.request.Request(
-                                    "https://slack.com/api/views.update",
-                                    data=update_data,
-                                    headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-                                )
+                                webhook_base = os.environ.get("WEBHOOK_URL", "https://imputable.vercel.app")
+                                async_url = f"{webhook_base}/api/v1/integrations/webhook?platform=slack&type=async_shortcut"
+
+                                async_payload = orjson.dumps({
+                                    "view_id": view_id,
+                                    "channel_id": channel_id,
+                                    "channel_name": channel.get("name", ""),
+                                    "message_text": message_text,
+                                    "message_user": message.get("user", "Unknown"),
+                                    "message_ts": message_ts,
+                                    "thread_ts": thread_ts,
+                                    "token": token
+                                })
+
                                 try:
-                                    resp = urllib.request.urlopen(req, timeout=30)
-                                    resp_data = json.loads(resp.read().decode())
-                                    print(f"[SLACK FAST PATH] views.update: ok={resp_data.get('ok')}, error={resp_data.get('error')}")
-                                except Exception as e:
-                                    print(f"[SLACK FAST PATH] views.update failed: {e}")
+                                    _http_client.post(
+                                        async_url,
+                                        content=async_payload,
+                                        headers={"Content-Type": "application/json"},
+                                        timeout=0.1
+                                    )
+                                except:
+                                    pass  # Expected to timeout
 
                         except Exception as e:
                             print(f"[SLACK FAST PATH] views.open failed: {e}")
@@ -3745,10 +3739,12 @@ class handler(BaseHTTPRequestHandler):
                     self._send(200, {})
                     return
 
-                # FAST PATH: For view submissions - respond immediately, fire async save
+                # FAST PATH: For view submissions - respond immediately, fire async save.
+                # Both decision modals share the same form blocks, so the async save
+                # handler persists either one; create_decision_modal just has no metadata.
                 view_callback_id = payload.get("view", {}).get("callback_id", "")
                 print(f"[SLACK FAST PATH] view_callback_id={view_callback_id}")
-                if interaction_type == "view_submission" and view_callback_id == "log_message_modal":
+                if interaction_type == "view_submission" and view_callback_id in ("create_decision_modal", "log_message_modal"):
                     # Extract minimal data for immediate Slack message
                     token = os.environ.get("SLACK_BOT_TOKEN", "")
                     values = payload.get("view", {}).get("state", {}).get("values", {})
@@ -3761,43 +3757,42 @@ class handler(BaseHTTPRequestHandler):
                     title = values.get("title_block", {}).get("title_input", {}).get("value", "").strip()
                     channel_id = metadata.get("channel_id")
 
+                    # Slack only rejects an empty title; catch whitespace-only ones here
+                    # while the modal is still open to show the error inline
+                    if not title:
+                        self._send(200, {"response_action": "errors", "errors": {"title_block": "Title is required"}})
+                        return
+
                     # Send immediate confirmation to Slack channel
                     if token and channel_id and title:
-                        frontend_url = os.environ.get("FRONTEND_URL", "https://imputable.vercel.app")
-                        msg_payload = json.dumps({
-                            "channel": channel_id,
-                            "text": f"Decision saved: {title}",
-                            "blocks": [{"type": "section", "text": {"type": "mrkdwn", "text": f":white_check_mark: *Decision saved*\n*{title}*\n\n_Saving to <{frontend_url}/decisions|Imputable>..._"}}]
-                        }).encode()
-                        req = urllib.request.Request(
-                            "https://slack.com/api/chat.postMessage",
-                            data=msg_payload,
-                            headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-                        )
                         try:
-                            urllib.request.urlopen(req, timeout=2)
+                            slack_api_post(token, "https://slack.com/api/chat.postMessage", {
+                                "channel": channel_id,
+                                "text": f"Decision saved: {title}",
+                                "blocks": [{"type": "section", "text": {"type": "mrkdwn", "text": f":white_check_mark: *Decision saved*\n*{title}*\n\n_Saving to <{FRONTEND_URL}/decisions|Imputable>..._"}}]
+                            }, timeout=2)
                         except:
                             pass
 
                     # Fire async request to save (non-blocking)
-                    save_payload = json.dumps({
+                    save_payload = orjson.dumps({
                         "action": "save_decision",
                         "team_id": team_id,
                         "payload": payload
-                    }).encode()
+                    })
 
                     # Get the webhook URL for async save
                     webhook_base = os.environ.get("WEBHOOK_URL", "https://imputable.vercel.app")
                     save_url = f"{webhook_base}/api/v1/integrations/webhook?platform=slack&type=async_save"
 
-                    req = urllib.request.Request(
-                        save_url,
-                        data=save_payload,
-                        headers={"Content-Type": "application/json"}
-                    )
                     try:
                         # Fire and forget - 0.1s timeout just to send, don't wait for response
-                        urllib.request.urlopen(req, timeout=0.1)
+                        _http_client.post(
+                            save_url,
+                            content=save_payload,
+                            headers={"Content-Type": "application/json"},
+                            timeout=0.1
+                        )
                     except:
                         pass  # Expected to timeout, that's fine
 
@@ -3857,7 +3852,7 @@ class handler(BaseHTTPRequestHandler):
                             break
 
                     try:
-                        payload = json.loads(payload_str) if payload_str else {}
+                        payload = orjson.loads(payload_str) if payload_str else {}
                     except json.JSONDecodeError as e:
                         print(f"[SLACK INTERACTIONS] JSON parse error: {e}")
                         self._send(200, {})
@@ -3878,7 +3873,7 @@ class handler(BaseHTTPRequestHandler):
                 # Teams
                 elif platform == "teams":
                     try:
-                        activity = json.loads(body.decode()) if body else {}
+                        activity = orjson.loads(body) if body else {}
                     except json.JSONDecodeError as e:
                         print(f"[TEAMS] JSON parse error: {e}")
                         self._send(200, {})
@@ -0,0 +1,167 @@
+"""
+Tests for pure helpers in the serverless decisions API.
+
+These tests verify:
+1. STREAM PARSING: iter_json_array_items yields complete array elements
+2. UUIDv7: uuid7 sets the version/variant bits and is time-ordered
+3. PAGINATION: parse_page_params clamps limits and rejects bad cursors
+"""
+
+import importlib.util
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+pytest.importorskip("firebase_admin")
+pytest.importorskip("httpx")
+pytest.importorskip("sqlalchemy")
+
+DECISIONS_API_DIR = Path(__file__).resolve().parent.parent / "frontend" / "api" / "v1" / "decisions"
+
+
+def load_api_module(name):
+    """Load a serverless function file, which is not part of any package."""
+    spec = importlib.util.spec_from_file_location(
+        f"decisions_api_{name}", DECISIONS_API_DIR / f"{name}.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+relationships = load_api_module("relationships")
+decisions_index = load_api_module("index")
+
+
+# =============================================================================
+# STREAM PARSING TESTS
+# =============================================================================
+
+class TestIterJsonArrayItems:
+    """Tests for incremental parsing of a streamed JSON array."""
+
+    def parse(self, chunks):
+        return list(relationships.iter_json_array_items(chunks))
+
+    def test_single_chunk(self):
+        assert self.parse(['[{"a": 1}, {"b": 2}]']) == [{"a": 1}, {"b": 2}]
+
+    def test_empty_array(self):
+        assert self.parse(["[]"]) == []
+
+    def test_object_split_across_chunks(self):
+        chunks = ['[{"source', '_id": "x", "conf', 'idence": 0.9}', ', {"a"', ': 2}]']
+        assert self.parse(chunks) == [{"source_id": "x", "confidence": 0.9}, {"a": 2}]
+
+    def test_every_character_in_its_own_chunk(self):
+        text = '[{"a": [1, 2]}, {"b": "c"}]'
+        assert self.parse(list(text)) == [{"a": [1, 2]}, {"b": "c"}]
+
+    def test_strings_containing_brackets_and_braces(self):
+        chunks = ['[{"description": "uses ] and }', ' inside", "n": 1}, "]", "}"]']
+        assert self.parse(chunks) == [
+            {"description": "uses ] and } inside", "n": 1},
+            "]",
+            "}",
+        ]
+
+    def test_markdown_json_fence(self):
+        chunks = ["```json\n", '[\n  {"a": 1},\n', '  {"b": 2}\n]', "\n```"]
+        assert self.parse(chunks) == [{"a": 1}, {"b": 2}]
+
+    def test_number_split_across_chunks(self):
+        assert self.parse(["[1", "2]"]) == [12]
+        assert self.parse(["[1.", "5e", "2, -", "3]"]) == [150.0, -3]
+
+    def test_literals_split_across_chunks(self):
+        assert self.parse(["[tr", "ue, nu", "ll, fals", "e]"]) == [True, None, False]
+
+    def test_items_yielded_before_stream_ends(self):
+        def chunks():
+            yield '[{"a": 1}, '
+            raise AssertionError("first item was not yielded early")
+
+        items = relationships.iter_json_array_items(chunks())
+        assert next(items) == {"a": 1}
+
+    def test_no_array_yields_nothing(self):
+        assert self.parse(["no relationships", " found"]) == []
+
+
+# =============================================================================
+# UUIDv7 TESTS
+# =============================================================================
+
+class TestUuid7:
+    """Tests for time-ordered primary key generation."""
+
+    def test_version_and_variant_bits(self):
+        for _ in range(100):
+            value = decisions_index.uuid7()
+            assert value.version == 7
+            assert (value.int >> 62) & 0b11 == 0b10
+
+    def test_timestamp_prefix_is_current_time(self, monkeypatch):
+        monkeypatch.setattr(decisions_index.time, "time_ns", lambda: 1_700_000_000_123_456_789)
+        assert decisions_index.uuid7().int >> 80 == 1_700_000_000_123
+
+    def test_ordered_by_creation_time(self, monkeypatch):
+        now_ns = [1_700_000_000_000_000_000]
+
+        def fake_time_ns():
+            now_ns[0] += 1_000_000
+            return now_ns[0]
+
+        monkeypatch.setattr(decisions_index.time, "time_ns", fake_time_ns)
+        ids = [decisions_index.uuid7() for _ in range(50)]
+        assert ids == sorted(ids)
+        assert len(set(ids)) == 50
+
+
+# =============================================================================
+# PAGINATION TESTS
+# =============================================================================
+
+class TestParsePageParams:
+    """Tests for relationships list limit and cursor parsing."""
+
+    def test_defaults(self):
+        assert relationships.parse_page_params({}) == (
+            relationships.RELATIONSHIPS_PAGE_DEFAULT, None, None
+        )
+
+    @pytest.mark.parametrize("raw, expected", [
+        ("50", 50),
+        ("0", 1),
+        ("-5", 1),
+        ("100000", relationships.RELATIONSHIPS_PAGE_MAX),
+    ])
+    def test_limit_is_clamped(self, raw, expected):
+        limit, _, _ = relationships.parse_page_params({"limit": [raw]})
+        assert limit == expected
+
+    def test_non_numeric_limit_raises(self):
+        with pytest.raises(ValueError):
+            relationships.parse_page_params({"limit": ["ten"]})
+
+    def test_valid_cursor(self):
+        rel_id = uuid4()
+        cursor = f"2024-01-01T00:00:00+00:00|{str(rel_id).upper()}"
+        limit, cursor_at, cursor_id = relationships.parse_page_params({"cursor": [cursor]})
+        assert limit == relationships.RELATIONSHIPS_PAGE_DEFAULT
+        assert cursor_at == "2024-01-01T00:00:00+00:00"
+        assert cursor_id == str(rel_id)
+
+    def test_empty_cursor_is_first_page(self):
+        assert relationships.parse_page_params({"cursor": [""]})[1:] == (None, None)
+
+    @pytest.mark.parametrize("cursor", [
+        "2024-01-01T00:00:00+00:00",
+        "2024-01-01T00:00:00+00:00|",
+        f"|{uuid4()}",
+        "2024-01-01T00:00:00+00:00|not-a-uuid",
+    ])
+    def test_malformed_cursor_raises(self, cursor):
+        with pytest.raises(ValueError):
+            relationships.parse_page_params({"cursor": [cursor]})